@@ -0,0 +1,151 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Config manager for asyncio applications. Requires Python 3.5+ and aiohttp. """
+
+import asyncio
+
+import aiohttp
+from requests import codes as http_status_codes
+
+from ..config_manager import PollingConfigManager
+from ..helpers import enums
+
+
+class AsyncPollingConfigManager(PollingConfigManager):
+    """ Config manager that polls for the datafile from a task on an asyncio event loop instead of a thread.
+    Datafile is fetched with aiohttp and parsed in the loop's default executor so that the loop is not blocked. """
+
+    def __init__(self,
+                 sdk_key=None,
+                 datafile=None,
+                 update_interval=None,
+                 url=None,
+                 url_template=None,
+                 logger=None,
+                 error_handler=None,
+                 notification_center=None,
+                 skip_json_validation=False,
+                 snapshot_path=None,
+                 loop=None):
+        """ Initialize config manager. One of sdk_key or url has to be set to be able to use.
+
+        Args:
+            sdk_key: Optional string uniquely identifying the datafile.
+            datafile: Optional JSON string representing the project.
+            update_interval: Optional floating point number representing time interval in seconds
+                             at which to request datafile and set ProjectConfig.
+            url: Optional string representing URL from where to fetch the datafile. If set it supersedes the sdk_key.
+            url_template: Optional string template which in conjunction with sdk_key
+                          determines URL from where to fetch the datafile.
+            logger: Provides a logger instance.
+            error_handler: Provides a handle_error method to handle exceptions.
+            notification_center: Notification center to generate config update notification.
+                                 Notifications are sent from the loop's default executor.
+            skip_json_validation: Optional boolean param which allows skipping JSON schema
+                                  validation upon object invocation. By default
+                                  JSON schema validation will be performed.
+            snapshot_path: Optional path of a file in which a binary snapshot of the latest ProjectConfig is kept.
+            loop: Optional asyncio event loop on which to poll. Defaults to the current event loop.
+        """
+        self.loop = loop or asyncio.get_event_loop()
+        super(AsyncPollingConfigManager, self).__init__(sdk_key=sdk_key,
+                                                        datafile=datafile,
+                                                        update_interval=update_interval,
+                                                        url=url,
+                                                        url_template=url_template,
+                                                        logger=logger,
+                                                        error_handler=error_handler,
+                                                        notification_center=notification_center,
+                                                        skip_json_validation=skip_json_validation,
+                                                        snapshot_path=snapshot_path)
+
+    def _setup_polling(self):
+        """ Helper method to set up polling. Session is created by the polling task as it belongs to the loop. """
+        self._session = None
+        self._polling_task = None
+
+    def _get_session(self):
+        """ Helper method to get the session used to fetch the datafile, creating it if needed.
+
+        Returns:
+            aiohttp.ClientSession reused across polls.
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers={enums.HTTPHeaders.ACCEPT_ENCODING: enums.ConfigManager.DATAFILE_ACCEPT_ENCODING},
+                timeout=aiohttp.ClientTimeout(total=enums.ConfigManager.REQUEST_TIMEOUT)
+            )
+
+        return self._session
+
+    async def fetch_datafile(self):
+        """ Fetch datafile and set ProjectConfig. """
+
+        try:
+            async with self._get_session().get(self.datafile_url, headers=self._get_request_headers()) as response:
+                if response.status >= http_status_codes.bad_request:
+                    self.logger.error('Fetching datafile from {} failed. Error: {} {}'.format(
+                        self.datafile_url, response.status, response.reason
+                    ))
+                    return
+
+                # Leave datafile and config unchanged if it has not been modified.
+                if response.status == http_status_codes.not_modified:
+                    self.logger.debug(
+                        'Not updating config as datafile has not updated since {}.'.format(self.last_modified)
+                    )
+                    return
+
+                datafile = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self.logger.error('Fetching datafile from {} failed. Error: {}'.format(self.datafile_url, repr(err)))
+            return
+
+        self.set_last_modified(response.headers)
+        self.set_etag(response.headers)
+        await self.loop.run_in_executor(None, self._set_config, datafile)
+
+    @property
+    def is_running(self):
+        """ Check if polling task is running or not. """
+        return self._polling_task is not None and not self._polling_task.done()
+
+    async def _run(self):
+        """ Run as the task which fetches the datafile and sleeps until next update interval. """
+        while True:
+            await self.fetch_datafile()
+            await asyncio.sleep(self.update_interval)
+
+    def _start_polling_task(self):
+        """ Helper method to create the polling task unless it is already running. """
+        if not self.is_running:
+            self._polling_task = self.loop.create_task(self._run())
+
+    def start(self):
+        """ Start the config manager and the task to periodically fetch datafile.
+        Task starts once the loop runs. Safe to call from any thread. """
+        self.loop.call_soon_threadsafe(self._start_polling_task)
+
+    async def close(self):
+        """ Stop polling and close connections used to fetch the datafile. """
+        if self._polling_task is not None:
+            self._polling_task.cancel()
+            try:
+                await self._polling_task
+            except asyncio.CancelledError:
+                pass
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,130 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Event dispatcher for asyncio applications. Requires Python 3.5+ and aiohttp. """
+
+import asyncio
+import json
+import logging
+import threading
+
+import aiohttp
+
+from ..event_dispatcher import REQUEST_TIMEOUT
+from ..helpers import enums
+
+
+class AsyncEventDispatcher(object):
+  """ Event dispatcher which sends events from an asyncio event loop with aiohttp.
+
+  dispatch_event only queues the event and returns, so it neither blocks the loop when called from a coroutine nor
+  needs the loop's thread when called from another one. Events queued before the loop next runs are sent together,
+  concurrently over connections kept alive across events.
+  """
+
+  def __init__(self, loop=None, pool_size=None, timeout=REQUEST_TIMEOUT):
+    """ Initialize asyncio event dispatcher.
+
+    Args:
+      loop: Optional asyncio event loop from which to send events. Defaults to the current event loop.
+      pool_size: Optional number of connections kept alive per host.
+      timeout: Optional time in seconds before which a request for dispatching an event times out.
+    """
+    self.loop = loop or asyncio.get_event_loop()
+    self.pool_size = pool_size or enums.EventDispatcher.DEFAULT_POOL_SIZE
+    self.timeout = timeout
+    self._session = None
+    self._pending_events = []
+    self._pending_events_lock = threading.Lock()
+    self._send_tasks = set()
+
+  def dispatch_event(self, event):
+    """ Queue the event being represented by the Event object to be sent from the loop.
+
+    Args:
+      event: Object holding information about the request to be dispatched to the Optimizely backend.
+    """
+
+    with self._pending_events_lock:
+      self._pending_events.append(event)
+      # Only the first event queued since the last send needs to schedule one.
+      if len(self._pending_events) > 1:
+        return
+
+    self.loop.call_soon_threadsafe(self._send_pending_events)
+
+  def _send_pending_events(self):
+    """ Helper method to start sending all queued events. Runs on the loop. """
+
+    with self._pending_events_lock:
+      events = self._pending_events
+      self._pending_events = []
+
+    if not events:
+      return
+
+    send_task = self.loop.create_task(self._send_events(events))
+    self._send_tasks.add(send_task)
+    send_task.add_done_callback(self._send_tasks.discard)
+
+  def _get_session(self):
+    """ Helper method to get the session used to send events, creating it if needed.
+
+    Returns:
+      aiohttp.ClientSession reused across events.
+    """
+    if self._session is None:
+      self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit_per_host=self.pool_size),
+                                            timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    return self._session
+
+  async def _send_events(self, events):
+    """ Send events concurrently.
+
+    Args:
+      events: List of objects holding information about the requests to be dispatched.
+    """
+    session = self._get_session()
+    await asyncio.gather(*[self._send_event(session, event) for event in events])
+
+  @staticmethod
+  async def _send_event(session, event):
+    """ Send the event being represented by the Event object.
+
+    Args:
+      session: aiohttp.ClientSession to send the event with.
+      event: Object holding information about the request to be dispatched to the Optimizely backend.
+    """
+
+    try:
+      if event.http_verb == enums.HTTPVerbs.GET:
+        async with session.get(event.url, params=event.params) as response:
+          response.raise_for_status()
+      elif event.http_verb == enums.HTTPVerbs.POST:
+        async with session.post(event.url, data=json.dumps(event.params), headers=event.headers) as response:
+          response.raise_for_status()
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+      logging.error('Dispatch event failed. Error: %s' % repr(error))
+
+  async def close(self):
+    """ Send queued events, wait for events being sent and close connections. """
+
+    self._send_pending_events()
+    if self._send_tasks:
+      await asyncio.gather(*list(self._send_tasks))
+
+    if self._session is not None:
+      await self._session.close()
+      self._session = None
@@ -11,12 +11,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
 import math
 try:
   import mmh3
 except ImportError:
   from .lib import pymmh3 as mmh3
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+from . import entities
+from . import logger as optimizely_logger
+
 
 MAX_TRAFFIC_VALUE = 10000
 UNSIGNED_MAX_32_BIT_VALUE = 0xFFFFFFFF
@@ -29,10 +38,17 @@ GROUP_POLICIES = ['random']
 class Bucketer(object):
   """ Optimizely bucketing algorithm that evenly distributes visitors. """
 
-  def __init__(self):
-    """ Bucketer init method to set bucketing seed and logger instance. """
+  def __init__(self, bucket_value_cache=None):
+    """ Bucketer init method to set bucketing seed and bucket value cache.
+
+    Args:
+      bucket_value_cache: Optional lru_cache.LRUCache to cache bucket values keyed by bucketing ID and
+                          parent ID. It is reset whenever a config with a different revision is used.
+    """
 
     self.bucket_seed = HASH_SEED
+    self.bucket_value_cache = bucket_value_cache
+    self._bucket_value_cache_revision = None
 
   def _generate_unsigned_hash_code_32_bit(self, bucketing_id):
     """ Helper method to retrieve hash code.
@@ -60,6 +76,97 @@ class Bucketer(object):
     ratio = float(self._generate_unsigned_hash_code_32_bit(bucketing_id)) / MAX_HASH_VALUE
     return math.floor(ratio * MAX_TRAFFIC_VALUE)
 
+  def _generate_bucket_values(self, bucketing_keys):
+    """ Helper function to generate bucket values for many bucketing keys at once.
+
+    Hashing is done one key at a time, but the conversion of hash codes into bucket values is vectorized
+    when NumPy is available. Results are identical to calling _generate_bucket_value for every key.
+
+    Args:
+      bucketing_keys: List of bucketing keys.
+
+    Returns:
+      List (or NumPy array) of bucket values in half-closed interval [0, MAX_TRAFFIC_VALUE).
+    """
+
+    hash_codes = [self._generate_unsigned_hash_code_32_bit(bucketing_key) for bucketing_key in bucketing_keys]
+
+    if numpy is None:
+      return [math.floor(float(hash_code) / MAX_HASH_VALUE * MAX_TRAFFIC_VALUE) for hash_code in hash_codes]
+
+    ratios = numpy.array(hash_codes, dtype=numpy.float64) / MAX_HASH_VALUE
+    return numpy.floor(ratios * MAX_TRAFFIC_VALUE)
+
+  @staticmethod
+  def _find_buckets(bucket_values, traffic_allocation_table):
+    """ Determine entities for many bucket values using the given traffic allocation table.
+
+    Args:
+      bucket_values: List (or NumPy array) of bucket values.
+      traffic_allocation_table: entities.TrafficAllocationTable to look bucket values up in.
+
+    Returns:
+      List of entity IDs, one per bucket value. None where bucket value falls outside of all allocations.
+    """
+
+    end_of_ranges = traffic_allocation_table.end_of_ranges
+    entity_ids = traffic_allocation_table.entity_ids
+
+    if numpy is None or not isinstance(bucket_values, numpy.ndarray):
+      return [entity_ids[bisect.bisect_right(end_of_ranges, bucket_value)] for bucket_value in bucket_values]
+
+    indices = numpy.searchsorted(numpy.array(end_of_ranges, dtype=numpy.float64), bucket_values, side='right')
+    return numpy.array(entity_ids, dtype=object)[indices].tolist()
+
+  def _get_bucket_value(self, project_config, bucketing_id, parent_id):
+    """ Helper function to get bucket value for bucketing ID and parent ID, from the cache if enabled.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      bucketing_id: ID to be used for bucketing the user.
+      parent_id: ID representing group or experiment.
+
+    Returns:
+      Bucket value corresponding to the provided bucketing ID and parent ID.
+    """
+
+    if self.bucket_value_cache is None:
+      return self._generate_bucket_value(BUCKETING_ID_TEMPLATE.format(bucketing_id=bucketing_id, parent_id=parent_id))
+
+    revision = project_config.get_revision()
+    if revision != self._bucket_value_cache_revision:
+      self.bucket_value_cache.reset()
+      self._bucket_value_cache_revision = revision
+
+    cache_key = (bucketing_id, parent_id)
+    bucket_value = self.bucket_value_cache.lookup(cache_key)
+    if bucket_value is None:
+      bucket_value = self._generate_bucket_value(
+        BUCKETING_ID_TEMPLATE.format(bucketing_id=bucketing_id, parent_id=parent_id)
+      )
+      self.bucket_value_cache.save(cache_key, bucket_value)
+
+    return bucket_value
+
+  def _find_bucket_index(self, project_config, bucketing_id, parent_id, traffic_allocation_table):
+    """ Determine index of the entity in the traffic allocation table based on bucket value.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      bucketing_id: ID to be used for bucketing the user.
+      parent_id: ID representing group or experiment.
+      traffic_allocation_table: entities.TrafficAllocationTable for the group or experiment.
+
+    Returns:
+      Index into the entity_ids and entities of the traffic allocation table.
+    """
+
+    bucketing_number = self._get_bucket_value(project_config, bucketing_id, parent_id)
+    optimizely_logger.log_debug(project_config.logger, 'Assigned bucket %s to user with bucketing ID "%s".',
+                                bucketing_number, bucketing_id)
+
+    return bisect.bisect_right(traffic_allocation_table.end_of_ranges, bucketing_number)
+
   def find_bucket(self, project_config, bucketing_id, parent_id, traffic_allocations):
     """ Determine entity based on bucket value and traffic allocations.
 
@@ -68,24 +175,18 @@ class Bucketer(object):
       bucketing_id: ID to be used for bucketing the user.
       parent_id: ID representing group or experiment.
       traffic_allocations: Traffic allocations representing traffic allotted to experiments or variations.
+                           Either the list from the datafile or the entities.TrafficAllocationTable for it.
 
     Returns:
       Entity ID which may represent experiment or variation.
     """
 
-    bucketing_key = BUCKETING_ID_TEMPLATE.format(bucketing_id=bucketing_id, parent_id=parent_id)
-    bucketing_number = self._generate_bucket_value(bucketing_key)
-    project_config.logger.debug('Assigned bucket %s to user with bucketing ID "%s".' % (
-      bucketing_number,
-      bucketing_id
-    ))
+    traffic_allocation_table = traffic_allocations
+    if not isinstance(traffic_allocation_table, entities.TrafficAllocationTable):
+      traffic_allocation_table = project_config._generate_traffic_allocation_table(traffic_allocations)
 
-    for traffic_allocation in traffic_allocations:
-      current_end_of_range = traffic_allocation.get('endOfRange')
-      if bucketing_number < current_end_of_range:
-        return traffic_allocation.get('entityId')
-
-    return None
+    index = self._find_bucket_index(project_config, bucketing_id, parent_id, traffic_allocation_table)
+    return traffic_allocation_table.entity_ids[index]
 
   def bucket(self, project_config, experiment, user_id, bucketing_id):
     """ For a given experiment and bucketing ID determines variation to be shown to user.
@@ -110,35 +211,74 @@ class Bucketer(object):
       if not group:
         return None
 
-      user_experiment_id = self.find_bucket(project_config, bucketing_id, experiment.groupId, group.trafficAllocation)
+      user_experiment_id = self.find_bucket(project_config, bucketing_id, experiment.groupId,
+                                            project_config.get_traffic_allocation_table(group))
       if not user_experiment_id:
-        project_config.logger.info('User "%s" is in no experiment.' % user_id)
+        optimizely_logger.log_info(project_config.logger, 'User "%s" is in no experiment.', user_id)
         return None
 
       if user_experiment_id != experiment.id:
-        project_config.logger.info('User "%s" is not in experiment "%s" of group %s.' % (
-          user_id,
-          experiment.key,
-          experiment.groupId
-        ))
+        optimizely_logger.log_info(project_config.logger, 'User "%s" is not in experiment "%s" of group %s.',
+                                   user_id, experiment.key, experiment.groupId)
         return None
 
-      project_config.logger.info('User "%s" is in experiment %s of group %s.' % (
-        user_id,
-        experiment.key,
-        experiment.groupId
-      ))
+      optimizely_logger.log_info(project_config.logger, 'User "%s" is in experiment %s of group %s.',
+                                 user_id, experiment.key, experiment.groupId)
 
     # Bucket user if not in white-list and in group (if any)
-    variation_id = self.find_bucket(project_config, bucketing_id, experiment.id, experiment.trafficAllocation)
+    traffic_allocation_table = project_config.get_traffic_allocation_table(experiment)
+    index = self._find_bucket_index(project_config, bucketing_id, experiment.id, traffic_allocation_table)
+    variation_id = traffic_allocation_table.entity_ids[index]
     if variation_id:
-      variation = project_config.get_variation_from_id(experiment.key, variation_id)
-      project_config.logger.info('User "%s" is in variation "%s" of experiment %s.' % (
-        user_id,
-        variation.key,
-        experiment.key
-      ))
+      variation = traffic_allocation_table.entities[index] or \
+        project_config.get_variation_from_id(experiment.key, variation_id)
+      optimizely_logger.log_info(project_config.logger, 'User "%s" is in variation "%s" of experiment %s.',
+                                 user_id, variation.key, experiment.key)
       return variation
 
-    project_config.logger.info('User "%s" is in no variation.' % user_id)
+    optimizely_logger.log_info(project_config.logger, 'User "%s" is in no variation.', user_id)
     return None
+
+  def bucket_many(self, project_config, experiment, bucketing_ids):
+    """ For a given experiment determines variations for many bucketing IDs at once.
+
+    Intended for offline recomputation of assignments. Nothing is logged per bucketing ID.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiment: Object representing the experiment for which users are to be bucketed.
+      bucketing_ids: List of IDs to be used for bucketing the users.
+
+    Returns:
+      List of variation IDs in the same order as bucketing_ids. None where a user is in no variation.
+    """
+
+    bucketing_ids = list(bucketing_ids)
+    if not experiment:
+      return [None] * len(bucketing_ids)
+
+    # Only bucket IDs which land on this experiment when it is in a mutually exclusive group
+    candidate_ids = bucketing_ids
+    if experiment.groupPolicy in GROUP_POLICIES:
+      group = project_config.get_group(experiment.groupId)
+
+      if not group:
+        return [None] * len(bucketing_ids)
+
+      group_keys = [BUCKETING_ID_TEMPLATE.format(bucketing_id=bucketing_id, parent_id=experiment.groupId)
+                    for bucketing_id in bucketing_ids]
+      experiment_ids = self._find_buckets(self._generate_bucket_values(group_keys),
+                                          project_config.get_traffic_allocation_table(group))
+      candidate_ids = [bucketing_id for bucketing_id, experiment_id in zip(bucketing_ids, experiment_ids)
+                       if experiment_id and experiment_id == experiment.id]
+
+    experiment_keys = [BUCKETING_ID_TEMPLATE.format(bucketing_id=bucketing_id, parent_id=experiment.id)
+                       for bucketing_id in candidate_ids]
+    variation_ids = self._find_buckets(self._generate_bucket_values(experiment_keys),
+                                       project_config.get_traffic_allocation_table(experiment))
+
+    if candidate_ids is bucketing_ids:
+      return [variation_id or None for variation_id in variation_ids]
+
+    variation_id_map = dict(zip(candidate_ids, variation_ids))
+    return [variation_id_map.get(bucketing_id) or None for bucketing_id in bucketing_ids]
@@ -12,12 +12,19 @@
 # limitations under the License.
 
 import abc
+import ctypes
+import ctypes.util
+import os
 import requests
+import select
+import sys
 import threading
 import time
 from requests import codes as http_status_codes
 from requests import exceptions as requests_exceptions
+from six import text_type
 
+from . import config_snapshot
 from . import exceptions as optimizely_exceptions
 from . import logger as optimizely_logger
 from . import project_config
@@ -28,6 +35,78 @@ from .helpers import validator
 
 ABC = abc.ABCMeta('ABC', (object,), {'__slots__': ()})
 
+# inotify events for a file closed after being written and for a file moved into the watched directory.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+
+
+def _get_file_check_interval(update_interval):
+    """ Helper function to determine interval at which to check a file for changes.
+
+    Args:
+        update_interval: Optional floating point number representing time interval in seconds.
+
+    Returns:
+        Floating point number representing time interval in seconds.
+
+    Raises:
+        optimizely.exceptions.InvalidInputException if update_interval is invalid.
+    """
+    if update_interval is None:
+        return enums.ConfigManager.DEFAULT_FILE_CHECK_INTERVAL
+
+    if not isinstance(update_interval, (int, float)) or isinstance(update_interval, bool) or update_interval <= 0:
+        raise optimizely_exceptions.InvalidInputException(
+            'Invalid update_interval "{}" provided.'.format(update_interval)
+        )
+
+    return update_interval
+
+
+def _get_file_version(file_stat):
+    """ Helper function to get version of a file from its status. Files replaced by renaming another file
+    over them get a new inode, files written in place a new modification time or size.
+
+    Args:
+        file_stat: Result of os.stat for the file.
+
+    Returns:
+        Tuple identifying the version of the file.
+    """
+    return file_stat.st_ino, getattr(file_stat, 'st_mtime_ns', file_stat.st_mtime), file_stat.st_size
+
+
+def _create_inotify_watch(path):
+    """ Helper function to watch directory of the given path for files written or moved into it using inotify.
+
+    Args:
+        path: Path of the file to watch.
+
+    Returns:
+        File descriptor from which inotify events can be read. None if inotify is not available.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        inotify_fd = libc.inotify_init()
+    except (AttributeError, OSError):
+        return None
+
+    if inotify_fd < 0:
+        return None
+
+    directory = os.path.dirname(os.path.abspath(path))
+    if isinstance(directory, text_type):
+        directory = directory.encode(sys.getfilesystemencoding())
+
+    if libc.inotify_add_watch(inotify_fd, directory, IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        os.close(inotify_fd)
+        return None
+
+    return inotify_fd
+
 
 class BaseConfigManager(ABC):
     """ Base class for Optimizely's config manager. """
@@ -78,7 +157,8 @@ class StaticConfigManager(BaseConfigManager):
                  logger=None,
                  error_handler=None,
                  notification_center=None,
-                 skip_json_validation=False):
+                 skip_json_validation=False,
+                 snapshot_path=None):
         """ Initialize config manager. Datafile has to be provided to use.
 
         Args:
@@ -89,12 +169,19 @@ class StaticConfigManager(BaseConfigManager):
             skip_json_validation: Optional boolean param which allows skipping JSON schema
                                   validation upon object invocation. By default
                                   JSON schema validation will be performed.
+            snapshot_path: Optional path of a file in which a binary snapshot of the built ProjectConfig is kept.
+                           If the snapshot was saved for the same datafile, config is loaded from it
+                           instead of being built again.
         """
         super(StaticConfigManager, self).__init__(logger=logger,
                                                   error_handler=error_handler,
                                                   notification_center=notification_center)
         self._config = None
+        self._datafile_digest = None
+        # Number of times config has been replaced with one of a new revision.
+        self.config_update_count = 0
         self.validate_schema = not skip_json_validation
+        self.snapshot_path = snapshot_path
         self._set_config(datafile)
 
     def _set_config(self, datafile):
@@ -104,17 +191,79 @@ class StaticConfigManager(BaseConfigManager):
            datafile: JSON string representing the Optimizely project.
          """
 
+        try:
+            datafile_digest = config_snapshot.get_datafile_digest(datafile)
+        except TypeError:
+            datafile_digest = None
+
+        # Skip validating and parsing a datafile identical to the one current config was built from.
+        if self._config and datafile_digest is not None and datafile_digest == self._datafile_digest:
+            return
+
+        config = None
+        if self.snapshot_path:
+            config = config_snapshot.load_snapshot(self.snapshot_path, datafile, self.logger, self.error_handler,
+                                                   source=self._get_snapshot_source(),
+                                                   project_id=self._config.get_project_id() if self._config else None)
+
+        if config is None:
+            config = self._build_config(datafile)
+            if config is None:
+                return
+
+            if self.snapshot_path and datafile is not None:
+                config_snapshot.save_snapshot(self.snapshot_path, config, datafile, self.logger,
+                                              source=self._get_snapshot_source())
+
+        previous_revision = self._config.get_revision() if self._config else None
+
+        if previous_revision == config.get_revision():
+            self._datafile_digest = datafile_digest
+            return
+
+        # Config is replaced with a single reference assignment. ProjectConfig is not modified after it is built,
+        # so callers holding the previous config keep using a consistent revision.
+        self._config = config
+        self._datafile_digest = datafile_digest
+        self.config_update_count += 1
+        self.notification_center.send_notifications(enums.NotificationTypes.OPTIMIZELY_CONFIG_UPDATE)
+        self.logger.debug(
+            'Received new datafile and updated config. '
+            'Old revision number: {}. New revision number: {}.'.format(previous_revision, config.get_revision())
+        )
+
+    def _get_snapshot_source(self):
+        """ Helper method to get the string identifying where the datafile comes from, recorded in snapshots
+        so that snapshots saved for another source are not loaded.
+
+        Returns:
+            String identifying the datafile source. None as the datafile is provided directly.
+        """
+        return None
+
+    def _build_config(self, datafile):
+        """ Helper method to validate datafile and build ProjectConfig from it. Config is warmed before it is
+        returned so that decisions made after it replaces the current config do not have to build lookup tables
+        or compile audience conditions. Time taken to parse and warm is sent as OPTIMIZELY_CONFIG_BUILD notification.
+
+        Args:
+          datafile: JSON string representing the Optimizely project.
+
+        Returns:
+          ProjectConfig. None if datafile is invalid.
+        """
+        parse_start_time = time.time()
         if self.validate_schema:
             if not validator.is_datafile_valid(datafile):
                 self.logger.error(enums.Errors.INVALID_INPUT.format('datafile'))
-                return
+                return None
 
         error_msg = None
         error_to_handle = None
         config = None
 
         try:
-            config = project_config.ProjectConfig(datafile, self.logger, self.error_handler)
+            config = project_config.ProjectConfig(datafile, self.logger, self.error_handler, warm=False)
         except optimizely_exceptions.UnsupportedDatafileVersionException as error:
             error_msg = error.args[0]
             error_to_handle = error
@@ -125,19 +274,16 @@ class StaticConfigManager(BaseConfigManager):
             if error_msg:
                 self.logger.error(error_msg)
                 self.error_handler.handle_error(error_to_handle)
-                return
-
-        previous_revision = self._config.get_revision() if self._config else None
-
-        if previous_revision == config.get_revision():
-            return
+                return None
 
-        self._config = config
-        self.notification_center.send_notifications(enums.NotificationTypes.OPTIMIZELY_CONFIG_UPDATE)
-        self.logger.debug(
-            'Received new datafile and updated config. '
-            'Old revision number: {}. New revision number: {}.'.format(previous_revision, config.get_revision())
-        )
+        warm_start_time = time.time()
+        config.warm()
+        warm_end_time = time.time()
+        self.notification_center.send_notifications(enums.NotificationTypes.OPTIMIZELY_CONFIG_BUILD,
+                                                    config.get_revision(),
+                                                    warm_start_time - parse_start_time,
+                                                    warm_end_time - warm_start_time)
+        return config
 
     def get_config(self):
         """ Returns instance of ProjectConfig.
@@ -160,7 +306,8 @@ class PollingConfigManager(StaticConfigManager):
                  logger=None,
                  error_handler=None,
                  notification_center=None,
-                 skip_json_validation=False):
+                 skip_json_validation=False,
+                 snapshot_path=None):
         """ Initialize config manager. One of sdk_key or url has to be set to be able to use.
 
         Args:
@@ -177,20 +324,41 @@ class PollingConfigManager(StaticConfigManager):
             skip_json_validation: Optional boolean param which allows skipping JSON schema
                                   validation upon object invocation. By default
                                   JSON schema validation will be performed.
+            snapshot_path: Optional path of a file in which a binary snapshot of the latest ProjectConfig is kept.
+                           Config is loaded from the snapshot on start so that it is available before
+                           the first datafile is fetched, if the snapshot was saved for the same datafile URL.
 
         """
+        # URL is determined first as it identifies snapshots loaded while initializing.
+        self.datafile_url = self.get_datafile_url(sdk_key, url,
+                                                  url_template or enums.ConfigManager.DATAFILE_URL_TEMPLATE)
         super(PollingConfigManager, self).__init__(datafile=datafile,
                                                    logger=logger,
                                                    error_handler=error_handler,
                                                    notification_center=notification_center,
-                                                   skip_json_validation=skip_json_validation)
-        self.datafile_url = self.get_datafile_url(sdk_key, url,
-                                                  url_template or enums.ConfigManager.DATAFILE_URL_TEMPLATE)
+                                                   skip_json_validation=skip_json_validation,
+                                                   snapshot_path=snapshot_path)
         self.set_update_interval(update_interval)
         self.last_modified = None
+        self.etag = None
+        self._setup_polling()
+        self.start()
+
+    def _setup_polling(self):
+        """ Helper method to set up the session used to fetch the datafile and the polling thread. """
+        # Session is reused across polls so that the connection to the datafile host is kept alive.
+        self._session = requests.Session()
+        self._session.headers[enums.HTTPHeaders.ACCEPT_ENCODING] = enums.ConfigManager.DATAFILE_ACCEPT_ENCODING
         self._polling_thread = threading.Thread(target=self._run)
         self._polling_thread.setDaemon(True)
-        self._polling_thread.start()
+
+    def _get_snapshot_source(self):
+        """ Helper method to get the string identifying where the datafile comes from.
+
+        Returns:
+            String representing URL from where the datafile is fetched.
+        """
+        return self.datafile_url
 
     @staticmethod
     def get_datafile_url(sdk_key, url, url_template):
@@ -257,6 +425,14 @@ class PollingConfigManager(StaticConfigManager):
          """
         self.last_modified = response_headers.get(enums.HTTPHeaders.LAST_MODIFIED)
 
+    def set_etag(self, response_headers):
+        """ Looks up and sets entity tag of the datafile based on ETag header in the response.
+
+         Args:
+             response_headers: requests.Response.headers
+         """
+        self.etag = response_headers.get(enums.HTTPHeaders.ETAG)
+
     def _handle_response(self, response):
         """ Helper method to handle response containing datafile.
 
@@ -275,18 +451,29 @@ class PollingConfigManager(StaticConfigManager):
             return
 
         self.set_last_modified(response.headers)
+        self.set_etag(response.headers)
         self._set_config(response.content)
 
-    def fetch_datafile(self):
-        """ Fetch datafile and set ProjectConfig. """
+    def _get_request_headers(self):
+        """ Helper method to get headers making the datafile request conditional on the datafile having changed.
 
+        Returns:
+            Dict representing the request headers.
+        """
         request_headers = {}
         if self.last_modified:
             request_headers[enums.HTTPHeaders.IF_MODIFIED_SINCE] = self.last_modified
+        if self.etag:
+            request_headers[enums.HTTPHeaders.IF_NONE_MATCH] = self.etag
+
+        return request_headers
 
-        response = requests.get(self.datafile_url,
-                                headers=request_headers,
-                                timeout=enums.ConfigManager.REQUEST_TIMEOUT)
+    def fetch_datafile(self):
+        """ Fetch datafile and set ProjectConfig. """
+
+        response = self._session.get(self.datafile_url,
+                                     headers=self._get_request_headers(),
+                                     timeout=enums.ConfigManager.REQUEST_TIMEOUT)
         self._handle_response(response)
 
     @property
@@ -309,3 +496,274 @@ class PollingConfigManager(StaticConfigManager):
         """ Start the config manager and the thread to periodically fetch datafile. """
         if not self.is_running:
             self._polling_thread.start()
+
+
+class FileConfigManager(StaticConfigManager):
+    """ Config manager that reads the datafile from a file and updates ProjectConfig whenever the file changes.
+    Changes are picked up through inotify where available and by checking the file's status at regular
+    intervals otherwise. Call stop to stop watching the file and release the inotify watch. """
+
+    def __init__(self,
+                 file_path,
+                 update_interval=None,
+                 logger=None,
+                 error_handler=None,
+                 notification_center=None,
+                 skip_json_validation=False,
+                 snapshot_path=None):
+        """ Initialize config manager.
+
+        Args:
+            file_path: Path of the datafile.
+            update_interval: Optional floating point number representing time interval in seconds
+                             at which to check the datafile for changes.
+            logger: Provides a logger instance.
+            error_handler: Provides a handle_error method to handle exceptions.
+            notification_center: Notification center to generate config update notification.
+            skip_json_validation: Optional boolean param which allows skipping JSON schema
+                                  validation upon object invocation. By default
+                                  JSON schema validation will be performed.
+            snapshot_path: Optional path of a file in which a binary snapshot of the latest ProjectConfig is kept.
+        """
+        if not file_path:
+            raise optimizely_exceptions.InvalidInputException(enums.Errors.INVALID_INPUT.format('file_path'))
+
+        self.file_path = file_path
+        self.update_interval = _get_file_check_interval(update_interval)
+        self._file_version = None
+        try:
+            datafile = self._read_datafile()
+        except (IOError, OSError):
+            # Without a datafile StaticConfigManager logs that no valid datafile was provided.
+            datafile = None
+
+        super(FileConfigManager, self).__init__(datafile=datafile,
+                                                logger=logger,
+                                                error_handler=error_handler,
+                                                notification_center=notification_center,
+                                                skip_json_validation=skip_json_validation,
+                                                snapshot_path=snapshot_path)
+        self._inotify_fd = None
+        # Pipe written to by stop to wake up the thread waiting for inotify events.
+        self._wake_fds = None
+        self._poller = None
+        self._polling_thread = None
+        self._stop_event = threading.Event()
+        self.start()
+
+    def _get_snapshot_source(self):
+        """ Helper method to get the string identifying where the datafile comes from.
+
+        Returns:
+            String representing absolute path of the datafile.
+        """
+        return os.path.abspath(self.file_path)
+
+    def _read_datafile(self):
+        """ Helper method to read the datafile if the file has changed since it was last read.
+
+        Returns:
+            String representing the datafile. None if the file has not changed.
+
+        Raises:
+            IOError or OSError if the file can not be read.
+        """
+        file_version = _get_file_version(os.stat(self.file_path))
+        if file_version == self._file_version:
+            return None
+
+        with open(self.file_path, 'rb') as datafile_file:
+            datafile = datafile_file.read()
+
+        # Version is taken before reading so that a file changed while being read is read again.
+        self._file_version = file_version
+        return datafile
+
+    def check_file(self):
+        """ Read the datafile and set ProjectConfig if the file has changed since it was last read. """
+        try:
+            datafile = self._read_datafile()
+        except (IOError, OSError) as error:
+            self.logger.error('Unable to read datafile from {}. Error: {}'.format(self.file_path, str(error)))
+            return
+
+        if datafile is not None:
+            self._set_config(datafile)
+
+    def _wait_for_change(self):
+        """ Helper method to wait until a file is written in the datafile's directory, update interval elapses
+        or the config manager is stopped. """
+        if self._inotify_fd is None:
+            self._stop_event.wait(self.update_interval)
+            return
+
+        # poll is used as select can not wait on file descriptors numbered 1024 or higher.
+        for file_descriptor, _ in self._poller.poll(self.update_interval * 1000):
+            if file_descriptor == self._inotify_fd:
+                # Events only signal that the datafile may have changed, so their contents are discarded.
+                os.read(self._inotify_fd, 4096)
+
+    def _watch(self):
+        """ Helper method to set up the inotify watch of the datafile and the pipe waking up the thread waiting for
+        its events. Leaves the inotify file descriptor unset if inotify is not available. """
+        self._inotify_fd = _create_inotify_watch(self.file_path)
+        if self._inotify_fd is None:
+            return
+
+        self._wake_fds = os.pipe()
+        self._poller = select.poll()
+        self._poller.register(self._inotify_fd, select.POLLIN)
+        self._poller.register(self._wake_fds[0], select.POLLIN)
+
+    def _unwatch(self):
+        """ Helper method to close the file descriptors of the inotify watch and of the wake up pipe. """
+        for file_descriptor in [self._inotify_fd] + list(self._wake_fds or []):
+            if file_descriptor is not None:
+                os.close(file_descriptor)
+
+        self._inotify_fd = None
+        self._wake_fds = None
+        self._poller = None
+
+    @property
+    def is_running(self):
+        """ Check if polling thread is alive or not. """
+        return self._polling_thread is not None and self._polling_thread.is_alive()
+
+    def _run(self):
+        """ Triggered as part of the thread which waits for the datafile to change and updates the config. """
+        while not self._stop_event.is_set():
+            self._wait_for_change()
+            if not self._stop_event.is_set():
+                self.check_file()
+
+    def start(self):
+        """ Start the config manager and the thread to watch the datafile. """
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        if self._inotify_fd is None:
+            self._watch()
+        self._polling_thread = threading.Thread(target=self._run)
+        self._polling_thread.setDaemon(True)
+        self._polling_thread.start()
+
+    def stop(self):
+        """ Stop the thread watching the datafile and close the inotify watch. Config read so far remains available. """
+        self._stop_event.set()
+        if self.is_running:
+            if self._wake_fds is not None:
+                os.write(self._wake_fds[1], b'\0')
+            self._polling_thread.join()
+
+        self._unwatch()
+
+
+class SnapshotConfigManager(BaseConfigManager):
+    """ Config manager that follows the config snapshot published by another process, typically a
+    PollingConfigManager or StaticConfigManager given the same snapshot_path. Config is loaded from the
+    snapshot whenever a new one is published, without fetching or parsing the datafile. Each process following
+    the snapshot unpickles its own copy of the config. """
+
+    def __init__(self,
+                 snapshot_path,
+                 update_interval=None,
+                 logger=None,
+                 error_handler=None,
+                 notification_center=None):
+        """ Initialize config manager.
+
+        Args:
+            snapshot_path: Path of the snapshot file published by another config manager.
+            update_interval: Optional floating point number representing time interval in seconds
+                             at which to check if a new snapshot is published.
+            logger: Provides a logger instance.
+            error_handler: Provides a handle_error method to handle exceptions.
+            notification_center: Notification center to generate config update notification.
+        """
+        super(SnapshotConfigManager, self).__init__(logger=logger,
+                                                    error_handler=error_handler,
+                                                    notification_center=notification_center)
+        if not snapshot_path:
+            raise optimizely_exceptions.InvalidInputException(enums.Errors.INVALID_INPUT.format('snapshot_path'))
+
+        self.snapshot_path = snapshot_path
+        self.update_interval = _get_file_check_interval(update_interval)
+        self._config = None
+        self._snapshot_version = None
+        # Number of times config has been replaced with one of a new revision.
+        self.config_update_count = 0
+        self._polling_thread = None
+        self._stop_event = threading.Event()
+        self.check_snapshot()
+        self.start()
+
+    def check_snapshot(self):
+        """ Load config from the snapshot if one has been published since the snapshot was last loaded.
+        Snapshots are replaced atomically, so a new one is detected from the file's status alone. """
+
+        try:
+            snapshot_stat = os.stat(self.snapshot_path)
+        except OSError:
+            return
+
+        snapshot_version = _get_file_version(snapshot_stat)
+        if snapshot_version == self._snapshot_version:
+            return
+
+        # Version is recorded before loading so that a snapshot published while loading is not missed.
+        self._snapshot_version = snapshot_version
+        config = config_snapshot.load_snapshot(self.snapshot_path, None, self.logger, self.error_handler,
+                                               project_id=self._config.get_project_id() if self._config else None)
+        if config is None:
+            return
+
+        previous_revision = self._config.get_revision() if self._config else None
+        if previous_revision == config.get_revision():
+            return
+
+        self._config = config
+        self.config_update_count += 1
+        self.notification_center.send_notifications(enums.NotificationTypes.OPTIMIZELY_CONFIG_UPDATE)
+        self.logger.debug(
+            'Loaded new config snapshot. '
+            'Old revision number: {}. New revision number: {}.'.format(previous_revision, config.get_revision())
+        )
+
+    def get_config(self):
+        """ Returns instance of ProjectConfig.
+
+        Returns:
+            ProjectConfig. None if no snapshot has been published yet.
+        """
+        return self._config
+
+    @property
+    def is_running(self):
+        """ Check if polling thread is alive or not. """
+        return self._polling_thread is not None and self._polling_thread.is_alive()
+
+    def _run(self):
+        """ Triggered as part of the thread which checks for a new snapshot and waits until next update interval. """
+        while not self._stop_event.is_set():
+            self.check_snapshot()
+            self._stop_event.wait(self.update_interval)
+
+    def start(self):
+        """ Start the config manager and the thread to periodically check for a new snapshot. """
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._polling_thread = threading.Thread(target=self._run)
+        self._polling_thread.setDaemon(True)
+        self._polling_thread.start()
+
+    def stop(self):
+        """ Stop the thread checking for a new snapshot. Config loaded so far remains available. """
+        if not self.is_running:
+            return
+
+        self._stop_event.set()
+        self._polling_thread.join()
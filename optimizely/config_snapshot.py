@@ -0,0 +1,176 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Binary snapshots of a fully built ProjectConfig.
+
+A snapshot file holds two pickles: a small header identifying the snapshot and the ProjectConfig itself.
+The header is checked before the config is loaded so that snapshots written by another SDK version or
+Python version, or for another datafile, datafile source or project are ignored. Snapshots are only to be
+loaded from trusted locations since unpickling can execute arbitrary code.
+"""
+
+import hashlib
+import mmap
+import os
+import sys
+import tempfile
+
+from contextlib import closing
+from six import text_type
+from six.moves import cPickle as pickle
+
+from . import version
+
+SNAPSHOT_MAGIC = 'optimizely-config-snapshot'
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def get_datafile_digest(datafile):
+  """ Get digest identifying the datafile.
+
+  Args:
+    datafile: JSON string representing the project.
+
+  Returns:
+    String representing hex digest of the datafile. None if datafile is not provided.
+  """
+
+  if datafile is None:
+    return None
+
+  if isinstance(datafile, text_type):
+    datafile = datafile.encode('utf-8')
+
+  return hashlib.sha1(datafile).hexdigest()
+
+
+def _create_header(project_config, datafile_digest, source):
+  """ Helper method to create header identifying a snapshot.
+
+  Args:
+    project_config: ProjectConfig to be saved in the snapshot.
+    datafile_digest: Digest of the datafile the config was built from.
+    source: String identifying where the datafile comes from, e.g. its URL. None if not known.
+
+  Returns:
+    Dict representing the snapshot header.
+  """
+
+  return {
+    'magic': SNAPSHOT_MAGIC,
+    'format_version': SNAPSHOT_FORMAT_VERSION,
+    'sdk_version': version.__version__,
+    'python_version': sys.version_info[0],
+    'revision': project_config.get_revision(),
+    'project_id': project_config.get_project_id(),
+    'datafile_digest': datafile_digest,
+    'source': source,
+  }
+
+
+def save_snapshot(path, project_config, datafile, logger, source=None):
+  """ Save ProjectConfig to a snapshot file. The file is replaced atomically so concurrent readers never
+  see a partially written snapshot.
+
+  Args:
+    path: Path of the snapshot file.
+    project_config: ProjectConfig to be saved.
+    datafile: JSON string representing the project the config was built from.
+    logger: Provides a logger instance.
+    source: Optional string identifying where the datafile comes from, e.g. its URL.
+
+  Returns:
+    Boolean representing if the snapshot was saved.
+  """
+
+  header = _create_header(project_config, get_datafile_digest(datafile), source)
+  temp_path = None
+  try:
+    file_descriptor, temp_path = tempfile.mkstemp(prefix='.optimizely-snapshot-',
+                                                  dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(file_descriptor, 'wb') as snapshot_file:
+      pickle.dump(header, snapshot_file, pickle.HIGHEST_PROTOCOL)
+      pickle.dump(project_config, snapshot_file, pickle.HIGHEST_PROTOCOL)
+
+    # os.replace overwrites an existing file on all platforms but is not available in Python 2.
+    getattr(os, 'replace', os.rename)(temp_path, path)
+  except Exception as error:
+    logger.warning('Unable to save config snapshot to {}. Error: {}'.format(path, str(error)))
+    if temp_path and os.path.exists(temp_path):
+      os.remove(temp_path)
+    return False
+
+  logger.debug('Saved config snapshot of revision {} to {}.'.format(project_config.get_revision(), path))
+  return True
+
+
+def load_snapshot(path, datafile, logger, error_handler, source=None, project_id=None):
+  """ Load ProjectConfig from a snapshot file.
+
+  Args:
+    path: Path of the snapshot file.
+    datafile: Optional JSON string representing the project. If provided, snapshot is only loaded if it was
+              saved for the same datafile.
+    logger: Provides a logger instance to be used by the loaded config.
+    error_handler: Provides a handle_error method to be used by the loaded config.
+    source: Optional string identifying where the datafile comes from. If provided, snapshot is only loaded if it
+            was saved for the same source.
+    project_id: Optional ID of the project. If provided, snapshot is only loaded if it was saved for the same project.
+
+  Returns:
+    ProjectConfig loaded from the snapshot. None if there is no usable snapshot.
+  """
+
+  if not os.path.isfile(path):
+    logger.debug('No config snapshot found at {}.'.format(path))
+    return None
+
+  try:
+    # Snapshot is read through a memory map so that it is not read into memory in full before being unpickled.
+    # Each process loading it still unpickles its own copy of the config.
+    with open(path, 'rb') as snapshot_file:
+      snapshot_map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with closing(snapshot_map):
+      header = pickle.load(snapshot_map)
+      if not isinstance(header, dict) or header.get('magic') != SNAPSHOT_MAGIC:
+        logger.warning('File {} is not a config snapshot.'.format(path))
+        return None
+
+      if header.get('format_version') != SNAPSHOT_FORMAT_VERSION or \
+         header.get('sdk_version') != version.__version__ or \
+         header.get('python_version') != sys.version_info[0]:
+        logger.debug('Ignoring config snapshot {} saved by a different SDK or Python version.'.format(path))
+        return None
+
+      if datafile is not None and header.get('datafile_digest') != get_datafile_digest(datafile):
+        logger.debug('Ignoring config snapshot {} saved for a different datafile.'.format(path))
+        return None
+
+      if source is not None and header.get('source') != source:
+        logger.debug('Ignoring config snapshot {} saved for a different datafile source.'.format(path))
+        return None
+
+      if project_id is not None and header.get('project_id') != project_id:
+        logger.debug('Ignoring config snapshot {} saved for a different project.'.format(path))
+        return None
+
+      project_config = pickle.load(snapshot_map)
+  except Exception as error:
+    logger.warning('Unable to load config snapshot from {}. Error: {}'.format(path, str(error)))
+    return None
+
+  project_config.logger = logger
+  project_config.error_handler = error_handler
+  logger.debug('Loaded config snapshot of revision {} from {}.'.format(header.get('revision'), path))
+  return project_config
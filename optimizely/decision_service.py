@@ -15,6 +15,7 @@ from collections import namedtuple
 from six import string_types
 
 from . import bucketer
+from . import logger as optimizely_logger
 from .helpers import audience as audience_helper
 from .helpers import enums
 from .helpers import experiment as experiment_helper
@@ -23,15 +24,119 @@ from .user_profile import UserProfile
 
 Decision = namedtuple('Decision', 'experiment variation source')
 
+# Sentinel distinguishing a cached None decision from a decision not in the cache.
+_NOT_CACHED = object()
+
+
+class UserProfileSession(object):
+  """ Profile of a user shared by the decisions made within a single API call.
+  Profile is looked up from the user profile service when a decision first needs it
+  and decisions made in the meantime are saved back with a single save. """
+
+  def __init__(self, user_profile_service, user_id, logger):
+    self.user_profile_service = user_profile_service
+    self.user_id = user_id
+    self.logger = logger
+    self.user_profile = None
+    self._looked_up = False
+    self._updated = False
+
+  def __bool__(self):
+    """ Session is only worth using when there is a user profile service to look up and save the profile with. """
+    return bool(self.user_profile_service)
+
+  __nonzero__ = __bool__
+
+  def lookup(self):
+    """ Look up the user's profile, only retrieving it from the user profile service on first call.
+
+    Returns:
+      UserProfile of the user. None if lookup failed or returned a profile in an invalid format.
+    """
+
+    if self._looked_up:
+      return self.user_profile
+
+    try:
+      retrieved_profile = self.user_profile_service.lookup(self.user_id)
+    except:
+      self.logger.exception('Unable to retrieve user profile for user "%s" as lookup failed.' % self.user_id)
+      retrieved_profile = None
+
+    if retrieved_profile is None:
+      self.logger.warning('User profile has invalid format.')
+
+    self.preload(retrieved_profile)
+    return self.user_profile
+
+  def preload(self, retrieved_profile):
+    """ Use profile retrieved for the user by a bulk lookup instead of looking it up on first use.
+
+    Args:
+      retrieved_profile: Dict representing the user's profile. None if the user has no profile.
+    """
+
+    self._looked_up = True
+    if retrieved_profile is None:
+      return
+
+    if validator.is_user_profile_valid(retrieved_profile):
+      self.user_profile = UserProfile(**retrieved_profile)
+    else:
+      self.logger.warning('User profile has invalid format.')
+
+  def save_variation_for_experiment(self, experiment_id, variation_id):
+    """ Add new decision to the user's profile, to be saved with the next call to save.
+
+    Args:
+      experiment_id: ID for experiment for which the decision is to be stored.
+      variation_id: ID for variation that the user saw.
+    """
+
+    if self.lookup() is None:
+      self.user_profile = UserProfile(self.user_id)
+
+    if self.user_profile.get_variation_for_experiment(experiment_id) != variation_id:
+      self.user_profile.save_variation_for_experiment(experiment_id, variation_id)
+      self._updated = True
+
+  def pop_updated_profile(self):
+    """ Take the user's profile to be saved by a bulk save, marking decisions added to it as saved.
+
+    Returns:
+      Dict representing the user's profile. None if no decisions were added to it since it was last saved.
+    """
+
+    if not self._updated:
+      return None
+
+    self._updated = False
+    return self.user_profile.__dict__
+
+  def save(self):
+    """ Save the user's profile with the user profile service if decisions were added to it. """
+
+    user_profile = self.pop_updated_profile()
+    if user_profile is None:
+      return
+
+    try:
+      self.user_profile_service.save(user_profile)
+    except:
+      self.logger.exception('Unable to save user profile for user "%s".' % self.user_id)
+
 
 class DecisionService(object):
   """ Class encapsulating all decision related capabilities. """
 
-  def __init__(self, logger, user_profile_service):
-    self.bucketer = bucketer.Bucketer()
+  def __init__(self, logger, user_profile_service, bucket_value_cache=None, decision_cache=None):
+    self.bucketer = bucketer.Bucketer(bucket_value_cache)
     self.logger = logger
     self.user_profile_service = user_profile_service
 
+    # Optional cache of decisions keyed by config revision, user ID, attributes and experiment or feature.
+    self.decision_cache = decision_cache
+
     # Map of user IDs to another map of experiments to variations.
     # This contains all the forced variations set by the user
     # by calling set_forced_variation (it is not the same as the
@@ -60,6 +165,50 @@ class DecisionService(object):
 
     return user_id
 
+  @staticmethod
+  def _get_attributes_cache_key(attributes):
+    """ Helper method to determine a hashable representation of the user attributes.
+
+    Args:
+      attributes: Dict representing user attributes.
+
+    Returns:
+      Frozenset of attribute key, value type and value. None if any of the values is not hashable.
+    """
+
+    if not attributes:
+      return frozenset()
+
+    try:
+      # Value type is part of the key since True == 1 == 1.0 but they are evaluated differently by audiences.
+      return frozenset((key, type(value), value) for key, value in attributes.items())
+    except TypeError:
+      return None
+
+  def _get_decision_cache_key(self, project_config, entity_type, entity_id, user_id, attributes, *args):
+    """ Helper method to determine key under which a decision is cached.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      entity_type: String denoting whether decision is for an experiment or a feature.
+      entity_id: ID of the experiment or feature.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+      args: Any other inputs the decision depends on.
+
+    Returns:
+      Tuple to be used as key in the decision cache. None if decisions are not to be cached.
+    """
+
+    if self.decision_cache is None:
+      return None
+
+    attributes_key = self._get_attributes_cache_key(attributes)
+    if attributes_key is None:
+      return None
+
+    return (project_config.get_revision(), user_id, attributes_key, entity_type, entity_id) + args
+
   def set_forced_variation(self, project_config, experiment_key, user_id, variation_key):
     """ Sets users to a map of experiments to forced variations.
 
@@ -83,17 +232,24 @@ class DecisionService(object):
         experiment_to_variation_map = self.forced_variation_map.get(user_id)
         if experiment_id in experiment_to_variation_map:
           del(self.forced_variation_map[user_id][experiment_id])
-          self.logger.debug('Variation mapped to experiment "%s" has been removed for user "%s".' % (
-            experiment_key,
-            user_id
-          ))
+          self._reset_decision_cache()
+          optimizely_logger.log_debug(
+            self.logger,
+            'Variation mapped to experiment "%s" has been removed for user "%s".',
+            experiment_key, user_id
+          )
         else:
-          self.logger.debug('Nothing to remove. Variation mapped to experiment "%s" for user "%s" does not exist.' % (
-            experiment_key,
-            user_id
-          ))
+          optimizely_logger.log_debug(
+            self.logger,
+            'Nothing to remove. Variation mapped to experiment "%s" for user "%s" does not exist.',
+            experiment_key, user_id
+          )
       else:
-        self.logger.debug('Nothing to remove. User "%s" does not exist in the forced variation map.' % user_id)
+        optimizely_logger.log_debug(
+          self.logger,
+          'Nothing to remove. User "%s" does not exist in the forced variation map.',
+          user_id
+        )
       return True
 
     if not validator.is_non_empty_string(variation_key):
@@ -112,13 +268,21 @@ class DecisionService(object):
     else:
       self.forced_variation_map[user_id][experiment_id] = variation_id
 
-    self.logger.debug('Set variation "%s" for experiment "%s" and user "%s" in the forced variation map.' % (
-      variation_id,
-      experiment_id,
-      user_id
-    ))
+    self._reset_decision_cache()
+
+    optimizely_logger.log_debug(
+      self.logger,
+      'Set variation "%s" for experiment "%s" and user "%s" in the forced variation map.',
+      variation_id, experiment_id, user_id
+    )
     return True
 
+  def _reset_decision_cache(self):
+    """ Helper method to drop cached decisions since they may no longer hold. """
+
+    if self.decision_cache is not None:
+      self.decision_cache.reset()
+
   def get_forced_variation(self, project_config, experiment_key, user_id):
     """ Gets the forced variation key for the given user and experiment.
 
@@ -132,7 +296,7 @@ class DecisionService(object):
     """
 
     if user_id not in self.forced_variation_map:
-      self.logger.debug('User "%s" is not in the forced variation map.' % user_id)
+      optimizely_logger.log_debug(self.logger, 'User "%s" is not in the forced variation map.', user_id)
       return None
 
     experiment = project_config.get_experiment_from_key(experiment_key)
@@ -143,26 +307,24 @@ class DecisionService(object):
     experiment_to_variation_map = self.forced_variation_map.get(user_id)
 
     if not experiment_to_variation_map:
-      self.logger.debug('No experiment "%s" mapped to user "%s" in the forced variation map.' % (
-        experiment_key,
-        user_id
-      ))
+      optimizely_logger.log_debug(self.logger, 'No experiment "%s" mapped to user "%s" in the forced variation map.',
+                                  experiment_key, user_id)
       return None
 
     variation_id = experiment_to_variation_map.get(experiment.id)
     if variation_id is None:
-      self.logger.debug(
-        'No variation mapped to experiment "%s" in the forced variation map.' % experiment_key
+      optimizely_logger.log_debug(
+        self.logger, 'No variation mapped to experiment "%s" in the forced variation map.', experiment_key
       )
       return None
 
     variation = project_config.get_variation_from_id(experiment_key, variation_id)
 
-    self.logger.debug('Variation "%s" is mapped to experiment "%s" and user "%s" in the forced variation map' % (
-      variation.key,
-      experiment_key,
-      user_id
-    ))
+    optimizely_logger.log_debug(
+      self.logger,
+      'Variation "%s" is mapped to experiment "%s" and user "%s" in the forced variation map',
+      variation.key, experiment_key, user_id
+    )
     return variation
 
   def get_whitelisted_variation(self, project_config, experiment, user_id):
@@ -183,7 +345,7 @@ class DecisionService(object):
       variation_key = forced_variations.get(user_id)
       variation = project_config.get_variation_from_key(experiment.key, variation_key)
       if variation:
-        self.logger.info('User "%s" is forced in variation "%s".' % (user_id, variation_key))
+        optimizely_logger.log_info(self.logger, 'User "%s" is forced in variation "%s".', user_id, variation_key)
       return variation
 
     return None
@@ -206,16 +368,210 @@ class DecisionService(object):
     if variation_id:
       variation = project_config.get_variation_from_id(experiment.key, variation_id)
       if variation:
-        self.logger.info('Found a stored decision. User "%s" is in variation "%s" of experiment "%s".' % (
-          user_id,
-          variation.key,
-          experiment.key
-        ))
+        optimizely_logger.log_info(
+          self.logger,
+          'Found a stored decision. User "%s" is in variation "%s" of experiment "%s".',
+          user_id, variation.key, experiment.key
+        )
         return variation
 
     return None
 
-  def get_variation(self, project_config, experiment, user_id, attributes, ignore_user_profile=False):
+  def get_variation(self, project_config, experiment, user_id, attributes, ignore_user_profile=False,
+                    user_profile_session=None, bucketing_id=None):
+    """ Determine variation user should be put in, from the decision cache if enabled.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiment: Experiment for which user variation needs to be determined.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+      ignore_user_profile: True to ignore the user profile lookup. Defaults to False.
+      user_profile_session: Optional UserProfileSession shared with other decisions made for the user,
+                            left for the caller to save. By default the user profile is looked up and saved
+                            for this decision alone.
+      bucketing_id: Optional bucketing ID already determined for the user.
+
+    Returns:
+      Variation user should see. None if user is not in experiment or experiment is not running.
+    """
+
+    cache_key = self._get_decision_cache_key(
+      project_config, 'experiment', experiment.id, user_id, attributes, ignore_user_profile
+    )
+    if cache_key is not None:
+      variation = self.decision_cache.lookup(cache_key, _NOT_CACHED)
+      if variation is not _NOT_CACHED:
+        return variation
+
+    owns_user_profile_session = user_profile_session is None and not ignore_user_profile
+    if owns_user_profile_session:
+      user_profile_session = self.start_user_profile_session(user_id)
+
+    variation = self._get_variation(project_config, experiment, user_id, attributes,
+                                    None if ignore_user_profile else user_profile_session, bucketing_id)
+    if cache_key is not None:
+      self.decision_cache.save(cache_key, variation)
+
+    if owns_user_profile_session:
+      user_profile_session.save()
+
+    return variation
+
+  def get_variations(self, project_config, experiments, user_id, attributes):
+    """ Determine variations user should be put in for each of the given experiments,
+    from the decision cache if enabled. Bucketing ID is determined once, the user profile is looked up once
+    and new decisions are saved to it with a single save.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiments: List of experiments for which user variation needs to be determined.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+
+    Returns:
+      List of variations in the same order as the given experiments.
+      Variation is None if user is not in the experiment or the experiment is not running.
+    """
+
+    bucketing_id = self._get_bucketing_id(user_id, attributes)
+    user_profile_session = self.start_user_profile_session(user_id)
+    variations = [
+      self.get_variation(project_config, experiment, user_id, attributes,
+                         user_profile_session=user_profile_session, bucketing_id=bucketing_id)
+      for experiment in experiments
+    ]
+    user_profile_session.save()
+
+    return variations
+
+  def get_variation_for_users(self, project_config, experiment, user_ids, user_attributes=None):
+    """ Determine variations many users should be put in for the experiment, from the decision cache if enabled.
+    Intended for offline recomputation of assignments and batch decision endpoints. If the user profile service
+    supports bulk operations (see user_profile.BulkUserProfileService), profiles of all users are looked up
+    with a single lookup_many and new decisions are saved with a single save_many.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiment: Experiment for which user variations need to be determined.
+      user_ids: List of IDs for users.
+      user_attributes: Optional dict mapping user IDs to dicts representing user attributes.
+
+    Returns:
+      List of variations in the same order as user_ids.
+      Variation is None if user is not in the experiment or the experiment is not running.
+    """
+
+    # Nothing is looked up for an experiment no user can be in.
+    if not experiment_helper.is_experiment_running(experiment):
+      optimizely_logger.log_info(self.logger, 'Experiment "%s" is not running.', experiment.key)
+      return [None] * len(user_ids)
+
+    user_attributes = user_attributes or {}
+    user_profile_sessions = {}
+    # Sessions in the order of user_ids so that bulk calls see users in that order.
+    ordered_user_profile_sessions = []
+    # Sessions of users whose decision is not cached, the only ones whose profiles are needed.
+    uncached_user_profile_sessions = []
+    for user_id in user_ids:
+      if user_id not in user_profile_sessions:
+        user_profile_session = self.start_user_profile_session(user_id)
+        user_profile_sessions[user_id] = user_profile_session
+        ordered_user_profile_sessions.append(user_profile_session)
+        if not self._is_variation_cached(project_config, experiment, user_id, user_attributes.get(user_id)):
+          uncached_user_profile_sessions.append(user_profile_session)
+
+    is_bulk = user_profile_sessions and validator.is_bulk_user_profile_service(self.user_profile_service)
+    if is_bulk and uncached_user_profile_sessions:
+      self._lookup_user_profiles(uncached_user_profile_sessions)
+
+    variations = [
+      self.get_variation(project_config, experiment, user_id, user_attributes.get(user_id),
+                         user_profile_session=user_profile_sessions[user_id])
+      for user_id in user_ids
+    ]
+
+    if is_bulk:
+      self._save_user_profiles(ordered_user_profile_sessions)
+    else:
+      for user_profile_session in ordered_user_profile_sessions:
+        user_profile_session.save()
+
+    return variations
+
+  def _is_variation_cached(self, project_config, experiment, user_id, attributes):
+    """ Helper method to determine if the decision cache holds the variation get_variation would return
+    for the user.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiment: Experiment for which user variation needs to be determined.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+
+    Returns:
+      Boolean indicating if the variation is cached.
+    """
+
+    cache_key = self._get_decision_cache_key(project_config, 'experiment', experiment.id, user_id, attributes, False)
+    return cache_key is not None and self.decision_cache.lookup(cache_key, _NOT_CACHED) is not _NOT_CACHED
+
+  def _lookup_user_profiles(self, user_profile_sessions):
+    """ Helper method to look up profiles of many users with a single lookup_many.
+
+    Args:
+      user_profile_sessions: List of UserProfileSession for the users.
+    """
+
+    try:
+      retrieved_profiles = self.user_profile_service.lookup_many(
+        [user_profile_session.user_id for user_profile_session in user_profile_sessions]
+      )
+    except:
+      self.logger.exception('Unable to retrieve user profiles for %s users as lookup failed.' %
+                            len(user_profile_sessions))
+      retrieved_profiles = {}
+
+    if not isinstance(retrieved_profiles, dict):
+      self.logger.warning('User profiles for %s users have invalid format.' % len(user_profile_sessions))
+      retrieved_profiles = {}
+
+    for user_profile_session in user_profile_sessions:
+      user_profile_session.preload(retrieved_profiles.get(user_profile_session.user_id))
+
+  def _save_user_profiles(self, user_profile_sessions):
+    """ Helper method to save profiles of many users to which decisions were added with a single save_many.
+
+    Args:
+      user_profile_sessions: List of UserProfileSession for the users.
+    """
+
+    user_profiles = [user_profile for user_profile in
+                     (user_profile_session.pop_updated_profile() for user_profile_session in user_profile_sessions)
+                     if user_profile is not None]
+    if not user_profiles:
+      return
+
+    try:
+      self.user_profile_service.save_many(user_profiles)
+    except:
+      self.logger.exception('Unable to save user profiles for %s users.' % len(user_profiles))
+
+  def start_user_profile_session(self, user_id):
+    """ Start a session through which decisions made for the user within a single API call share
+    one lookup and one save of the user's profile.
+
+    Args:
+      user_id: ID for user.
+
+    Returns:
+      UserProfileSession for the user. Its save method needs to be called once all decisions are made.
+    """
+
+    return UserProfileSession(self.user_profile_service, user_id, self.logger)
+
+  def _get_variation(self, project_config, experiment, user_id, attributes, user_profile_session=None,
+                     bucketing_id=None):
     """ Top-level function to help determine variation user should be put in.
 
     First, check if experiment is running.
@@ -229,7 +585,9 @@ class DecisionService(object):
       experiment: Experiment for which user variation needs to be determined.
       user_id: ID for user.
       attributes: Dict representing user attributes.
-      ignore_user_profile: True to ignore the user profile lookup. Defaults to False.
+      user_profile_session: Optional UserProfileSession to look up stored decisions from and add
+                            the new decision to. User profile is ignored if not provided.
+      bucketing_id: Optional bucketing ID already determined for the user.
 
     Returns:
       Variation user should see. None if user is not in experiment or experiment is not running.
@@ -237,7 +595,7 @@ class DecisionService(object):
 
     # Check if experiment is running
     if not experiment_helper.is_experiment_running(experiment):
-      self.logger.info('Experiment "%s" is not running.' % experiment.key)
+      optimizely_logger.log_info(self.logger, 'Experiment "%s" is not running.', experiment.key)
       return None
 
     # Check if the user is forced into a variation
@@ -251,47 +609,33 @@ class DecisionService(object):
       return variation
 
     # Check to see if user has a decision available for the given experiment
-    user_profile = UserProfile(user_id)
-    if not ignore_user_profile and self.user_profile_service:
-      try:
-        retrieved_profile = self.user_profile_service.lookup(user_id)
-      except:
-        self.logger.exception('Unable to retrieve user profile for user "%s" as lookup failed.' % user_id)
-        retrieved_profile = None
-
-      if validator.is_user_profile_valid(retrieved_profile):
-        user_profile = UserProfile(**retrieved_profile)
+    if user_profile_session:
+      user_profile = user_profile_session.lookup()
+      if user_profile is not None:
         variation = self.get_stored_variation(project_config, experiment, user_profile)
         if variation:
           return variation
-      else:
-        self.logger.warning('User profile has invalid format.')
 
     # Bucket user and store the new decision
     if not audience_helper.is_user_in_experiment(project_config, experiment, attributes, self.logger):
-      self.logger.info('User "%s" does not meet conditions to be in experiment "%s".' % (
-        user_id,
-        experiment.key
-      ))
+      optimizely_logger.log_info(self.logger, 'User "%s" does not meet conditions to be in experiment "%s".',
+                                 user_id, experiment.key)
       return None
 
     # Determine bucketing ID to be used
-    bucketing_id = self._get_bucketing_id(user_id, attributes)
+    if bucketing_id is None:
+      bucketing_id = self._get_bucketing_id(user_id, attributes)
     variation = self.bucketer.bucket(project_config, experiment, user_id, bucketing_id)
 
     if variation:
       # Store this new decision and return the variation for the user
-      if not ignore_user_profile and self.user_profile_service:
-        try:
-          user_profile.save_variation_for_experiment(experiment.id, variation.id)
-          self.user_profile_service.save(user_profile.__dict__)
-        except:
-          self.logger.exception('Unable to save user profile for user "%s".' % user_id)
+      if user_profile_session:
+        user_profile_session.save_variation_for_experiment(experiment.id, variation.id)
       return variation
 
     return None
 
-  def get_variation_for_rollout(self, project_config, rollout, user_id, attributes=None):
+  def get_variation_for_rollout(self, project_config, rollout, user_id, attributes=None, bucketing_id=None):
     """ Determine which experiment/variation the user is in for a given rollout.
     Returns the variation of the first experiment the user qualifies for.
 
@@ -300,6 +644,7 @@ class DecisionService(object):
       rollout: Rollout for which we are getting the variation.
       user_id: ID for user.
       attributes: Dict representing user attributes.
+      bucketing_id: Optional bucketing ID already determined for the user.
 
     Returns:
       Decision namedtuple consisting of experiment and variation for the user.
@@ -312,27 +657,23 @@ class DecisionService(object):
 
         # Check if user meets audience conditions for targeting rule
         if not audience_helper.is_user_in_experiment(project_config, experiment, attributes, self.logger):
-          self.logger.debug('User "%s" does not meet conditions for targeting rule %s.' % (
-            user_id,
-            idx + 1
-          ))
+          optimizely_logger.log_debug(self.logger, 'User "%s" does not meet conditions for targeting rule %s.',
+                                      user_id, idx + 1)
           continue
 
-        self.logger.debug('User "%s" meets conditions for targeting rule %s.' % (user_id, idx + 1))
+        optimizely_logger.log_debug(self.logger, 'User "%s" meets conditions for targeting rule %s.', user_id, idx + 1)
         # Determine bucketing ID to be used
-        bucketing_id = self._get_bucketing_id(user_id, attributes)
+        if bucketing_id is None:
+          bucketing_id = self._get_bucketing_id(user_id, attributes)
         variation = self.bucketer.bucket(project_config, experiment, user_id, bucketing_id)
         if variation:
-          self.logger.debug('User "%s" is in variation %s of experiment %s.' % (
-            user_id,
-            variation.key,
-            experiment.key
-          ))
+          optimizely_logger.log_debug(self.logger, 'User "%s" is in variation %s of experiment %s.',
+                                      user_id, variation.key, experiment.key)
           return Decision(experiment, variation, enums.DecisionSources.ROLLOUT)
         else:
           # Evaluate no further rules
-          self.logger.debug('User "%s" is not in the traffic group for the targeting else. '
-                            'Checking "Everyone Else" rule now.' % user_id)
+          optimizely_logger.log_debug(self.logger, 'User "%s" is not in the traffic group for the targeting else. '
+                                      'Checking "Everyone Else" rule now.', user_id)
           break
 
       # Evaluate last rule i.e. "Everyone Else" rule
@@ -343,10 +684,12 @@ class DecisionService(object):
         attributes,
         self.logger):
         # Determine bucketing ID to be used
-        bucketing_id = self._get_bucketing_id(user_id, attributes)
+        if bucketing_id is None:
+          bucketing_id = self._get_bucketing_id(user_id, attributes)
         variation = self.bucketer.bucket(project_config, everyone_else_experiment, user_id, bucketing_id)
         if variation:
-          self.logger.debug('User "%s" meets conditions for targeting rule "Everyone Else".' % user_id)
+          optimizely_logger.log_debug(self.logger, 'User "%s" meets conditions for targeting rule "Everyone Else".',
+                                      user_id)
           return Decision(everyone_else_experiment, variation, enums.DecisionSources.ROLLOUT)
 
     return Decision(None, None, enums.DecisionSources.ROLLOUT)
@@ -363,26 +706,23 @@ class DecisionService(object):
       Experiment if the user is bucketed into an experiment in the specified group. None otherwise.
     """
 
-    experiment_id = self.bucketer.find_bucket(project_config, bucketing_id, group.id, group.trafficAllocation)
+    experiment_id = self.bucketer.find_bucket(project_config, bucketing_id, group.id,
+                                              project_config.get_traffic_allocation_table(group))
     if experiment_id:
       experiment = project_config.get_experiment_from_id(experiment_id)
       if experiment:
-        self.logger.info('User with bucketing ID "%s" is in experiment %s of group %s.' % (
-          bucketing_id,
-          experiment.key,
-          group.id
-        ))
+        optimizely_logger.log_info(self.logger, 'User with bucketing ID "%s" is in experiment %s of group %s.',
+                                   bucketing_id, experiment.key, group.id)
         return experiment
 
-    self.logger.info('User with bucketing ID "%s" is not in any experiments of group %s.' % (
-      bucketing_id,
-      group.id
-    ))
+    optimizely_logger.log_info(self.logger, 'User with bucketing ID "%s" is not in any experiments of group %s.',
+                               bucketing_id, group.id)
 
     return None
 
   def get_variation_for_feature(self, project_config, feature, user_id, attributes=None):
-    """ Returns the experiment/variation the user is bucketed in for the given feature.
+    """ Returns the experiment/variation the user is bucketed in for the given feature,
+    from the decision cache if enabled.
 
     Args:
       project_config: Instance of ProjectConfig.
@@ -394,22 +734,88 @@ class DecisionService(object):
       Decision namedtuple consisting of experiment and variation for the user.
     """
 
+    cache_key = self._get_decision_cache_key(project_config, 'feature', feature.id, user_id, attributes)
+    if cache_key is not None:
+      decision = self.decision_cache.lookup(cache_key)
+      if decision is not None:
+        return decision
+
+    decision = self._get_variation_for_feature(project_config, feature, user_id, attributes)
+    if cache_key is not None:
+      self.decision_cache.save(cache_key, decision)
+
+    return decision
+
+  def get_variations_for_features(self, project_config, features, user_id, attributes=None):
+    """ Returns the experiment/variation the user is bucketed in for each of the given features.
+    Bucketing ID is determined once, the user is bucketed into each mutex group once
+    and the user profile is looked up and saved once.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      features: List of features for which we are determining if they are enabled or not for the given user.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+
+    Returns:
+      List of Decision namedtuples in the same order as the given features.
+    """
+
     bucketing_id = self._get_bucketing_id(user_id, attributes)
+    group_experiments = {}
+    user_profile_session = self.start_user_profile_session(user_id)
+    decisions = []
+    for feature in features:
+      cache_key = self._get_decision_cache_key(project_config, 'feature', feature.id, user_id, attributes)
+      decision = self.decision_cache.lookup(cache_key) if cache_key is not None else None
+      if decision is None:
+        decision = self._get_variation_for_feature(project_config, feature, user_id, attributes,
+                                                   bucketing_id, group_experiments, user_profile_session)
+        if cache_key is not None:
+          self.decision_cache.save(cache_key, decision)
+      decisions.append(decision)
+    user_profile_session.save()
+
+    return decisions
+
+  def _get_variation_for_feature(self, project_config, feature, user_id, attributes=None,
+                                 bucketing_id=None, group_experiments=None, user_profile_session=None):
+    """ Returns the experiment/variation the user is bucketed in for the given feature.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      feature: Feature for which we are determining if it is enabled or not for the given user.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+      bucketing_id: Optional bucketing ID already determined for the user.
+      group_experiments: Optional dict of group IDs to the experiment the user is bucketed into in that group.
+                         Filled in as groups are evaluated, so that it can be shared across features.
+      user_profile_session: Optional UserProfileSession shared with other decisions made for the user.
+
+    Returns:
+      Decision namedtuple consisting of experiment and variation for the user.
+    """
+
+    if bucketing_id is None:
+      bucketing_id = self._get_bucketing_id(user_id, attributes)
 
     # First check if the feature is in a mutex group
     if feature.groupId:
       group = project_config.get_group(feature.groupId)
       if group:
-        experiment = self.get_experiment_in_group(project_config, group, bucketing_id)
+        if group_experiments is None:
+          experiment = self.get_experiment_in_group(project_config, group, bucketing_id)
+        else:
+          if group.id not in group_experiments:
+            group_experiments[group.id] = self.get_experiment_in_group(project_config, group, bucketing_id)
+          experiment = group_experiments[group.id]
         if experiment and experiment.id in feature.experimentIds:
-          variation = self.get_variation(project_config, experiment, user_id, attributes)
+          variation = self.get_variation(project_config, experiment, user_id, attributes,
+                                         user_profile_session=user_profile_session)
 
           if variation:
-            self.logger.debug('User "%s" is in variation %s of experiment %s.' % (
-              user_id,
-              variation.key,
-              experiment.key
-            ))
+            optimizely_logger.log_debug(self.logger, 'User "%s" is in variation %s of experiment %s.',
+                                        user_id, variation.key, experiment.key)
             return Decision(experiment, variation, enums.DecisionSources.FEATURE_TEST)
       else:
         self.logger.error(enums.Errors.INVALID_GROUP_ID.format('_get_variation_for_feature'))
@@ -419,19 +825,17 @@ class DecisionService(object):
       # If an experiment is not in a group, then the feature can only be associated with one experiment
       experiment = project_config.get_experiment_from_id(feature.experimentIds[0])
       if experiment:
-        variation = self.get_variation(project_config, experiment, user_id, attributes)
+        variation = self.get_variation(project_config, experiment, user_id, attributes,
+                                       user_profile_session=user_profile_session)
 
         if variation:
-          self.logger.debug('User "%s" is in variation %s of experiment %s.' % (
-            user_id,
-            variation.key,
-            experiment.key
-          ))
+          optimizely_logger.log_debug(self.logger, 'User "%s" is in variation %s of experiment %s.',
+                                      user_id, variation.key, experiment.key)
           return Decision(experiment, variation, enums.DecisionSources.FEATURE_TEST)
 
     # Next check if user is part of a rollout
     if feature.rolloutId:
       rollout = project_config.get_rollout_from_id(feature.rolloutId)
-      return self.get_variation_for_rollout(project_config, rollout, user_id, attributes)
+      return self.get_variation_for_rollout(project_config, rollout, user_id, attributes, bucketing_id)
     else:
       return Decision(None, None, enums.DecisionSources.ROLLOUT)
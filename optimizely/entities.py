@@ -1,4 +1,4 @@
-# Copyright 2016-2018, Optimizely
+# Copyright 2016-2019, Optimizely
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at
@@ -11,15 +11,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import namedtuple
+
 
 class BaseEntity(object):
+  """ Base class of entities. Entities declare their attributes in __slots__ to keep large datafiles compact. """
+
+  __slots__ = ()
+
+  def _get_attributes(self):
+    """ Get dict of attribute names and values of the entity. """
+    attributes = {}
+    for cls in type(self).__mro__:
+      for name in getattr(cls, '__slots__', ()):
+        if hasattr(self, name):
+          attributes[name] = getattr(self, name)
+    return attributes
 
   def __eq__(self, other):
-    return self.__dict__ == other.__dict__
+    return self._get_attributes() == other._get_attributes()
 
 
 class Attribute(BaseEntity):
 
+  __slots__ = ('id', 'key')
+
   def __init__(self, id, key, **kwargs):
     self.id = id
     self.key = key
@@ -27,6 +43,8 @@ class Attribute(BaseEntity):
 
 class Audience(BaseEntity):
 
+  __slots__ = ('id', 'name', 'conditions', 'conditionStructure', 'conditionList')
+
   def __init__(self, id, name, conditions, conditionStructure=None, conditionList=None, **kwargs):
     self.id = id
     self.name = name
@@ -37,6 +55,8 @@ class Audience(BaseEntity):
 
 class Event(BaseEntity):
 
+  __slots__ = ('id', 'key', 'experimentIds')
+
   def __init__(self, id, key, experimentIds, **kwargs):
     self.id = id
     self.key = key
@@ -45,6 +65,9 @@ class Event(BaseEntity):
 
 class Experiment(BaseEntity):
 
+  __slots__ = ('id', 'key', 'status', 'audienceIds', 'audienceConditions', 'variations', 'forcedVariations',
+               'trafficAllocation', 'layerId', 'groupId', 'groupPolicy')
+
   def __init__(self, id, key, status, audienceIds, variations, forcedVariations,
                trafficAllocation, layerId, audienceConditions=None, groupId=None, groupPolicy=None, **kwargs):
     self.id = id
@@ -66,6 +89,8 @@ class Experiment(BaseEntity):
 
 class FeatureFlag(BaseEntity):
 
+  __slots__ = ('id', 'key', 'experimentIds', 'rolloutId', 'variables', 'groupId')
+
   def __init__(self, id, key, experimentIds, rolloutId, variables, groupId=None, **kwargs):
     self.id = id
     self.key = key
@@ -77,6 +102,8 @@ class FeatureFlag(BaseEntity):
 
 class Group(BaseEntity):
 
+  __slots__ = ('id', 'policy', 'experiments', 'trafficAllocation')
+
   def __init__(self, id, policy, experiments, trafficAllocation, **kwargs):
     self.id = id
     self.policy = policy
@@ -86,6 +113,8 @@ class Group(BaseEntity):
 
 class Layer(BaseEntity):
 
+  __slots__ = ('id', 'experiments')
+
   def __init__(self, id, experiments, **kwargs):
     self.id = id
     self.experiments = experiments
@@ -99,6 +128,8 @@ class Variable(BaseEntity):
     INTEGER = 'integer'
     STRING = 'string'
 
+  __slots__ = ('id', 'key', 'type', 'defaultValue')
+
   def __init__(self, id, key, type, defaultValue, **kwargs):
     self.id = id
     self.key = key
@@ -110,12 +141,26 @@ class Variation(BaseEntity):
 
   class VariableUsage(BaseEntity):
 
+    __slots__ = ('id', 'value')
+
     def __init__(self, id, value, **kwards):
       self.id = id
       self.value = value
 
+  __slots__ = ('id', 'key', 'featureEnabled', 'variables')
+
   def __init__(self, id, key, featureEnabled=False, variables=None, **kwargs):
     self.id = id
     self.key = key
     self.featureEnabled = featureEnabled
     self.variables = variables or []
+
+
+# Python 2 pickles classes by module and name only, so config snapshots need the nested class at module level.
+VariableUsage = Variation.VariableUsage
+
+
+# Lookup table precomputed from a trafficAllocation list for bisecting on bucket values.
+# end_of_ranges is non-decreasing. entity_ids and entities are parallel to it with a trailing
+# None so that a bucket value beyond the last end of range resolves to no entity.
+TrafficAllocationTable = namedtuple('TrafficAllocationTable', 'end_of_ranges entity_ids entities')
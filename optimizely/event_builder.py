@@ -231,6 +231,30 @@ class EventBuilder(object):
                  http_verb=self.HTTP_VERB,
                  headers=self.HTTP_HEADERS)
 
+  def create_combined_impression_event(self, project_config, experiment_variation_ids, user_id, attributes):
+    """ Create a single impression Event recording impressions of several experiments for the user.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiment_variation_ids: List of tuples of experiment for which impression needs to be recorded
+                                and ID of the variation which would be presented to user.
+      user_id: ID for user.
+      attributes: Dict representing user attributes and values which need to be recorded.
+
+    Returns:
+      Event object encapsulating an impression for each of the experiments.
+    """
+
+    params = self._get_common_params(project_config, user_id, attributes)
+    snapshots = params[self.EventParams.USERS][0][self.EventParams.SNAPSHOTS]
+    for experiment, variation_id in experiment_variation_ids:
+      snapshots.append(self._get_required_params_for_impression(experiment, variation_id))
+
+    return Event(self.EVENTS_URL,
+                 params,
+                 http_verb=self.HTTP_VERB,
+                 headers=self.HTTP_HEADERS)
+
   def create_conversion_event(self, project_config, event_key, user_id, attributes, event_tags):
     """ Create conversion Event to be sent to the logging endpoint.
 
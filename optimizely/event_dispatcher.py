@@ -1,4 +1,4 @@
-# Copyright 2016, Optimizely
+# Copyright 2016, 2019, Optimizely
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at
@@ -15,7 +15,9 @@ import json
 import logging
 import requests
 
+from requests import adapters as request_adapters
 from requests import exceptions as request_exception
+from requests.packages.urllib3.util import retry as urllib3_retry
 
 from .helpers import enums
 
@@ -42,3 +44,79 @@ class EventDispatcher(object):
 
     except request_exception.RequestException as error:
       logging.error('Dispatch event failed. Error: %s' % str(error))
+
+
+class PooledEventDispatcher(object):
+  """ Event dispatcher which reuses HTTP connections across events.
+
+  Connections are kept alive in a pool shared by all threads, so events sent to the same host do not pay for a new
+  TCP and TLS handshake each time. All threads send events through one requests.Session mounted with the adapter.
+  """
+
+  def __init__(self,
+               pool_size=None,
+               max_retries=None,
+               backoff_factor=None,
+               timeout=REQUEST_TIMEOUT):
+    """ Initialize pooled event dispatcher.
+
+    Args:
+      pool_size: Optional number of connections kept alive per host.
+      max_retries: Optional number of retries for connection errors and, for GET requests, server error responses.
+      backoff_factor: Optional backoff factor in seconds applied between retries.
+      timeout: Optional time in seconds before which a request for dispatching an event times out.
+    """
+    self.pool_size = pool_size or enums.EventDispatcher.DEFAULT_POOL_SIZE
+    self.max_retries = enums.EventDispatcher.DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+    self.backoff_factor = enums.EventDispatcher.DEFAULT_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+    self.timeout = timeout
+    self.adapter = request_adapters.HTTPAdapter(pool_connections=self.pool_size,
+                                                pool_maxsize=self.pool_size,
+                                                max_retries=self._get_retry_policy())
+    self.session = requests.Session()
+    self.session.mount('http://', self.adapter)
+    self.session.mount('https://', self.adapter)
+
+  def _get_retry_policy(self):
+    """ Helper method to build the retry policy for event requests. POST requests are only retried when the
+    connection could not be established, as a POST whose body reached the server before it responded with an error
+    or timed out may already have been counted.
+
+    Returns:
+      urllib3 Retry object retrying all requests on connection errors and GET requests on server error responses.
+    """
+    retry_options = {
+      'total': self.max_retries,
+      'backoff_factor': self.backoff_factor,
+      'status_forcelist': enums.EventDispatcher.RETRY_STATUS_CODES,
+      'raise_on_status': False,
+    }
+    methods = frozenset([enums.HTTPVerbs.GET])
+    try:
+      return urllib3_retry.Retry(allowed_methods=methods, **retry_options)
+    except TypeError:
+      # urllib3 versions older than 1.26 name the option method_whitelist.
+      return urllib3_retry.Retry(method_whitelist=methods, **retry_options)
+
+  def dispatch_event(self, event):
+    """ Dispatch the event being represented by the Event object.
+
+    Args:
+      event: Object holding information about the request to be dispatched to the Optimizely backend.
+    """
+
+    try:
+      if event.http_verb == enums.HTTPVerbs.GET:
+        self.session.get(event.url, params=event.params, timeout=self.timeout).raise_for_status()
+      elif event.http_verb == enums.HTTPVerbs.POST:
+        self.session.post(
+          event.url, data=json.dumps(event.params), headers=event.headers, timeout=self.timeout
+        ).raise_for_status()
+
+    except request_exception.RequestException as error:
+      logging.error('Dispatch event failed. Error: %s' % str(error))
+
+  def close(self):
+    """ Close all pooled connections. """
+
+    self.session.close()
@@ -0,0 +1,305 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+import atexit
+import numbers
+import threading
+import time
+import weakref
+from six.moves import queue
+
+from . import event_builder
+from . import exceptions as optimizely_exceptions
+from . import logger as optimizely_logger
+from .event_dispatcher import EventDispatcher as default_event_dispatcher
+from .helpers import enums
+from .helpers import validator
+
+ABC = abc.ABCMeta('ABC', (object,), {'__slots__': ()})
+
+EventParams = event_builder.EventBuilder.EventParams
+
+# Params which have to be identical for events to be dispatched together in a single payload.
+BATCH_BOUNDARY_PARAMS = (
+    EventParams.ACCOUNT_ID,
+    EventParams.PROJECT_ID,
+    EventParams.REVISION,
+    EventParams.ANONYMIZE_IP,
+    EventParams.ENRICH_DECISIONS,
+    EventParams.SOURCE_SDK_TYPE,
+    EventParams.SOURCE_SDK_VERSION,
+)
+
+
+class BaseEventProcessor(ABC):
+    """ Base class for Optimizely's event processor. """
+
+    @abc.abstractmethod
+    def process(self, event):
+        """ Handle an event built by event_builder.EventBuilder which is to be sent to Optimizely.
+
+        Args:
+            event: event_builder.Event to be sent.
+        """
+        pass
+
+
+class BatchEventProcessor(BaseEventProcessor):
+    """ Event processor which queues events and dispatches them from a worker thread.
+    Events which belong to the same account, project and revision are merged into a single payload
+    whose visitors are the visitors of all the events. """
+
+    _FLUSH_SIGNAL = object()
+    _SHUTDOWN_SIGNAL = object()
+
+    def __init__(self,
+                 event_dispatcher=None,
+                 logger=None,
+                 batch_size=None,
+                 flush_interval=None,
+                 queue_capacity=None,
+                 start_on_init=True):
+        """ Initialize event processor.
+
+        Args:
+            event_dispatcher: Optional component which provides a dispatch_event method to send events.
+            logger: Optional component which provides a log method to log messages.
+            batch_size: Optional maximum number of events merged into a single payload.
+            flush_interval: Optional time in seconds after which queued events are dispatched
+                            even if there are fewer than batch_size of them.
+            queue_capacity: Optional maximum number of events waiting to be dispatched.
+                            Events processed while the queue is full are dropped.
+            start_on_init: Optional boolean param to start the worker thread on initialization. Defaults to True.
+        """
+        self.event_dispatcher = event_dispatcher or default_event_dispatcher
+        self.logger = optimizely_logger.adapt_logger(logger or optimizely_logger.NoOpLogger())
+        self._validate_instantiation_options()
+
+        self.batch_size = self._get_positive_number(
+            batch_size, 'batch_size', enums.EventProcessor.DEFAULT_BATCH_SIZE, numbers.Integral
+        )
+        self.flush_interval = self._get_positive_number(
+            flush_interval, 'flush_interval', enums.EventProcessor.DEFAULT_FLUSH_INTERVAL, (numbers.Integral, float)
+        )
+        self.event_queue = queue.Queue(self._get_positive_number(
+            queue_capacity, 'queue_capacity', enums.EventProcessor.DEFAULT_QUEUE_CAPACITY, numbers.Integral
+        ))
+        self._current_batch = []
+        self._worker_thread = None
+
+        # Dispatch events still queued when the interpreter exits.
+        atexit.register(_close_at_exit, weakref.ref(self))
+
+        if start_on_init:
+            self.start()
+
+    def _validate_instantiation_options(self):
+        """ Helper method to validate all parameters.
+
+        Raises:
+            Exception if provided options are invalid.
+        """
+        if not validator.is_event_dispatcher_valid(self.event_dispatcher):
+            raise optimizely_exceptions.InvalidInputException(enums.Errors.INVALID_INPUT.format('event_dispatcher'))
+
+        if not validator.is_logger_valid(self.logger):
+            raise optimizely_exceptions.InvalidInputException(enums.Errors.INVALID_INPUT.format('logger'))
+
+    def _get_positive_number(self, value, name, default_value, number_types):
+        """ Helper method to fall back to default value when provided value is not a positive number.
+
+        Args:
+            value: Provided value.
+            name: Name of the option the value is provided for.
+            default_value: Value to use if provided value is not set or invalid.
+            number_types: Type or tuple of types the value has to be an instance of.
+
+        Returns:
+            Provided value if valid. Default value otherwise.
+        """
+        if value is None:
+            return default_value
+
+        if not isinstance(value, number_types) or isinstance(value, bool) or value <= 0:
+            self.logger.debug('{} value {} is invalid. Defaulting to {}.'.format(name, value, default_value))
+            return default_value
+
+        return value
+
+    @property
+    def is_running(self):
+        """ Check if worker thread is alive or not. """
+        return self._worker_thread is not None and self._worker_thread.is_alive()
+
+    def start(self):
+        """ Start the worker thread which dispatches queued events. """
+        if self.is_running:
+            self.logger.warning('Event processor already started.')
+            return
+
+        self._worker_thread = threading.Thread(target=self._run)
+        self._worker_thread.setDaemon(True)
+        self._worker_thread.start()
+
+    def process(self, event):
+        """ Queue event to be dispatched by the worker thread.
+
+        Args:
+            event: event_builder.Event to be sent.
+        """
+        if not self.is_running:
+            self.logger.debug('Event processor is not running. Dispatching event immediately.')
+            self._dispatch([event])
+            return
+
+        try:
+            self.event_queue.put_nowait(event)
+        except queue.Full:
+            self.logger.warning('Event queue is full. Dropping event for URL {}.'.format(event.url))
+
+    def flush(self):
+        """ Request the worker thread to dispatch all events queued so far. """
+        if not self.is_running:
+            return
+
+        self.event_queue.put(self._FLUSH_SIGNAL)
+
+    def close(self, timeout=None):
+        """ Dispatch all queued events and stop the worker thread.
+
+        Args:
+            timeout: Optional time in seconds to wait for queued events to be dispatched.
+        """
+        if not self.is_running:
+            return
+
+        if timeout is None:
+            timeout = enums.EventProcessor.DEFAULT_CLOSE_TIMEOUT
+
+        self.event_queue.put(self._SHUTDOWN_SIGNAL)
+        self._worker_thread.join(timeout)
+
+        if self.is_running:
+            self.logger.error('Timeout exceeded while attempting to close for {} seconds.'.format(timeout))
+
+    def _run(self):
+        """ Triggered as part of the thread which batches queued events and dispatches them. """
+        flush_deadline = time.time() + self.flush_interval
+        while True:
+            try:
+                item = self.event_queue.get(timeout=max(flush_deadline - time.time(), 0))
+            except queue.Empty:
+                item = self._FLUSH_SIGNAL
+
+            if item is self._SHUTDOWN_SIGNAL:
+                self._drain_queue()
+                self._flush_batch()
+                return
+
+            if item is self._FLUSH_SIGNAL:
+                self._flush_batch()
+                flush_deadline = time.time() + self.flush_interval
+                continue
+
+            self._add_to_batch(item)
+            if len(self._current_batch) >= self.batch_size:
+                self._flush_batch()
+                flush_deadline = time.time() + self.flush_interval
+
+    def _drain_queue(self):
+        """ Add events still in the queue to batches without waiting for more. """
+        while True:
+            try:
+                item = self.event_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            if item is not self._FLUSH_SIGNAL and item is not self._SHUTDOWN_SIGNAL:
+                self._add_to_batch(item)
+                if len(self._current_batch) >= self.batch_size:
+                    self._flush_batch()
+
+    def _add_to_batch(self, event):
+        """ Add event to the current batch, dispatching the current batch first if the event can not be merged into it.
+
+        Args:
+            event: event_builder.Event to be sent.
+        """
+        if self._current_batch and not self._can_merge(self._current_batch[0], event):
+            self._flush_batch()
+
+        self._current_batch.append(event)
+
+    @staticmethod
+    def _can_merge(first_event, second_event):
+        """ Determine if two events can be dispatched together in a single payload.
+
+        Args:
+            first_event: event_builder.Event.
+            second_event: event_builder.Event.
+
+        Returns:
+            Boolean representing if visitors of both events can be sent in a single payload.
+        """
+        if first_event.url != second_event.url or first_event.http_verb != second_event.http_verb or \
+           first_event.headers != second_event.headers or first_event.http_verb != enums.HTTPVerbs.POST:
+            return False
+
+        for event in (first_event, second_event):
+            if not isinstance(event.params, dict) or not isinstance(event.params.get(EventParams.USERS), list):
+                return False
+
+        for param in BATCH_BOUNDARY_PARAMS:
+            if first_event.params.get(param) != second_event.params.get(param):
+                return False
+
+        return True
+
+    def _flush_batch(self):
+        """ Dispatch events in the current batch. """
+        batch = self._current_batch
+        self._current_batch = []
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        """ Merge events which can be merged and dispatch the result.
+
+        Args:
+            batch: List of events which can be merged together. Or a list with a single event.
+        """
+        event = batch[0]
+        if len(batch) > 1:
+            params = dict(event.params)
+            params[EventParams.USERS] = [visitor for batched_event in batch
+                                         for visitor in batched_event.params[EventParams.USERS]]
+            event = event_builder.Event(event.url, params, http_verb=event.http_verb, headers=event.headers)
+
+        optimizely_logger.log_debug(self.logger, 'Dispatching %s event(s) to URL %s.', len(batch), event.url)
+
+        try:
+            self.event_dispatcher.dispatch_event(event)
+        except Exception as error:
+            self.logger.error('Error dispatching event: {}'.format(str(error)))
+
+
+def _close_at_exit(event_processor_ref):
+    """ Close the referenced event processor if it still exists.
+
+    Args:
+        event_processor_ref: Weak reference to BatchEventProcessor.
+    """
+    event_processor = event_processor_ref()
+    if event_processor is not None:
+        event_processor.close()
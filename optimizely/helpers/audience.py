@@ -12,7 +12,9 @@
 # limitations under the License.
 
 import json
+import logging
 
+from .. import logger as optimizely_logger
 from . import condition as condition_helper
 from . import condition_tree_evaluator
 from .enums import AudienceEvaluationLogs as audience_logs
@@ -33,59 +35,80 @@ def is_user_in_experiment(config, experiment, attributes, logger):
   """
 
   audience_conditions = experiment.getAudienceConditionsOrIds()
+  compiled_conditions = config.get_compiled_audience_conditions(experiment)
 
-  logger.debug(audience_logs.EVALUATING_AUDIENCES_COMBINED.format(
-    experiment.key,
-    json.dumps(audience_conditions)
-  ))
+  if optimizely_logger.is_enabled_for(logger, logging.DEBUG):
+    logger.debug(audience_logs.EVALUATING_AUDIENCES_COMBINED.format(
+      experiment.key,
+      compiled_conditions.source_json if compiled_conditions else json.dumps(audience_conditions)
+    ))
 
   # Return True in case there are no audiences
   if audience_conditions is None or audience_conditions == []:
-    logger.info(audience_logs.AUDIENCE_EVALUATION_RESULT_COMBINED.format(
-      experiment.key,
-      'TRUE'
-    ))
+    if optimizely_logger.is_enabled_for(logger, logging.INFO):
+      logger.info(audience_logs.AUDIENCE_EVALUATION_RESULT_COMBINED.format(
+        experiment.key,
+        'TRUE'
+      ))
 
     return True
 
   if attributes is None:
     attributes = {}
 
-  def evaluate_custom_attr(audienceId, index):
-    audience = config.get_audience(audienceId)
-    custom_attr_condition_evaluator = condition_helper.CustomAttributeConditionEvaluator(
-      audience.conditionList, attributes, logger)
+  if compiled_conditions:
+    eval_result = compiled_conditions.evaluate(attributes, logger)
+  else:
+    eval_result = condition_tree_evaluator.evaluate(
+      audience_conditions,
+      lambda audienceId: evaluate_audience(config, audienceId, attributes, logger)
+    )
 
-    return custom_attr_condition_evaluator.evaluate(index)
+  eval_result = eval_result or False
 
-  def evaluate_audience(audienceId):
-    audience = config.get_audience(audienceId)
+  if optimizely_logger.is_enabled_for(logger, logging.INFO):
+    logger.info(audience_logs.AUDIENCE_EVALUATION_RESULT_COMBINED.format(
+      experiment.key,
+      str(eval_result).upper()
+    ))
 
-    if audience is None:
-      return None
+  return eval_result
 
-    logger.debug(audience_logs.EVALUATING_AUDIENCE.format(audienceId, audience.conditions))
 
-    result = condition_tree_evaluator.evaluate(
-      audience.conditionStructure,
-      lambda index: evaluate_custom_attr(audienceId, index)
-    )
+def evaluate_audience(config, audienceId, attributes, logger):
+  """ Evaluate conditions of a single audience by interpreting its condition structure.
 
-    result_str = str(result).upper() if result is not None else 'UNKNOWN'
-    logger.info(audience_logs.AUDIENCE_EVALUATION_RESULT.format(audienceId, result_str))
+  Args:
+    config: project_config.ProjectConfig object representing the project.
+    audienceId: ID of the audience to evaluate.
+    attributes: Dict representing user attributes.
+    logger: Provides a logger to send log messages to.
 
-    return result
+  Returns:
+    Boolean representing if user satisfies the audience conditions or None if they couldn't be evaluated.
+  """
 
-  eval_result = condition_tree_evaluator.evaluate(
-    audience_conditions,
-    evaluate_audience
-  )
+  audience = config.get_audience(audienceId)
 
-  eval_result = eval_result or False
+  if audience is None:
+    return None
 
-  logger.info(audience_logs.AUDIENCE_EVALUATION_RESULT_COMBINED.format(
-      experiment.key,
-      str(eval_result).upper()
-    ))
+  if optimizely_logger.is_enabled_for(logger, logging.DEBUG):
+    logger.debug(audience_logs.EVALUATING_AUDIENCE.format(audienceId, audience.conditions))
 
-  return eval_result
+  def evaluate_custom_attr(index):
+    custom_attr_condition_evaluator = condition_helper.CustomAttributeConditionEvaluator(
+      audience.conditionList, attributes, logger)
+
+    return custom_attr_condition_evaluator.evaluate(index)
+
+  result = condition_tree_evaluator.evaluate(
+    audience.conditionStructure,
+    evaluate_custom_attr
+  )
+
+  if optimizely_logger.is_enabled_for(logger, logging.INFO):
+    result_str = str(result).upper() if result is not None else 'UNKNOWN'
+    logger.info(audience_logs.AUDIENCE_EVALUATION_RESULT.format(audienceId, result_str))
+
+  return result
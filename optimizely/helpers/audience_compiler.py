@@ -0,0 +1,352 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Compiles audience conditions into callables evaluated without re-interpreting the condition tree.
+
+Every compiled callable has the signature f(attributes, logger) and returns True, False or None exactly like
+the interpreted evaluation in audience.is_user_in_experiment, emitting the same log messages in the same order.
+Validation of condition values, match type lookup and JSON encoding of conditions for log messages happen once
+at compile time. Malformed conditions raise at compile time so that callers can fall back to interpretation.
+"""
+
+import json
+import numbers
+from collections import namedtuple
+
+from six import string_types
+
+from . import audience as audience_helper
+from . import validator
+from .condition import ConditionMatchTypes
+from .condition import ConditionOperatorTypes
+from .condition import CustomAttributeConditionEvaluator
+from .enums import AudienceEvaluationLogs as audience_logs
+
+
+CompiledAudienceConditions = namedtuple('CompiledAudienceConditions', 'source source_json evaluate')
+
+
+def _is_number(value):
+  return isinstance(value, (numbers.Integral, float)) and not isinstance(value, bool)
+
+
+def _get_condition_json(condition):
+  return json.dumps({
+    'name': condition[0],
+    'value': condition[1],
+    'type': condition[2],
+    'match': condition[3]
+  })
+
+
+def _compile_warning(message):
+  def evaluate(attributes, logger):
+    logger.warning(message)
+    return None
+
+  return evaluate
+
+
+def _compile_comparison(condition_name, condition_json, compare):
+  """ Wrap a comparison of a non-null user attribute value with checks for missing and null values.
+
+  Args:
+    condition_name: Name of the user attribute the condition applies to.
+    condition_json: JSON string representing the condition for logging.
+    compare: Function taking user value and logger to be evaluated once the user value is known.
+
+  Returns:
+    Function evaluating the condition for the given attributes and logger.
+  """
+
+  missing_message = audience_logs.MISSING_ATTRIBUTE_VALUE.format(condition_json, condition_name)
+  null_message = audience_logs.NULL_ATTRIBUTE_VALUE.format(condition_json, condition_name)
+
+  def evaluate(attributes, logger):
+    if condition_name not in attributes:
+      logger.debug(missing_message)
+      return None
+
+    user_value = attributes[condition_name]
+    if user_value is None:
+      logger.debug(null_message)
+      return None
+
+    return compare(user_value, logger)
+
+  return evaluate
+
+
+def _compile_exact(condition_name, condition_value, condition_json):
+  infinite_message = audience_logs.INFINITE_ATTRIBUTE_VALUE.format(condition_json, condition_name)
+
+  if isinstance(condition_value, string_types):
+    def compare(user_value, logger):
+      if not isinstance(user_value, string_types):
+        logger.warning(audience_logs.UNEXPECTED_TYPE.format(condition_json, type(user_value), condition_name))
+        return None
+      return condition_value == user_value
+
+  elif isinstance(condition_value, bool):
+    def compare(user_value, logger):
+      if type(user_value) is not bool:
+        logger.warning(audience_logs.UNEXPECTED_TYPE.format(condition_json, type(user_value), condition_name))
+        return None
+      return condition_value == user_value
+
+  elif _is_number(condition_value) and validator.is_finite_number(condition_value):
+    def compare(user_value, logger):
+      if not _is_number(user_value):
+        logger.warning(audience_logs.UNEXPECTED_TYPE.format(condition_json, type(user_value), condition_name))
+        return None
+      if not validator.is_finite_number(user_value):
+        logger.warning(infinite_message)
+        return None
+      return condition_value == user_value
+
+  else:
+    compare = _compile_warning(audience_logs.UNKNOWN_CONDITION_VALUE.format(condition_json))
+
+  return _compile_comparison(condition_name, condition_json, compare)
+
+
+def _compile_greater_or_less_than(condition_name, condition_value, condition_json, is_greater_than):
+  if not validator.is_finite_number(condition_value):
+    return _compile_comparison(condition_name, condition_json,
+                               _compile_warning(audience_logs.UNKNOWN_CONDITION_VALUE.format(condition_json)))
+
+  infinite_message = audience_logs.INFINITE_ATTRIBUTE_VALUE.format(condition_json, condition_name)
+
+  def compare(user_value, logger):
+    if not _is_number(user_value):
+      logger.warning(audience_logs.UNEXPECTED_TYPE.format(condition_json, type(user_value), condition_name))
+      return None
+    if not validator.is_finite_number(user_value):
+      logger.warning(infinite_message)
+      return None
+    if is_greater_than:
+      return user_value > condition_value
+    return user_value < condition_value
+
+  return _compile_comparison(condition_name, condition_json, compare)
+
+
+def _compile_substring(condition_name, condition_value, condition_json):
+  if not isinstance(condition_value, string_types):
+    return _compile_comparison(condition_name, condition_json,
+                               _compile_warning(audience_logs.UNKNOWN_CONDITION_VALUE.format(condition_json)))
+
+  def compare(user_value, logger):
+    if not isinstance(user_value, string_types):
+      logger.warning(audience_logs.UNEXPECTED_TYPE.format(condition_json, type(user_value), condition_name))
+      return None
+    return condition_value in user_value
+
+  return _compile_comparison(condition_name, condition_json, compare)
+
+
+def compile_leaf_condition(condition):
+  """ Compile a single audience leaf condition.
+
+  Args:
+    condition: List consisting of condition name, value, type and match as produced by condition.loads.
+
+  Returns:
+    Function evaluating the condition for the given attributes and logger.
+  """
+
+  condition_name, condition_value, condition_type, condition_match = condition
+  condition_json = _get_condition_json(condition)
+
+  if condition_type != CustomAttributeConditionEvaluator.CUSTOM_ATTRIBUTE_CONDITION_TYPE:
+    return _compile_warning(audience_logs.UNKNOWN_CONDITION_TYPE.format(condition_json))
+
+  if condition_match is None:
+    condition_match = ConditionMatchTypes.EXACT
+
+  if condition_match == ConditionMatchTypes.EXACT:
+    return _compile_exact(condition_name, condition_value, condition_json)
+
+  if condition_match == ConditionMatchTypes.EXISTS:
+    return lambda attributes, logger: attributes.get(condition_name) is not None
+
+  if condition_match == ConditionMatchTypes.GREATER_THAN:
+    return _compile_greater_or_less_than(condition_name, condition_value, condition_json, True)
+
+  if condition_match == ConditionMatchTypes.LESS_THAN:
+    return _compile_greater_or_less_than(condition_name, condition_value, condition_json, False)
+
+  if condition_match == ConditionMatchTypes.SUBSTRING:
+    return _compile_substring(condition_name, condition_value, condition_json)
+
+  return _compile_warning(audience_logs.UNKNOWN_MATCH_TYPE.format(condition_json))
+
+
+def _compile_and(operands):
+  if len(operands) == 1:
+    return operands[0]
+
+  def evaluate(attributes, logger):
+    saw_null_result = False
+    for operand in operands:
+      result = operand(attributes, logger)
+      if result is False:
+        return False
+      if result is None:
+        saw_null_result = True
+
+    return None if saw_null_result else True
+
+  return evaluate
+
+
+def _compile_or(operands):
+  if len(operands) == 1:
+    return operands[0]
+
+  def evaluate(attributes, logger):
+    saw_null_result = False
+    for operand in operands:
+      result = operand(attributes, logger)
+      if result is True:
+        return True
+      if result is None:
+        saw_null_result = True
+
+    return None if saw_null_result else False
+
+  return evaluate
+
+
+def _compile_not(operands):
+  if not operands:
+    return lambda attributes, logger: None
+
+  operand = operands[0]
+
+  def evaluate(attributes, logger):
+    result = operand(attributes, logger)
+    return None if result is None else not result
+
+  return evaluate
+
+
+def compile_condition_tree(conditions, compile_leaf):
+  """ Compile nested and/or/not conditions following the rules of condition_tree_evaluator.evaluate.
+
+  Args:
+    conditions: Nested array of and/or conditions, or a single leaf condition value of any type.
+    compile_leaf: Function which will be called to compile leaf condition values.
+
+  Returns:
+    Function evaluating the conditions for the given attributes and logger.
+  """
+
+  if not isinstance(conditions, list):
+    return compile_leaf(conditions)
+
+  operator = conditions[0]
+  if operator == ConditionOperatorTypes.AND:
+    return _compile_and([compile_condition_tree(condition, compile_leaf) for condition in conditions[1:]])
+
+  if operator == ConditionOperatorTypes.NOT:
+    return _compile_not([compile_condition_tree(condition, compile_leaf) for condition in conditions[1:]])
+
+  if operator != ConditionOperatorTypes.OR:
+    # assume OR when operator is not explicit.
+    return _compile_or([compile_condition_tree(condition, compile_leaf) for condition in conditions])
+
+  return _compile_or([compile_condition_tree(condition, compile_leaf) for condition in conditions[1:]])
+
+
+def compile_audience(audience):
+  """ Compile conditions of a deserialized audience including audience level logging.
+
+  Args:
+    audience: entities.Audience with conditionStructure and conditionList populated.
+
+  Returns:
+    Function evaluating the audience for the given attributes and logger.
+  """
+
+  condition_list = audience.conditionList
+  tree = compile_condition_tree(audience.conditionStructure,
+                                lambda index: compile_leaf_condition(condition_list[index]))
+
+  evaluating_message = audience_logs.EVALUATING_AUDIENCE.format(audience.id, audience.conditions)
+  result_messages = {
+    True: audience_logs.AUDIENCE_EVALUATION_RESULT.format(audience.id, 'TRUE'),
+    False: audience_logs.AUDIENCE_EVALUATION_RESULT.format(audience.id, 'FALSE'),
+    None: audience_logs.AUDIENCE_EVALUATION_RESULT.format(audience.id, 'UNKNOWN'),
+  }
+
+  def evaluate(attributes, logger):
+    logger.debug(evaluating_message)
+    result = tree(attributes, logger)
+    logger.info(result_messages[result])
+    return result
+
+  return evaluate
+
+
+def compile_audiences(audience_map):
+  """ Compile all audiences which can be compiled.
+
+  Args:
+    audience_map: Dict mapping audience ID to deserialized audience object.
+
+  Returns:
+    Dict mapping audience ID to compiled function. Audiences with malformed conditions are left out.
+  """
+
+  compiled_audience_map = {}
+  for audience_id, audience in audience_map.items():
+    try:
+      compiled_audience_map[audience_id] = compile_audience(audience)
+    except Exception:
+      continue
+
+  return compiled_audience_map
+
+
+def compile_audience_conditions(config, audience_conditions, compiled_audience_map):
+  """ Compile audience conditions or audience IDs of an experiment.
+
+  Audiences which are not compiled are evaluated by the interpreter at call time so that missing
+  audiences are still reported by the config.
+
+  Args:
+    config: project_config.ProjectConfig object representing the project.
+    audience_conditions: Audience conditions or IDs of the experiment.
+    compiled_audience_map: Dict mapping audience ID to compiled function.
+
+  Returns:
+    CompiledAudienceConditions or None if there are no audience conditions or they are malformed.
+  """
+
+  if audience_conditions is None or audience_conditions == []:
+    return None
+
+  def compile_audience_leaf(audience_id):
+    compiled_audience = compiled_audience_map.get(audience_id)
+    if compiled_audience:
+      return compiled_audience
+
+    return lambda attributes, logger: audience_helper.evaluate_audience(config, audience_id, attributes, logger)
+
+  try:
+    evaluate = compile_condition_tree(audience_conditions, compile_audience_leaf)
+  except Exception:
+    return None
+
+  return CompiledAudienceConditions(audience_conditions, json.dumps(audience_conditions), evaluate)
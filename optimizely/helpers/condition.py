@@ -12,10 +12,12 @@
 # limitations under the License.
 
 import json
+import logging
 import numbers
 
 from six import string_types
 
+from .. import logger as optimizely_logger
 from . import validator
 from .enums import AudienceEvaluationLogs as audience_logs
 
@@ -288,11 +290,15 @@ class CustomAttributeConditionEvaluator(object):
     if condition_match != ConditionMatchTypes.EXISTS:
       attribute_key = self.condition_data[index][0]
       if attribute_key not in self.attributes:
-        self.logger.debug(audience_logs.MISSING_ATTRIBUTE_VALUE.format(self._get_condition_json(index), attribute_key))
+        if optimizely_logger.is_enabled_for(self.logger, logging.DEBUG):
+          self.logger.debug(audience_logs.MISSING_ATTRIBUTE_VALUE.format(self._get_condition_json(index),
+                                                                         attribute_key))
         return None
 
       if self.attributes.get(attribute_key) is None:
-        self.logger.debug(audience_logs.NULL_ATTRIBUTE_VALUE.format(self._get_condition_json(index), attribute_key))
+        if optimizely_logger.is_enabled_for(self.logger, logging.DEBUG):
+          self.logger.debug(audience_logs.NULL_ATTRIBUTE_VALUE.format(self._get_condition_json(index),
+                                                                      attribute_key))
         return None
 
     return self.EVALUATORS_BY_MATCH_TYPE[condition_match](self, index)
@@ -342,6 +348,41 @@ def _audience_condition_deserializer(obj_dict):
   ]
 
 
+def deserialize(conditions):
+  """ Deserializes already parsed conditions into their corresponding components
+  without encoding them to and decoding them from JSON.
+  Produces the same result as loads does for the JSON encoding of the conditions.
+
+  Args:
+    conditions: Nested lists and dicts defining valid and/or conditions, as parsed from the datafile.
+
+  Returns:
+    A tuple of (condition_structure, condition_list).
+    condition_structure: nested list of operators and placeholders for operands.
+    condition_list: list of conditions whose index correspond to the values of the placeholders.
+  """
+  condition_list = []
+
+  def replace_conditions(value):
+    if isinstance(value, list):
+      return [replace_conditions(item) for item in value]
+
+    if isinstance(value, dict):
+      # Like the object_hook of the JSON decoder, nested dicts are replaced before the dict containing them.
+      for item in value.values():
+        if isinstance(item, (list, dict)):
+          value = dict((key, replace_conditions(item)) for key, item in value.items())
+          break
+      condition_list.append(_audience_condition_deserializer(value))
+      return len(condition_list) - 1
+
+    return value
+
+  condition_structure = replace_conditions(conditions)
+
+  return (condition_structure, condition_list)
+
+
 def loads(conditions_string):
   """ Deserializes the conditions property into its corresponding
   components: the condition_structure and the condition_list.
@@ -38,8 +38,14 @@ class AudienceEvaluationLogs(object):
 
 class ConfigManager(object):
   DATAFILE_URL_TEMPLATE = 'https://cdn.optimizely.com/datafiles/{sdk_key}.json'
+  # Content encodings accepted for the datafile
+  DATAFILE_ACCEPT_ENCODING = 'gzip, deflate'
+  # Number of datafile digests for which the result of schema validation is cached
+  DATAFILE_VALIDATION_CACHE_SIZE = 16
   # Default config update interval of 5 minutes
   DEFAULT_UPDATE_INTERVAL = 5 * 60
+  # Default interval in seconds at which to check datafile and config snapshot files for changes
+  DEFAULT_FILE_CHECK_INTERVAL = 1
   # Minimum config update interval of 1 second
   MIN_UPDATE_INTERVAL = 1
   # Time in seconds before which request for datafile times out
@@ -90,8 +96,33 @@ class Errors(object):
   UNSUPPORTED_DATAFILE_VERSION = 'This version of the Python SDK does not support the given datafile version: "{}".'
 
 
+class EventDispatcher(object):
+  # Default number of connections kept alive per host by the pooled event dispatcher
+  DEFAULT_POOL_SIZE = 10
+  # Default number of retries for failed event requests
+  DEFAULT_MAX_RETRIES = 3
+  # Default backoff factor in seconds between retries
+  DEFAULT_BACKOFF_FACTOR = 0.5
+  # Response status codes for which GET event requests are retried
+  RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+
+class EventProcessor(object):
+  # Default number of events merged into a single dispatched payload
+  DEFAULT_BATCH_SIZE = 10
+  # Default time in seconds after which queued events are dispatched even if the batch is not full
+  DEFAULT_FLUSH_INTERVAL = 30
+  # Default maximum number of events waiting to be dispatched
+  DEFAULT_QUEUE_CAPACITY = 1000
+  # Time in seconds to wait for queued events to be dispatched on close
+  DEFAULT_CLOSE_TIMEOUT = 5
+
+
 class HTTPHeaders(object):
+  ACCEPT_ENCODING = 'Accept-Encoding'
+  ETAG = 'ETag'
   IF_MODIFIED_SINCE = 'If-Modified-Since'
+  IF_NONE_MATCH = 'If-None-Match'
   LAST_MODIFIED = 'Last-Modified'
 
 
@@ -109,6 +140,20 @@ class LogLevels(object):
   CRITICAL = logging.CRITICAL
 
 
+class NotificationCenter(object):
+  # Default number of worker threads calling listeners in async mode
+  DEFAULT_WORKER_COUNT = 1
+  # Default maximum number of notifications waiting to be sent in async mode
+  DEFAULT_QUEUE_CAPACITY = 1000
+  # Time in seconds to wait for queued notifications to be sent on close
+  DEFAULT_CLOSE_TIMEOUT = 5
+  # Time in seconds to wait for queued notifications to be sent on flush
+  DEFAULT_FLUSH_TIMEOUT = 5
+  # Policies applied to notifications sent while the queue is full
+  OVERFLOW_POLICY_BLOCK = 'block'
+  OVERFLOW_POLICY_DROP = 'drop'
+
+
 class NotificationTypes(object):
   """ NotificationTypes for the notification_center.NotificationCenter
       format is NOTIFICATION TYPE: list of parameters to callback.
@@ -119,6 +164,11 @@ class NotificationTypes(object):
       DECISION notification listener has the following parameters:
       DecisionNotificationTypes type, str user_id, dict attributes, dict decision_info
 
+      OPTIMIZELY_CONFIG_BUILD notification listener has the following parameters:
+      str revision, float parse_time, float warm_time
+      where parse_time is the time in seconds taken to validate and parse the datafile and warm_time
+      the time in seconds taken to warm the config before it replaces the current one.
+
       OPTIMIZELY_CONFIG_UPDATE notification listener has no associated parameters.
 
       TRACK notification listener has the following parameters:
@@ -126,5 +176,6 @@ class NotificationTypes(object):
   """
   ACTIVATE = 'ACTIVATE:experiment, user_id, attributes, variation, event'
   DECISION = 'DECISION:type, user_id, attributes, decision_info'
+  OPTIMIZELY_CONFIG_BUILD = 'OPTIMIZELY_CONFIG_BUILD:revision, parse_time, warm_time'
   OPTIMIZELY_CONFIG_UPDATE = 'OPTIMIZELY_CONFIG_UPDATE'
   TRACK = 'TRACK:event_key, user_id, attributes, event_tags, event'
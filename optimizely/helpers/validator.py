@@ -1,4 +1,4 @@
-# Copyright 2016-2018, Optimizely
+# Copyright 2016-2019, Optimizely
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at
@@ -17,13 +17,46 @@ import math
 import numbers
 from six import string_types
 
+from optimizely import config_snapshot
+from optimizely.lru_cache import LRUCache
 from optimizely.notification_center import NotificationCenter
 from optimizely.user_profile import UserProfile
 from . import constants
+from . import enums
+
+# Schema validator is built once since building it is as expensive as validating a small datafile.
+DATAFILE_SCHEMA_VALIDATOR = jsonschema.Draft4Validator(constants.JSON_SCHEMA)
+
+# Process wide cache of datafile digests to the result of validating the datafile.
+datafile_validation_cache = LRUCache(enums.ConfigManager.DATAFILE_VALIDATION_CACHE_SIZE)
 
 
 def is_datafile_valid(datafile):
   """ Given a datafile determine if it is valid or not.
+  Result is cached by digest of the datafile so that identical datafiles are validated once.
+
+  Args:
+    datafile: JSON string representing the project.
+
+  Returns:
+    Boolean depending upon whether datafile is valid or not.
+  """
+
+  try:
+    datafile_digest = config_snapshot.get_datafile_digest(datafile)
+  except:
+    return False
+
+  is_valid = datafile_validation_cache.lookup(datafile_digest)
+  if is_valid is None:
+    is_valid = _validate_datafile(datafile)
+    datafile_validation_cache.save(datafile_digest, is_valid)
+
+  return is_valid
+
+
+def _validate_datafile(datafile):
+  """ Helper method to parse the datafile and validate it against the datafile schema.
 
   Args:
     datafile: JSON string representing the project.
@@ -38,7 +71,7 @@ def is_datafile_valid(datafile):
     return False
 
   try:
-    jsonschema.Draft4Validator(constants.JSON_SCHEMA).validate(datafile_json)
+    DATAFILE_SCHEMA_VALIDATOR.validate(datafile_json)
   except:
     return False
 
@@ -72,6 +105,34 @@ def is_config_manager_valid(config_manager):
   return _has_method(config_manager, 'get_config')
 
 
+def is_cache_valid(cache):
+  """ Given a cache determine if it is valid or not i.e. provides lookup, save and reset methods.
+
+  Args:
+    cache: Provides lookup, save and reset methods such as lru_cache.LRUCache.
+
+  Returns:
+    Boolean depending upon whether cache is valid or not.
+  """
+
+  return _has_method(cache, 'lookup') and _has_method(cache, 'save') and _has_method(cache, 'reset')
+
+
+def is_bulk_user_profile_service(user_profile_service):
+  """ Given a user_profile_service determine if it supports bulk operations
+  i.e. provides lookup_many and save_many methods.
+
+  Args:
+    user_profile_service: Provides lookup and save methods and optionally lookup_many and save_many methods
+                          such as user_profile.BulkUserProfileService.
+
+  Returns:
+    Boolean depending upon whether user_profile_service supports bulk operations or not.
+  """
+
+  return _has_method(user_profile_service, 'lookup_many') and _has_method(user_profile_service, 'save_many')
+
+
 def is_error_handler_valid(error_handler):
   """ Given a error_handler determine if it is valid or not i.e. provides a handle_error method.
 
@@ -98,6 +159,19 @@ def is_event_dispatcher_valid(event_dispatcher):
   return _has_method(event_dispatcher, 'dispatch_event')
 
 
+def is_event_processor_valid(event_processor):
+  """ Given an event_processor determine if it is valid or not i.e. provides a process method.
+
+  Args:
+    event_processor: Provides a process method to handle built events.
+
+  Returns:
+    Boolean depending upon whether event_processor is valid or not.
+  """
+
+  return _has_method(event_processor, 'process')
+
+
 def is_logger_valid(logger):
   """ Given a logger determine if it is valid or not i.e. provides a log method.
 
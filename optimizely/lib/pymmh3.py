@@ -17,6 +17,7 @@ This module is written to have the same format as mmh3 python package found here
 https://pypi.python.org/pypi/mmh3/2.3.1
 '''
 
+import struct as _struct
 import sys as _sys
 if (_sys.version_info > (3, 0)):
     def xrange( a, b, c ):
@@ -31,67 +32,61 @@ else:
         return x
 del _sys
 
+_TAIL_PADDING = ( b'', b'\x00\x00\x00', b'\x00\x00', b'\x00' )
+_TAIL_STRUCT = _struct.Struct( '<I' )
+_BLOCK_STRUCTS = {}
+
 def hash( key, seed = 0x0 ):
-    ''' Implements 32bit murmur3 hash. '''
+    ''' Implements 32bit murmur3 hash (x86 variant).
 
-    key = bytearray( xencode(key) )
+    Blocks are unpacked as little endian unsigned 32 bit integers in a single struct call
+    instead of being assembled byte by byte. '''
 
-    def fmix( h ):
-        h ^= h >> 16
-        h  = ( h * 0x85ebca6b ) & 0xFFFFFFFF
-        h ^= h >> 13
-        h  = ( h * 0xc2b2ae35 ) & 0xFFFFFFFF
-        h ^= h >> 16
-        return h
+    if not isinstance( key, ( bytes, bytearray ) ):
+        key = key.encode( 'utf-8' )
 
     length = len( key )
-    nblocks = int( length / 4 )
+    nblocks = length >> 2
 
     h1 = seed
 
-    c1 = 0xcc9e2d51
-    c2 = 0x1b873593
-
     # body
-    for block_start in xrange( 0, nblocks * 4, 4 ):
-        # ??? big endian?
-        k1 = key[ block_start + 3 ] << 24 | \
-             key[ block_start + 2 ] << 16 | \
-             key[ block_start + 1 ] <<  8 | \
-             key[ block_start + 0 ]
-             
-        k1 = ( c1 * k1 ) & 0xFFFFFFFF
-        k1 = ( k1 << 15 | k1 >> 17 ) & 0xFFFFFFFF # inlined ROTL32
-        k1 = ( c2 * k1 ) & 0xFFFFFFFF
-        
-        h1 ^= k1
-        h1  = ( h1 << 13 | h1 >> 19 ) & 0xFFFFFFFF # inlined ROTL32
-        h1  = ( h1 * 5 + 0xe6546b64 ) & 0xFFFFFFFF
+    if nblocks:
+        block_struct = _BLOCK_STRUCTS.get( nblocks )
+        if block_struct is None:
+            block_struct = _BLOCK_STRUCTS[ nblocks ] = _struct.Struct( '<%dI' % nblocks )
+
+        for k1 in block_struct.unpack_from( key ):
+            k1 = ( k1 * 0xcc9e2d51 ) & 0xFFFFFFFF
+            k1 = ( k1 << 15 | k1 >> 17 ) & 0xFFFFFFFF # inlined ROTL32
+            k1 = ( k1 * 0x1b873593 ) & 0xFFFFFFFF
+
+            h1 ^= k1
+            h1  = ( h1 << 13 | h1 >> 19 ) & 0xFFFFFFFF # inlined ROTL32
+            h1  = ( h1 * 5 + 0xe6546b64 ) & 0xFFFFFFFF
 
     # tail
-    tail_index = nblocks * 4
-    k1 = 0
     tail_size = length & 3
-
-    if tail_size >= 3:
-        k1 ^= key[ tail_index + 2 ] << 16
-    if tail_size >= 2:
-        k1 ^= key[ tail_index + 1 ] << 8
-    if tail_size >= 1:
-        k1 ^= key[ tail_index + 0 ]
-    
-    if tail_size > 0:
-        k1  = ( k1 * c1 ) & 0xFFFFFFFF
+    if tail_size:
+        # Zero padding the tail to a full block is equivalent to xor-ing in the remaining bytes.
+        k1 = _TAIL_STRUCT.unpack( bytes( key[ length - tail_size: ] ) + _TAIL_PADDING[ tail_size ] )[ 0 ]
+        k1  = ( k1 * 0xcc9e2d51 ) & 0xFFFFFFFF
         k1  = ( k1 << 15 | k1 >> 17 ) & 0xFFFFFFFF # inlined ROTL32
-        k1  = ( k1 * c2 ) & 0xFFFFFFFF
+        k1  = ( k1 * 0x1b873593 ) & 0xFFFFFFFF
         h1 ^= k1
 
     #finalization
-    unsigned_val = fmix( h1 ^ length )
-    if unsigned_val & 0x80000000 == 0:
-        return unsigned_val
+    h1 ^= length
+    h1 ^= h1 >> 16
+    h1  = ( h1 * 0x85ebca6b ) & 0xFFFFFFFF
+    h1 ^= h1 >> 13
+    h1  = ( h1 * 0xc2b2ae35 ) & 0xFFFFFFFF
+    h1 ^= h1 >> 16
+
+    if h1 & 0x80000000 == 0:
+        return h1
     else:
-        return -( (unsigned_val ^ 0xFFFFFFFF) + 1 )
+        return -( (h1 ^ 0xFFFFFFFF) + 1 )
 
 
 def hash128( key, seed = 0x0, x64arch = True ):
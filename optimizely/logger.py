@@ -115,3 +115,48 @@ def adapt_logger(logger):
 
   # Otherwise, return whatever we were given because we can't adapt.
   return logger
+
+
+def is_enabled_for(logger, level):
+  """ Determine if messages of the given level would be handled by the logger.
+
+  Loggers which are not standard python loggers are assumed to want every message.
+
+  Args:
+    logger: Logger as returned by adapt_logger.
+    level: Log level of the message, e.g. logging.DEBUG.
+
+  Returns:
+    Boolean representing if messages of the given level are enabled for the logger.
+  """
+
+  if not isinstance(logger, logging.Logger):
+    return True
+
+  return logger.isEnabledFor(level)
+
+
+def log_debug(logger, message, *args):
+  """ Log a debug message formatting it with args only if debug messages are enabled for the logger.
+
+  Args:
+    logger: Logger as returned by adapt_logger.
+    message: Message optionally containing %-style placeholders.
+    args: Values for the placeholders in message.
+  """
+
+  if is_enabled_for(logger, logging.DEBUG):
+    logger.debug(message % args if args else message)
+
+
+def log_info(logger, message, *args):
+  """ Log an info message formatting it with args only if info messages are enabled for the logger.
+
+  Args:
+    logger: Logger as returned by adapt_logger.
+    message: Message optionally containing %-style placeholders.
+    args: Values for the placeholders in message.
+  """
+
+  if is_enabled_for(logger, logging.INFO):
+    logger.info(message % args if args else message)
@@ -0,0 +1,89 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+  """ Thread safe cache bounded in size which evicts the least recently used entries.
+  Entries optionally expire after a timeout. """
+
+  def __init__(self, capacity, timeout=None):
+    """ LRUCache init method.
+
+    Args:
+      capacity: Maximum number of entries to hold. Caching is disabled if not positive.
+      timeout: Optional number of seconds after which an entry expires. Entries never expire if None.
+    """
+
+    self.capacity = capacity
+    self.timeout = timeout
+    self.hits = 0
+    self.misses = 0
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+
+  def lookup(self, key, default=None):
+    """ Get value stored for the given key and mark it as most recently used.
+
+    Args:
+      key: Hashable key to look up.
+      default: Value to return if key is not cached or has expired.
+
+    Returns:
+      Cached value or default.
+    """
+
+    with self._lock:
+      entry = self._entries.pop(key, None)
+      if entry is None:
+        self.misses += 1
+        return default
+
+      value, saved_at = entry
+      if self.timeout is not None and time.time() - saved_at >= self.timeout:
+        self.misses += 1
+        return default
+
+      # Reinsert to move entry to the most recently used end.
+      self._entries[key] = entry
+      self.hits += 1
+      return value
+
+  def save(self, key, value):
+    """ Store value for the given key evicting the least recently used entry if the cache is full.
+
+    Args:
+      key: Hashable key to store value for.
+      value: Value to store.
+    """
+
+    if self.capacity <= 0:
+      return
+
+    with self._lock:
+      self._entries.pop(key, None)
+      if len(self._entries) >= self.capacity:
+        self._entries.popitem(last=False)
+      self._entries[key] = (value, time.time())
+
+  def reset(self):
+    """ Remove all entries from the cache. Hit and miss counters are preserved. """
+
+    with self._lock:
+      self._entries.clear()
+
+  def __len__(self):
+    return len(self._entries)
@@ -11,6 +11,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
+import numbers
+import threading
+import time
+import weakref
+from six.moves import queue
+
 from .helpers import enums
 from . import logger as optimizely_logger
 
@@ -20,17 +27,109 @@ NOTIFICATION_TYPES = tuple(getattr(enums.NotificationTypes, attr)
                            if not attr.startswith('__'))
 
 
+OVERFLOW_POLICIES = (enums.NotificationCenter.OVERFLOW_POLICY_BLOCK, enums.NotificationCenter.OVERFLOW_POLICY_DROP)
+
+
 class NotificationCenter(object):
   """ Class encapsulating methods to manage notifications and their listeners.
-  The enums.NotificationTypes includes predefined notifications."""
+  The enums.NotificationTypes includes predefined notifications.
+
+  By default listeners are called on the thread sending the notification. In async mode notifications are queued
+  and listeners are called from worker threads instead, so that slow listeners do not delay the caller."""
+
+  _SHUTDOWN_SIGNAL = object()
+
+  def __init__(self, logger=None, async_mode=False, worker_count=None, queue_capacity=None, overflow_policy=None):
+    """ Initialize notification center.
 
-  def __init__(self, logger=None):
+    Args:
+      logger: Optional component which provides a log method to log messages.
+      async_mode: Optional boolean param to call listeners from worker threads. Defaults to False.
+      worker_count: Optional number of worker threads calling listeners in async mode.
+                    Notifications are only guaranteed to reach listeners in the order sent with a single worker.
+      queue_capacity: Optional maximum number of notifications waiting to be sent in async mode.
+      overflow_policy: Optional policy for notifications sent while the queue is full. One of
+                       enums.NotificationCenter.OVERFLOW_POLICY_DROP (default) to drop the notification or
+                       enums.NotificationCenter.OVERFLOW_POLICY_BLOCK to wait for room in the queue.
+    """
     self.listener_id = 1
     self.notification_listeners = {}
     for notification_type in NOTIFICATION_TYPES:
       self.notification_listeners[notification_type] = []
     self.logger = optimizely_logger.adapt_logger(logger or optimizely_logger.NoOpLogger())
 
+    self._listener_stats = {}
+    self._listener_stats_lock = threading.Lock()
+
+    self.async_mode = async_mode
+    self._worker_threads = []
+    if not async_mode:
+      return
+
+    self.worker_count = self._get_positive_integer(
+      worker_count, 'worker_count', enums.NotificationCenter.DEFAULT_WORKER_COUNT
+    )
+    self.notification_queue = queue.Queue(self._get_positive_integer(
+      queue_capacity, 'queue_capacity', enums.NotificationCenter.DEFAULT_QUEUE_CAPACITY
+    ))
+    self.overflow_policy = overflow_policy
+    if overflow_policy is None or overflow_policy not in OVERFLOW_POLICIES:
+      if overflow_policy is not None:
+        self.logger.debug('overflow_policy value {} is invalid. Defaulting to {}.'.format(
+          overflow_policy, enums.NotificationCenter.OVERFLOW_POLICY_DROP
+        ))
+      self.overflow_policy = enums.NotificationCenter.OVERFLOW_POLICY_DROP
+
+    # Send notifications still queued when the interpreter exits.
+    atexit.register(_close_at_exit, weakref.ref(self))
+
+    self.start()
+
+  def _get_positive_integer(self, value, name, default_value):
+    """ Helper method to fall back to default value when provided value is not a positive integer.
+
+    Args:
+      value: Provided value.
+      name: Name of the option the value is provided for.
+      default_value: Value to use if provided value is not set or invalid.
+
+    Returns:
+      Provided value if valid. Default value otherwise.
+    """
+    if value is None:
+      return default_value
+
+    if not isinstance(value, numbers.Integral) or isinstance(value, bool) or value <= 0:
+      self.logger.debug('{} value {} is invalid. Defaulting to {}.'.format(name, value, default_value))
+      return default_value
+
+    return value
+
+  @property
+  def is_running(self):
+    """ Check if worker threads calling listeners in async mode are alive or not. """
+    return any(worker_thread.is_alive() for worker_thread in self._worker_threads)
+
+  def start(self):
+    """ Start the worker threads which call listeners for queued notifications. Only applies in async mode. """
+    if not self.async_mode:
+      return
+
+    if self.is_running:
+      self.logger.warning('Notification center already started.')
+      return
+
+    # Workers hold the notification center weakly so that it can be garbage collected without being closed.
+    # Once it is, the callback wakes up idle workers so that they stop.
+    notification_center_ref = weakref.ref(self, _stop_workers_callback(self.notification_queue, self.worker_count))
+    self._worker_threads = [
+      threading.Thread(target=_run_worker, args=(notification_center_ref, self.notification_queue))
+      for _ in range(self.worker_count)
+    ]
+    for worker_thread in self._worker_threads:
+      worker_thread.setDaemon(True)
+      worker_thread.start()
+
   def add_notification_listener(self, notification_type, notification_callback):
     """ Add a notification callback to the notification center for a given notification type.
 
@@ -107,6 +206,19 @@ class NotificationCenter(object):
     Remove all notification listeners. """
     self.clear_all_notification_listeners()
 
+  def has_listeners(self, notification_type):
+    """ Determine if any listener is added for the given notification type, so that callers can skip building
+    arguments of notifications no one listens to.
+
+    Args:
+      notification_type: String denoting notification type.
+
+    Returns:
+      Boolean indicating if there is at least one listener for the notification type.
+    """
+
+    return bool(self.notification_listeners.get(notification_type))
+
   def send_notifications(self, notification_type, *args):
     """ Fires off the notification for the specific event.  Uses var args to pass in a
         arbitrary list of parameter according to which notification type was fired.
@@ -116,14 +228,189 @@ class NotificationCenter(object):
       args: Variable list of arguments to the callback.
     """
 
-    if notification_type not in NOTIFICATION_TYPES:
-      self.logger.error('Invalid notification_type: {} provided. '
-                        'Not triggering any notification.'.format(notification_type))
+    listeners = self.notification_listeners.get(notification_type)
+    if not listeners:
+      if notification_type not in NOTIFICATION_TYPES:
+        self.logger.error('Invalid notification_type: {} provided. '
+                          'Not triggering any notification.'.format(notification_type))
+      return
+
+    if not self.async_mode or not self.is_running:
+      self._call_listeners(notification_type, listeners, args)
+      return
+
+    # Listeners are copied so that the notification reaches the listeners added at the time it is sent.
+    notification = (notification_type, tuple(listeners), args)
+    if self.overflow_policy == enums.NotificationCenter.OVERFLOW_POLICY_BLOCK:
+      self.notification_queue.put(notification)
+      return
+
+    try:
+      self.notification_queue.put_nowait(notification)
+    except queue.Full:
+      self.logger.warning('Notification queue is full. Dropping "{}" type notification.'.format(notification_type))
+
+  def _call_listeners(self, notification_type, listeners, args):
+    """ Helper method to call listeners with the notification's arguments and record how long each call takes.
+
+    Args:
+      notification_type: Type of notification being sent.
+      listeners: List of tuples of notification ID and callback.
+      args: Tuple of arguments to the callback.
+    """
+
+    for notification_id, callback in listeners:
+      start_time = time.time()
+      try:
+        callback(*args)
+      except:
+        self.logger.exception('Unknown problem when sending "{}" type notification.'.format(notification_type))
+      self._record_listener_call(notification_id, time.time() - start_time)
+
+  def _record_listener_call(self, notification_id, call_time):
+    """ Helper method to add a call of the listener to its stats.
+
+    Args:
+      notification_id: The numeric id of the listener.
+      call_time: Time in seconds the call took.
+    """
+
+    with self._listener_stats_lock:
+      stats = self._listener_stats.get(notification_id)
+      if stats is None:
+        self._listener_stats[notification_id] = {'call_count': 1, 'total_time': call_time, 'max_time': call_time}
+        return
+
+      stats['call_count'] += 1
+      stats['total_time'] += call_time
+      stats['max_time'] = max(stats['max_time'], call_time)
+
+  def get_listener_stats(self, notification_id):
+    """ Get timing stats of calls made to a listener.
+
+    Args:
+      notification_id: The numeric id passed back from add_notification_listener.
+
+    Returns:
+      Dict with the number of calls made to the listener under "call_count" and the total and longest time
+      in seconds they took under "total_time" and "max_time". None if the listener has not been called.
+    """
+
+    with self._listener_stats_lock:
+      stats = self._listener_stats.get(notification_id)
+      return dict(stats) if stats is not None else None
+
+  def flush(self, timeout=None):
+    """ Wait until listeners have been called for all notifications queued so far. Only applies in async mode.
+
+    Args:
+      timeout: Optional time in seconds to wait for queued notifications to be sent.
+    """
+    if not self.async_mode or not self.is_running:
+      return
+
+    if timeout is None:
+      timeout = enums.NotificationCenter.DEFAULT_FLUSH_TIMEOUT
+    deadline = time.time() + timeout
+
+    # Same as Queue.join, but giving up once the deadline passes.
+    with self.notification_queue.all_tasks_done:
+      while self.notification_queue.unfinished_tasks:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+          self.logger.error('Timeout exceeded while attempting to flush for {} seconds.'.format(timeout))
+          return
+        self.notification_queue.all_tasks_done.wait(remaining)
+
+  def close(self, timeout=None):
+    """ Send all queued notifications and stop the worker threads. Only applies in async mode.
+
+    Args:
+      timeout: Optional time in seconds to wait for queued notifications to be sent.
+    """
+    if not self.async_mode or not self.is_running:
       return
 
-    if notification_type in self.notification_listeners:
-      for notification_id, callback in self.notification_listeners[notification_type]:
-        try:
-          callback(*args)
-        except:
-          self.logger.exception('Unknown problem when sending "{}" type notification.'.format(notification_type))
+    if timeout is None:
+      timeout = enums.NotificationCenter.DEFAULT_CLOSE_TIMEOUT
+    deadline = time.time() + timeout
+
+    # Each worker stops on the first shutdown signal it takes, after notifications queued before it.
+    for _ in self._worker_threads:
+      try:
+        self.notification_queue.put(self._SHUTDOWN_SIGNAL, timeout=max(deadline - time.time(), 0))
+      except queue.Full:
+        break
+
+    for worker_thread in self._worker_threads:
+      worker_thread.join(max(deadline - time.time(), 0))
+
+    if self.is_running:
+      self.logger.error('Timeout exceeded while attempting to close for {} seconds.'.format(timeout))
+
+
+def _run_worker(notification_center_ref, notification_queue):
+  """ Triggered as part of the worker threads which call listeners for queued notifications.
+
+  Args:
+    notification_center_ref: Weak reference to NotificationCenter.
+    notification_queue: Queue of the notification center.
+  """
+  while True:
+    notification = notification_queue.get()
+    try:
+      if notification is NotificationCenter._SHUTDOWN_SIGNAL or \
+         not _send_queued_notification(notification_center_ref, notification):
+        return
+    finally:
+      notification_queue.task_done()
+
+
+def _send_queued_notification(notification_center_ref, notification):
+  """ Call listeners for the queued notification if the referenced notification center still exists.
+
+  Args:
+    notification_center_ref: Weak reference to NotificationCenter.
+    notification: Tuple of notification type, listeners and arguments to the callback.
+
+  Returns:
+    Boolean indicating if the notification center still exists.
+  """
+  notification_center = notification_center_ref()
+  if notification_center is None:
+    return False
+
+  notification_center._call_listeners(*notification)
+  return True
+
+
+def _stop_workers_callback(notification_queue, worker_count):
+  """ Make the callback stopping idle workers once their notification center is garbage collected.
+
+  Args:
+    notification_queue: Queue of the notification center.
+    worker_count: Number of worker threads taking notifications off the queue.
+
+  Returns:
+    Function to be called with the dead weak reference to the notification center.
+  """
+  def stop_workers(notification_center_ref):
+    # Workers which find the queue full stop on the next notification they take instead.
+    for _ in range(worker_count):
+      try:
+        notification_queue.put_nowait(NotificationCenter._SHUTDOWN_SIGNAL)
+      except queue.Full:
+        return
+
+  return stop_workers
+
+
+def _close_at_exit(notification_center_ref):
+  """ Close the referenced notification center if it still exists.
+
+  Args:
+    notification_center_ref: Weak reference to NotificationCenter.
+  """
+  notification_center = notification_center_ref()
+  if notification_center is not None:
+    notification_center.close()
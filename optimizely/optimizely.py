@@ -38,7 +38,10 @@ class Optimizely(object):
                user_profile_service=None,
                sdk_key=None,
                config_manager=None,
-               notification_center=None):
+               notification_center=None,
+               bucket_value_cache=None,
+               decision_cache=None,
+               event_processor=None):
     """ Optimizely init method for managing Custom projects.
 
     Args:
@@ -56,6 +59,14 @@ class Optimizely(object):
       notification_center: Optional instance of notification_center.NotificationCenter. Useful when providing own
                            config_manager.BaseConfigManager implementation which can be using the
                            same NotificationCenter instance.
+      bucket_value_cache: Optional instance of lru_cache.LRUCache to cache bucket values computed for users.
+                          Useful when the same user is evaluated against the same experiments many times.
+      decision_cache: Optional instance of lru_cache.LRUCache to cache decisions keyed by config revision,
+                      user ID, attributes and experiment or feature. Useful when the same decisions are
+                      requested for a user many times, for instance across several feature variable lookups.
+      event_processor: Optional component which provides a process method such as
+                       event_processor.BatchEventProcessor. When provided, impression and conversion events are
+                       handed to it instead of being dispatched synchronously using the event_dispatcher.
     """
     self.logger_name = '.'.join([__name__, self.__class__.__name__])
     self.is_valid = True
@@ -64,6 +75,9 @@ class Optimizely(object):
     self.error_handler = error_handler or noop_error_handler
     self.config_manager = config_manager
     self.notification_center = notification_center or NotificationCenter(self.logger)
+    self.bucket_value_cache = bucket_value_cache
+    self.decision_cache = decision_cache
+    self.event_processor = event_processor
 
     try:
       self._validate_instantiation_options()
@@ -91,7 +105,8 @@ class Optimizely(object):
                                                   skip_json_validation=skip_json_validation)
 
     self.event_builder = event_builder.EventBuilder()
-    self.decision_service = decision_service.DecisionService(self.logger, user_profile_service)
+    self.decision_service = decision_service.DecisionService(self.logger, user_profile_service,
+                                                             self.bucket_value_cache, self.decision_cache)
 
   def _validate_instantiation_options(self):
     """ Helper method to validate all instantiation parameters.
@@ -114,6 +129,15 @@ class Optimizely(object):
     if not validator.is_notification_center_valid(self.notification_center):
       raise exceptions.InvalidInputException(enums.Errors.INVALID_INPUT.format('notification_center'))
 
+    if self.bucket_value_cache is not None and not validator.is_cache_valid(self.bucket_value_cache):
+      raise exceptions.InvalidInputException(enums.Errors.INVALID_INPUT.format('bucket_value_cache'))
+
+    if self.decision_cache is not None and not validator.is_cache_valid(self.decision_cache):
+      raise exceptions.InvalidInputException(enums.Errors.INVALID_INPUT.format('decision_cache'))
+
+    if self.event_processor is not None and not validator.is_event_processor_valid(self.event_processor):
+      raise exceptions.InvalidInputException(enums.Errors.INVALID_INPUT.format('event_processor'))
+
   def _validate_user_inputs(self, attributes=None, event_tags=None):
     """ Helper method to validate user inputs.
 
@@ -138,6 +162,18 @@ class Optimizely(object):
 
     return True
 
+  def _process_event(self, event):
+    """ Helper method to hand event to the event processor if provided or dispatch it otherwise.
+
+    Args:
+      event: event_builder.Event to be sent.
+    """
+
+    if self.event_processor:
+      self.event_processor.process(event)
+    else:
+      self.event_dispatcher.dispatch_event(event)
+
   def _send_impression_event(self, project_config, experiment, variation, user_id, attributes):
     """ Helper method to send impression event.
 
@@ -163,7 +199,7 @@ class Optimizely(object):
     ))
 
     try:
-      self.event_dispatcher.dispatch_event(impression_event)
+      self._process_event(impression_event)
     except:
       self.logger.exception('Unable to dispatch impression event!')
 
@@ -226,7 +262,6 @@ class Optimizely(object):
       return None
 
     feature_enabled = False
-    source_info = {}
     variable_value = variable.defaultValue
     decision = self.decision_service.get_variation_for_feature(project_config, feature_flag, user_id, attributes)
     if decision.variation:
@@ -250,33 +285,36 @@ class Optimizely(object):
         'Returning default value for variable "%s" of feature flag "%s".' % (user_id, variable_key, feature_key)
       )
 
-    if decision.source == enums.DecisionSources.FEATURE_TEST:
-      source_info = {
-        'experiment_key': decision.experiment.key,
-        'variation_key': decision.variation.key
-      }
-
     try:
       actual_value = project_config.get_typecast_value(variable_value, variable_type)
     except:
       self.logger.error('Unable to cast value. Returning None.')
       actual_value = None
 
-    self.notification_center.send_notifications(
-      enums.NotificationTypes.DECISION,
-      enums.DecisionNotificationTypes.FEATURE_VARIABLE,
-      user_id,
-      attributes or {},
-      {
-        'feature_key': feature_key,
-        'feature_enabled': feature_enabled,
-        'source': decision.source,
-        'variable_key': variable_key,
-        'variable_value': actual_value,
-        'variable_type': variable_type,
-        'source_info': source_info
-      }
-    )
+    if self.notification_center.has_listeners(enums.NotificationTypes.DECISION):
+      source_info = {}
+      if decision.source == enums.DecisionSources.FEATURE_TEST:
+        source_info = {
+          'experiment_key': decision.experiment.key,
+          'variation_key': decision.variation.key
+        }
+
+      self.notification_center.send_notifications(
+        enums.NotificationTypes.DECISION,
+        enums.DecisionNotificationTypes.FEATURE_VARIABLE,
+        user_id,
+        attributes or {},
+        {
+          'feature_key': feature_key,
+          'feature_enabled': feature_enabled,
+          'source': decision.source,
+          'variable_key': variable_key,
+          'variable_value': actual_value,
+          'variable_type': variable_type,
+          'source_info': source_info
+        }
+      )
+
     return actual_value
 
   def activate(self, experiment_key, user_id, attributes=None):
@@ -309,7 +347,7 @@ class Optimizely(object):
       self.logger.error(enums.Errors.INVALID_PROJECT_CONFIG.format('activate'))
       return None
 
-    variation_key = self.get_variation(experiment_key, user_id, attributes)
+    variation_key = self._get_variation(project_config, experiment_key, user_id, attributes)
 
     if not variation_key:
       self.logger.info('Not activating user "%s".' % user_id)
@@ -372,7 +410,7 @@ class Optimizely(object):
       conversion_event.params
     ))
     try:
-      self.event_dispatcher.dispatch_event(conversion_event)
+      self._process_event(conversion_event)
     except:
       self.logger.exception('Unable to dispatch conversion event!')
     self.notification_center.send_notifications(enums.NotificationTypes.TRACK, event_key, user_id,
@@ -408,6 +446,23 @@ class Optimizely(object):
       self.logger.error(enums.Errors.INVALID_PROJECT_CONFIG.format('get_variation'))
       return None
 
+    return self._get_variation(project_config, experiment_key, user_id, attributes)
+
+  def _get_variation(self, project_config, experiment_key, user_id, attributes):
+    """ Helper method to get variation where user will be bucketed using the given config,
+    so that callers which already got the config use the same revision throughout.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiment_key: Experiment for which user variation needs to be determined.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+
+    Returns:
+      Variation key representing the variation the user will be bucketed in.
+      None if user is not in experiment or if experiment is not Running.
+    """
+
     experiment = project_config.get_experiment_from_key(experiment_key)
     variation_key = None
 
@@ -425,6 +480,23 @@ class Optimizely(object):
     if variation:
       variation_key = variation.key
 
+    self._send_experiment_decision_notification(project_config, experiment, user_id, attributes, variation_key)
+    return variation_key
+
+  def _send_experiment_decision_notification(self, project_config, experiment, user_id, attributes, variation_key):
+    """ Helper method to send decision notification for the variation user is bucketed in for an experiment.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiment: Experiment for which user variation was determined.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+      variation_key: Key of the variation user is bucketed in. None if user is not in experiment.
+    """
+
+    if not self.notification_center.has_listeners(enums.NotificationTypes.DECISION):
+      return
+
     if project_config.is_feature_experiment(experiment.id):
       decision_notification_type = enums.DecisionNotificationTypes.FEATURE_TEST
     else:
@@ -436,12 +508,173 @@ class Optimizely(object):
       user_id,
       attributes or {},
       {
-         'experiment_key': experiment_key,
+         'experiment_key': experiment.key,
          'variation_key': variation_key
       }
     )
 
-    return variation_key
+  def get_variations(self, experiment_keys, user_id, attributes=None):
+    """ Gets variations where user will be bucketed for each of the given experiments.
+    Inputs are validated, config is fetched and user profile is looked up and saved only once for all experiments.
+
+    Args:
+      experiment_keys: List of experiments for which user variations need to be determined.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+
+    Returns:
+      Dict mapping each experiment key to the key of the variation the user will be bucketed in.
+      Variation key is None if user is not in experiment or if experiment is not Running.
+      Empty dict if inputs are invalid.
+    """
+
+    if not self.is_valid:
+      self.logger.error(enums.Errors.INVALID_OPTIMIZELY.format('get_variations'))
+      return {}
+
+    if not self._validate_batch_inputs(experiment_keys, user_id, attributes):
+      return {}
+
+    project_config = self.config_manager.get_config()
+    if not project_config:
+      self.logger.error(enums.Errors.INVALID_PROJECT_CONFIG.format('get_variations'))
+      return {}
+
+    return dict((experiment_key, variation.key if variation else None) for experiment_key, _, variation in
+                self._get_variations(project_config, experiment_keys, user_id, attributes))
+
+  def activate_many(self, experiment_keys, user_id, attributes=None):
+    """ Buckets visitor into each of the given experiments and sends a single impression event to Optimizely
+    recording all of them. Inputs are validated, config is fetched and user profile is looked up and saved
+    only once for all experiments.
+
+    Args:
+      experiment_keys: List of experiments which need to be activated.
+      user_id: ID for user.
+      attributes: Dict representing user attributes and values which need to be recorded.
+
+    Returns:
+      Dict mapping each experiment key to the key of the variation the user will be bucketed in.
+      Variation key is None if user is not in experiment or if experiment is not Running.
+      Empty dict if inputs are invalid.
+    """
+
+    if not self.is_valid:
+      self.logger.error(enums.Errors.INVALID_OPTIMIZELY.format('activate_many'))
+      return {}
+
+    if not self._validate_batch_inputs(experiment_keys, user_id, attributes):
+      return {}
+
+    project_config = self.config_manager.get_config()
+    if not project_config:
+      self.logger.error(enums.Errors.INVALID_PROJECT_CONFIG.format('activate_many'))
+      return {}
+
+    variation_keys = {}
+    activated = []
+    for experiment_key, experiment, variation in self._get_variations(project_config, experiment_keys,
+                                                                      user_id, attributes):
+      variation_keys[experiment_key] = variation.key if variation else None
+      if not variation:
+        self.logger.info('Not activating user "%s" in experiment "%s".' % (user_id, experiment_key))
+        continue
+
+      self.logger.info('Activating user "%s" in experiment "%s".' % (user_id, experiment.key))
+      activated.append((experiment, variation))
+
+    if not activated:
+      return variation_keys
+
+    # Create and dispatch a single impression event for all activated experiments
+    impression_event = self.event_builder.create_combined_impression_event(
+      project_config,
+      [(experiment, variation.id) for experiment, variation in activated],
+      user_id,
+      attributes
+    )
+
+    self.logger.debug('Dispatching impression event to URL %s with params %s.' % (
+      impression_event.url,
+      impression_event.params
+    ))
+
+    try:
+      self._process_event(impression_event)
+    except:
+      self.logger.exception('Unable to dispatch impression event!')
+
+    for experiment, variation in activated:
+      self.notification_center.send_notifications(enums.NotificationTypes.ACTIVATE,
+                                                  experiment, user_id, attributes, variation, impression_event)
+
+    return variation_keys
+
+  def _validate_batch_inputs(self, experiment_keys, user_id, attributes):
+    """ Helper method to validate inputs of methods deciding for many experiments at once.
+
+    Args:
+      experiment_keys: List of experiment keys.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+
+    Returns:
+      Boolean True if inputs are valid. False otherwise.
+    """
+
+    if not isinstance(experiment_keys, (list, tuple)):
+      self.logger.error(enums.Errors.INVALID_INPUT.format('experiment_keys'))
+      return False
+
+    if not isinstance(user_id, string_types):
+      self.logger.error(enums.Errors.INVALID_INPUT.format('user_id'))
+      return False
+
+    return self._validate_user_inputs(attributes)
+
+  def _get_variations(self, project_config, experiment_keys, user_id, attributes):
+    """ Helper method to get variations where user will be bucketed for each of the given experiments.
+    Keys which are not strings are logged and skipped, as are repeated keys.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      experiment_keys: List of experiments for which user variations need to be determined.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+
+    Returns:
+      List of tuples of experiment key, experiment and variation in the order of the given keys.
+      Experiment is None for keys not in the datafile and variation is None if user is not in experiment.
+    """
+
+    keyed_experiments = []
+    seen_keys = set()
+    for experiment_key in experiment_keys:
+      if not validator.is_non_empty_string(experiment_key):
+        self.logger.error(enums.Errors.INVALID_INPUT.format('experiment_key'))
+        continue
+
+      if experiment_key in seen_keys:
+        continue
+      seen_keys.add(experiment_key)
+
+      experiment = project_config.get_experiment_from_key(experiment_key)
+      if not experiment:
+        self.logger.info('Experiment key "%s" is invalid. Not activating user "%s".' % (experiment_key, user_id))
+      keyed_experiments.append((experiment_key, experiment))
+
+    known_experiments = [known_experiment for _, known_experiment in keyed_experiments if known_experiment]
+    variations = iter(self.decision_service.get_variations(project_config, known_experiments, user_id, attributes))
+    decisions = []
+    for experiment_key, experiment in keyed_experiments:
+      variation = None
+      if experiment:
+        variation = next(variations)
+        self._send_experiment_decision_notification(project_config, experiment, user_id, attributes,
+                                                    variation.key if variation else None)
+      decisions.append((experiment_key, experiment, variation))
+
+    return decisions
 
   def is_feature_enabled(self, feature_key, user_id, attributes=None):
     """ Returns true if the feature is enabled for the given user.
@@ -479,9 +712,26 @@ class Optimizely(object):
     if not feature:
       return False
 
-    feature_enabled = False
-    source_info = {}
     decision = self.decision_service.get_variation_for_feature(project_config, feature, user_id, attributes)
+    return self._process_feature_decision(project_config, feature, decision, user_id, attributes)
+
+  def _process_feature_decision(self, project_config, feature, decision, user_id, attributes):
+    """ Helper method to determine if the feature is enabled given the decision made for the user.
+    Sends impression event if the decision came from an experiment and sends the feature decision notification.
+
+    Args:
+      project_config: Instance of ProjectConfig.
+      feature: Feature for which the decision was made.
+      decision: Decision namedtuple for the user and the feature.
+      user_id: ID for user.
+      attributes: Dict representing user attributes.
+
+    Returns:
+      True if the feature is enabled for the user. False otherwise.
+    """
+
+    feature_key = feature.key
+    feature_enabled = False
     is_source_experiment = decision.source == enums.DecisionSources.FEATURE_TEST
 
     if decision.variation:
@@ -489,10 +739,6 @@ class Optimizely(object):
         feature_enabled = True
       # Send event if Decision came from an experiment.
       if is_source_experiment:
-        source_info = {
-          'experiment_key': decision.experiment.key,
-          'variation_key': decision.variation.key
-        }
         self._send_impression_event(project_config,
                                     decision.experiment,
                                     decision.variation,
@@ -504,18 +750,26 @@ class Optimizely(object):
     else:
       self.logger.info('Feature "%s" is not enabled for user "%s".' % (feature_key, user_id))
 
-    self.notification_center.send_notifications(
-        enums.NotificationTypes.DECISION,
-        enums.DecisionNotificationTypes.FEATURE,
-        user_id,
-        attributes or {},
-        {
-          'feature_key': feature_key,
-          'feature_enabled': feature_enabled,
-          'source': decision.source,
-          'source_info': source_info
+    if self.notification_center.has_listeners(enums.NotificationTypes.DECISION):
+      source_info = {}
+      if decision.variation and is_source_experiment:
+        source_info = {
+          'experiment_key': decision.experiment.key,
+          'variation_key': decision.variation.key
         }
-    )
+
+      self.notification_center.send_notifications(
+          enums.NotificationTypes.DECISION,
+          enums.DecisionNotificationTypes.FEATURE,
+          user_id,
+          attributes or {},
+          {
+            'feature_key': feature_key,
+            'feature_enabled': feature_enabled,
+            'source': decision.source,
+            'source_info': source_info
+          }
+      )
 
     return feature_enabled
 
@@ -547,8 +801,11 @@ class Optimizely(object):
       self.logger.error(enums.Errors.INVALID_PROJECT_CONFIG.format('get_enabled_features'))
       return enabled_features
 
-    for feature in project_config.feature_key_map.values():
-      if self.is_feature_enabled(feature.key, user_id, attributes):
+    # Decide for all features at once so that inputs are validated and the user is bucketed into groups only once.
+    features = list(project_config.feature_key_map.values())
+    decisions = self.decision_service.get_variations_for_features(project_config, features, user_id, attributes)
+    for feature, decision in zip(features, decisions):
+      if self._process_feature_decision(project_config, feature, decision, user_id, attributes):
         enabled_features.append(feature.key)
 
     return enabled_features
@@ -740,3 +997,12 @@ class Optimizely(object):
 
     forced_variation = self.decision_service.get_forced_variation(project_config, experiment_key, user_id)
     return forced_variation.key if forced_variation else None
+
+  def close(self):
+    """ Stop components which work in the background, dispatching events queued by the event processor
+    and sending notifications queued by the notification center. """
+
+    if self.event_processor and hasattr(self.event_processor, 'close'):
+      self.event_processor.close()
+
+    self.notification_center.close()
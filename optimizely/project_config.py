@@ -13,26 +13,34 @@
 
 import json
 
+from .helpers import audience_compiler
 from .helpers import condition as condition_helper
 from .helpers import enums
 from . import entities
 from . import exceptions
+from . import logger as optimizely_logger
+from .error_handler import NoOpErrorHandler
 
 SUPPORTED_VERSIONS = [enums.DatafileVersions.V2, enums.DatafileVersions.V3, enums.DatafileVersions.V4]
 
 RESERVED_ATTRIBUTE_PREFIX = '$opt_'
 
+# Attributes of ProjectConfig which are not part of a config snapshot.
+UNPICKLABLE_ATTRIBUTES = ('logger', 'error_handler', 'compiled_audience_map', 'compiled_audience_conditions_map')
+
 
 class ProjectConfig(object):
   """ Representation of the Optimizely project config. """
 
-  def __init__(self, datafile, logger, error_handler):
+  def __init__(self, datafile, logger, error_handler, warm=True):
     """ ProjectConfig init method to load and set project config data.
 
     Args:
       datafile: JSON string representing the project.
       logger: Provides a logger instance.
       error_handler: Provides a handle_error method to handle exceptions.
+      warm: Optional boolean indicating if structures derived for faster decisions are to be built right away.
+            If False, they are only built when warm is called.
     """
 
     config = json.loads(datafile)
@@ -68,7 +76,10 @@ class ProjectConfig(object):
 
     # Conditions of audiences in typedAudiences are not expected
     # to be string-encoded as they are in audiences.
+    # Parsed conditions are kept so that they can be deserialized without decoding them again.
+    typed_audience_conditions_map = {}
     for typed_audience in self.typed_audiences:
+      typed_audience_conditions_map[typed_audience['id']] = typed_audience['conditions']
       typed_audience['conditions'] = json.dumps(typed_audience['conditions'])
     typed_audience_id_map = self._generate_key_map(self.typed_audiences, 'id', entities.Audience)
     self.audience_id_map.update(typed_audience_id_map)
@@ -78,14 +89,12 @@ class ProjectConfig(object):
       for experiment in layer.experiments:
         self.experiment_key_map[experiment['key']] = entities.Experiment(**experiment)
 
-    self.audience_id_map = self._deserialize_audience(self.audience_id_map)
+    self.audience_id_map = self._deserialize_audience(self.audience_id_map, typed_audience_conditions_map)
     for group in self.group_id_map.values():
       experiments_in_group_key_map = self._generate_key_map(group.experiments, 'key', entities.Experiment)
       for experiment in experiments_in_group_key_map.values():
-        experiment.__dict__.update({
-          'groupId': group.id,
-          'groupPolicy': group.policy
-        })
+        experiment.groupId = group.id
+        experiment.groupPolicy = group.policy
       self.experiment_key_map.update(experiments_in_group_key_map)
 
     self.experiment_id_map = {}
@@ -104,6 +113,12 @@ class ProjectConfig(object):
           variation.variables, 'id', entities.Variation.VariableUsage
         )
 
+    # Map of experiment and group IDs to lookup tables used for bucketing.
+    self.traffic_allocation_table_map = {}
+    # Map of audience IDs and experiment IDs to audience conditions compiled for faster evaluation.
+    self.compiled_audience_map = {}
+    self.compiled_audience_conditions_map = {}
+
     self.feature_key_map = self._generate_key_map(self.feature_flags, 'key', entities.FeatureFlag)
 
     # Dict containing map of experiment ID to feature ID.
@@ -123,6 +138,67 @@ class ProjectConfig(object):
           # Experiments in feature can only belong to one mutex group
           break
 
+    if warm:
+      self.warm()
+
+  def warm(self):
+    """ Build lookup tables used for bucketing and compile audience conditions.
+    Decisions made before the config is warmed are the same, only slower. """
+
+    traffic_allocation_table_map = {}
+    for experiment in self.experiment_id_map.values():
+      traffic_allocation_table_map[experiment.id] = self._generate_traffic_allocation_table(
+        experiment.trafficAllocation, self.variation_id_map[experiment.key]
+      )
+    for group in self.group_id_map.values():
+      traffic_allocation_table_map[group.id] = self._generate_traffic_allocation_table(
+        group.trafficAllocation, self.experiment_id_map
+      )
+    self.traffic_allocation_table_map = traffic_allocation_table_map
+
+    self._compile_audience_conditions()
+
+  def __getstate__(self):
+    """ Get state to be pickled when saving a config snapshot.
+    Logger, error handler and compiled audience conditions can not be pickled and are left out.
+
+    Returns:
+      Dict representing the state of the config.
+    """
+
+    state = self.__dict__.copy()
+    for unpicklable_attribute in UNPICKLABLE_ATTRIBUTES:
+      state.pop(unpicklable_attribute, None)
+
+    return state
+
+  def __setstate__(self, state):
+    """ Restore state of the config loaded from a snapshot and compile audience conditions again.
+
+    Args:
+      state: Dict representing the state of the config.
+    """
+
+    self.__dict__.update(state)
+    self.logger = optimizely_logger.adapt_logger(optimizely_logger.NoOpLogger())
+    self.error_handler = NoOpErrorHandler()
+    self._compile_audience_conditions()
+
+  def _compile_audience_conditions(self):
+    """ Helper method to compile conditions of audiences and experiments for faster evaluation. """
+
+    compiled_audience_map = audience_compiler.compile_audiences(self.audience_id_map)
+    compiled_audience_conditions_map = {}
+    for experiment in self.experiment_id_map.values():
+      compiled_conditions = audience_compiler.compile_audience_conditions(
+        self, experiment.getAudienceConditionsOrIds(), compiled_audience_map
+      )
+      if compiled_conditions:
+        compiled_audience_conditions_map[experiment.id] = compiled_conditions
+
+    self.compiled_audience_map = compiled_audience_map
+    self.compiled_audience_conditions_map = compiled_audience_conditions_map
+
   @staticmethod
   def _generate_key_map(entity_list, key, entity_class):
     """ Helper method to generate map from key to entity object for given list of dicts.
@@ -143,22 +219,56 @@ class ProjectConfig(object):
     return key_map
 
   @staticmethod
-  def _deserialize_audience(audience_map):
+  def _generate_traffic_allocation_table(traffic_allocations, entity_map=None):
+    """ Helper method to generate lookup table for bucketing from given traffic allocations.
+
+    Args:
+      traffic_allocations: List of dicts consisting of entity ID and end of range.
+      entity_map: Optional dict mapping entity ID to entity object.
+
+    Returns:
+      entities.TrafficAllocationTable for the given traffic allocations.
+    """
+
+    entity_map = entity_map or {}
+    end_of_ranges = []
+    entity_ids = []
+    current_end_of_range = None
+    for traffic_allocation in traffic_allocations:
+      # Running maximum of the end of ranges so that bisecting on a bucket value finds the
+      # first allocation whose end of range is greater than it, same as a linear walk would.
+      end_of_range = traffic_allocation.get('endOfRange')
+      if current_end_of_range is None or end_of_range > current_end_of_range:
+        current_end_of_range = end_of_range
+      end_of_ranges.append(current_end_of_range)
+      entity_ids.append(traffic_allocation.get('entityId'))
+
+    return entities.TrafficAllocationTable(
+      tuple(end_of_ranges),
+      tuple(entity_ids) + (None,),
+      tuple(entity_map.get(entity_id) for entity_id in entity_ids) + (None,)
+    )
+
+  @staticmethod
+  def _deserialize_audience(audience_map, parsed_conditions_map=None):
     """ Helper method to de-serialize and populate audience map with the condition list and structure.
 
     Args:
       audience_map: Dict mapping audience ID to audience object.
+      parsed_conditions_map: Optional dict mapping audience ID to already parsed conditions of the audience.
 
     Returns:
       Dict additionally consisting of condition list and structure on every audience object.
     """
 
-    for audience in audience_map.values():
-      condition_structure, condition_list = condition_helper.loads(audience.conditions)
-      audience.__dict__.update({
-        'conditionStructure': condition_structure,
-        'conditionList': condition_list
-      })
+    parsed_conditions_map = parsed_conditions_map or {}
+    for audience_id, audience in audience_map.items():
+      if audience_id in parsed_conditions_map:
+        condition_structure, condition_list = condition_helper.deserialize(parsed_conditions_map[audience_id])
+      else:
+        condition_structure, condition_list = condition_helper.loads(audience.conditions)
+      audience.conditionStructure = condition_structure
+      audience.conditionList = condition_list
 
     return audience_map
 
@@ -275,6 +385,39 @@ class ProjectConfig(object):
     self.error_handler.handle_error(exceptions.InvalidGroupException(enums.Errors.INVALID_GROUP_ID))
     return None
 
+  def get_traffic_allocation_table(self, entity):
+    """ Get lookup table for bucketing into the provided experiment or group.
+
+    Args:
+      entity: Experiment or Group whose traffic allocation is to be looked up.
+
+    Returns:
+      entities.TrafficAllocationTable corresponding to the entity's traffic allocation.
+    """
+
+    table = self.traffic_allocation_table_map.get(entity.id)
+    if table:
+      return table
+
+    return self._generate_traffic_allocation_table(entity.trafficAllocation)
+
+  def get_compiled_audience_conditions(self, experiment):
+    """ Get compiled audience conditions for the provided experiment.
+
+    Args:
+      experiment: Experiment whose audience conditions are to be evaluated.
+
+    Returns:
+      audience_compiler.CompiledAudienceConditions if the experiment's current audience conditions were compiled.
+      None otherwise.
+    """
+
+    compiled_conditions = self.compiled_audience_conditions_map.get(experiment.id)
+    if compiled_conditions and compiled_conditions.source is experiment.getAudienceConditionsOrIds():
+      return compiled_conditions
+
+    return None
+
   def get_audience(self, audience_id):
     """ Get audience object for the provided audience ID.
 
@@ -452,19 +595,16 @@ class ProjectConfig(object):
 
     if variable_usage:
       variable_value = variable_usage.value
-      self.logger.info('Value for variable "%s" for variation "%s" is "%s".' % (
-        variable.key,
-        variation.key,
-        variable_value
-      ))
+      optimizely_logger.log_info(self.logger, 'Value for variable "%s" for variation "%s" is "%s".',
+                                 variable.key, variation.key, variable_value)
 
     else:
       variable_value = variable.defaultValue
-      self.logger.info('Variable "%s" is not used in variation "%s". Assigning default value "%s".' % (
-        variable.key,
-        variation.key,
-        variable_value
-      ))
+      optimizely_logger.log_info(
+        self.logger,
+        'Variable "%s" is not used in variation "%s". Assigning default value "%s".',
+        variable.key, variation.key, variable_value
+      )
 
     return variable_value
 
@@ -11,6 +11,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
 
 class UserProfile(object):
   """ Class encapsulating information representing a user's profile.
@@ -80,3 +82,87 @@ class UserProfileService(object):
       user_profile: Dict representing the user's profile.
     """
     pass
+
+
+class BulkUserProfileService(UserProfileService):
+  """ Class encapsulating user profile service functionality with lookup and save of many users' profiles at once.
+  DecisionService detects lookup_many and save_many and uses them when deciding for many users at once.
+  Override with your own implementation, for instance issuing a single pipelined request to your store. """
+
+  def lookup_many(self, user_ids):
+    """ Fetch the user profile dicts corresponding to the user IDs.
+
+    Args:
+      user_ids: List of IDs for users whose profiles need to be retrieved.
+
+    Returns:
+      Dict mapping each of the user IDs to a dict representing the user's profile, as lookup would return it.
+      Users left out of it or mapped to None are treated as having no stored profile.
+    """
+    return dict((user_id, self.lookup(user_id)) for user_id in user_ids)
+
+  def save_many(self, user_profiles):
+    """ Save the user profile dicts sent to this method.
+
+    Args:
+      user_profiles: List of dicts representing the users' profiles.
+    """
+    for user_profile in user_profiles:
+      self.save(user_profile)
+
+
+class InMemoryUserProfileService(BulkUserProfileService):
+  """ Reference implementation of BulkUserProfileService keeping profiles in memory.
+  Profiles are copied on lookup and save so that stored profiles are only changed through save. """
+
+  def __init__(self):
+    self.user_profiles = {}
+
+  def lookup(self, user_id):
+    """ Fetch the user profile dict corresponding to the user ID.
+
+    Args:
+      user_id: ID for user whose profile needs to be retrieved.
+
+    Returns:
+      Dict representing the user's profile. Profile without decisions if none is stored for the user.
+    """
+    user_profile = self.user_profiles.get(user_id)
+    if user_profile is None:
+      return UserProfile(user_id).__dict__
+
+    return copy.deepcopy(user_profile)
+
+  def lookup_many(self, user_ids):
+    """ Fetch the user profile dicts corresponding to the user IDs.
+
+    Args:
+      user_ids: List of IDs for users whose profiles need to be retrieved.
+
+    Returns:
+      Dict mapping each of the user IDs to a dict representing the user's profile.
+      Profile without decisions for users for whom none is stored.
+    """
+    user_profiles = self.user_profiles
+    return dict(
+      (user_id, copy.deepcopy(user_profiles[user_id]) if user_id in user_profiles else UserProfile(user_id).__dict__)
+      for user_id in user_ids
+    )
+
+  def save(self, user_profile):
+    """ Save the user profile dict sent to this method.
+
+    Args:
+      user_profile: Dict representing the user's profile.
+    """
+    self.user_profiles[user_profile[UserProfile.USER_ID_KEY]] = copy.deepcopy(user_profile)
+
+  def save_many(self, user_profiles):
+    """ Save the user profile dicts sent to this method.
+
+    Args:
+      user_profiles: List of dicts representing the users' profiles.
+    """
+    self.user_profiles.update(
+      (user_profile[UserProfile.USER_ID_KEY], user_profile) for user_profile in copy.deepcopy(user_profiles)
+    )
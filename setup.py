@@ -1,4 +1,5 @@
 import os
+import sys
 
 from setuptools import setup
 from setuptools import find_packages
@@ -23,6 +24,11 @@ with open(os.path.join(here, 'README.md')) as _file:
 with open(os.path.join(here, 'CHANGELOG.md')) as _file:
   CHANGELOG = _file.read()
 
+# The asyncio integrations use syntax which only parses on Python 3.5+.
+EXCLUDED_PACKAGES = ['tests']
+if sys.version_info < (3, 5):
+  EXCLUDED_PACKAGES.append('optimizely.aio')
+
 about_text = 'Optimizely X Full Stack is A/B testing and feature management for product development teams. ' \
              'Experiment in any application. Make every feature on your roadmap an opportunity to learn. ' \
              'Learn more at https://www.optimizely.com/products/full-stack/ or see our documentation at ' \
@@ -50,9 +56,12 @@ setup(
       'Programming Language :: Python :: 3.6'
     ],
     packages=find_packages(
-      exclude=['tests']
+      exclude=EXCLUDED_PACKAGES
     ),
-    extras_require={'test': TEST_REQUIREMENTS},
+    extras_require={
+      'asyncio': ['aiohttp; python_version >= "3.5"'],
+      'test': TEST_REQUIREMENTS
+    },
     install_requires=REQUIREMENTS,
     tests_require=TEST_REQUIREMENTS,
     test_suite='tests'
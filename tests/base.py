@@ -11,7 +11,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import json
+import mock
 import unittest
 from six import PY3
 
@@ -22,6 +24,15 @@ if PY3:
     raise NotImplementedError('Tests should only call `long` if running in PY2')
 
 
+@contextlib.contextmanager
+def mock_send_notifications():
+  """ Patch NotificationCenter to report listeners for every notification type, so that notifications are built,
+  and to record notifications sent instead of sending them. """
+  with mock.patch('optimizely.notification_center.NotificationCenter.has_listeners', return_value=True), \
+    mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_send:
+    yield mock_send
+
+
 class BaseTest(unittest.TestCase):
 
   def assertStrictTrue(self, to_assert):
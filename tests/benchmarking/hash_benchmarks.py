@@ -0,0 +1,59 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Compares the pure Python MurmurHash3 fallback against the mmh3 C extension on bucketing keys. """
+
+from __future__ import print_function
+
+import timeit
+from tabulate import tabulate
+
+from optimizely import bucketer
+from optimizely.lib import pymmh3
+
+try:
+  import mmh3
+except ImportError:
+  mmh3 = None
+
+
+ITERATIONS = 100000
+BUCKETING_KEYS = {
+  'short key (14 bytes)': 'test_user32222',
+  'UUID key (41 bytes)': '2b3f3e9a-4c1d-4f8e-9b6a-0d1e2f3a4b5c111127',
+  'long key (200 bytes)': 'x' * 195 + '32222',
+}
+
+
+def time_hash(hash_method, bucketing_key):
+  total_time = timeit.timeit(lambda: hash_method(bucketing_key, bucketer.HASH_SEED), number=ITERATIONS)
+  return total_time / ITERATIONS * 1e6
+
+
+def run_hash_benchmarks():
+  table_data = []
+  for key_name, bucketing_key in sorted(BUCKETING_KEYS.items()):
+    row = [key_name, time_hash(pymmh3.hash, bucketing_key)]
+    if mmh3:
+      row.append(time_hash(mmh3.hash, bucketing_key))
+    table_data.append(row)
+
+  table_headers = ['Bucketing Key', 'pymmh3 (us/hash)']
+  if mmh3:
+    table_headers.append('mmh3 (us/hash)')
+
+  print(tabulate(table_data, headers=table_headers, floatfmt='.3f'))
+
+
+if __name__ == '__main__':
+  run_hash_benchmarks()
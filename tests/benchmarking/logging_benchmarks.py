@@ -0,0 +1,77 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Compares per call cost of decisions with logging disabled (NoOpLogger) and enabled at DEBUG level.
+
+Run from the repository root: PYTHONPATH=. python tests/benchmarking/logging_benchmarks.py
+"""
+
+from __future__ import print_function
+
+import json
+import logging
+import timeit
+from tabulate import tabulate
+
+from optimizely import logger
+from optimizely import optimizely
+from tests import base
+
+
+ITERATIONS = 10000
+REPEAT = 5
+SCENARIOS = [
+  ('Audience IDs', 'config_dict', 'test_experiment', {'test_attribute': 'test_value_1'}),
+  ('Mutex group', 'config_dict', 'group_exp_1', {}),
+  ('Typed audience conditions', 'config_dict_with_typed_audiences', 'audience_combinations_experiment',
+   {'house': 'Gryffindor', 'lasers': 45.5}),
+]
+
+
+def get_config_dicts():
+  test_case = base.BaseTest('setUp')
+  test_case.setUp()
+  return test_case
+
+
+def create_optimizely_object(datafile, log_level):
+  if log_level is None:
+    return optimizely.Optimizely(datafile)
+
+  debug_logger = logger.reset_logger('optimizely.benchmark', level=log_level, handler=logging.NullHandler())
+  return optimizely.Optimizely(datafile, logger=debug_logger)
+
+
+def time_get_variation(optimizely_obj, experiment_key, attributes):
+  total_time = min(timeit.repeat(lambda: optimizely_obj.get_variation(experiment_key, 'test_user', attributes),
+                                 number=ITERATIONS, repeat=REPEAT))
+  return total_time / ITERATIONS * 1e6
+
+
+def run_logging_benchmarks():
+  config_dicts = get_config_dicts()
+  table_data = []
+  for scenario_name, config_dict_name, experiment_key, attributes in SCENARIOS:
+    datafile = json.dumps(getattr(config_dicts, config_dict_name))
+    row = [scenario_name]
+    for log_level in [None, logging.DEBUG]:
+      optimizely_obj = create_optimizely_object(datafile, log_level)
+      row.append(time_get_variation(optimizely_obj, experiment_key, attributes))
+    table_data.append(row)
+
+  table_headers = ['get_variation', 'Logging disabled (us/call)', 'DEBUG logging (us/call)']
+  print(tabulate(table_data, headers=table_headers, floatfmt='.2f'))
+
+
+if __name__ == '__main__':
+  run_logging_benchmarks()
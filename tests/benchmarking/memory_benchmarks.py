@@ -0,0 +1,125 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Reports memory held by a ProjectConfig built from generated datafiles of increasing size.
+
+Requires Python 3 for tracemalloc.
+Run from the repository root: PYTHONPATH=. python tests/benchmarking/memory_benchmarks.py
+"""
+
+from __future__ import print_function
+
+import gc
+import json
+import tracemalloc
+from tabulate import tabulate
+
+from optimizely import error_handler
+from optimizely import logger
+from optimizely import project_config
+
+
+EXPERIMENT_COUNTS = [100, 1000, 5000]
+VARIATIONS_PER_EXPERIMENT = 3
+VARIABLES_PER_FEATURE = 4
+
+
+def generate_datafile(experiment_count):
+  """ Generate datafile with the given number of feature experiments, each with its own feature and audience. """
+
+  experiments = []
+  feature_flags = []
+  audiences = []
+  for index in range(experiment_count):
+    experiment_id = str(100000 + index)
+    variable_ids = [str(500000 + index * VARIABLES_PER_FEATURE + offset) for offset in range(VARIABLES_PER_FEATURE)]
+    variations = [{
+      'id': '{}{}'.format(experiment_id, offset),
+      'key': 'variation_{}'.format(offset),
+      'featureEnabled': offset > 0,
+      'variables': [{'id': variable_id, 'value': str(offset)} for variable_id in variable_ids],
+    } for offset in range(VARIATIONS_PER_EXPERIMENT)]
+    experiments.append({
+      'id': experiment_id,
+      'key': 'experiment_{}'.format(index),
+      'status': 'Running',
+      'layerId': str(200000 + index),
+      'audienceIds': [str(300000 + index)],
+      'variations': variations,
+      'forcedVariations': {},
+      'trafficAllocation': [{
+        'entityId': variation['id'],
+        'endOfRange': (offset + 1) * 10000 // VARIATIONS_PER_EXPERIMENT
+      } for offset, variation in enumerate(variations)],
+    })
+    feature_flags.append({
+      'id': str(400000 + index),
+      'key': 'feature_{}'.format(index),
+      'experimentIds': [experiment_id],
+      'rolloutId': '',
+      'variables': [{
+        'id': variable_id,
+        'key': 'variable_{}'.format(offset),
+        'type': 'integer',
+        'defaultValue': '0'
+      } for offset, variable_id in enumerate(variable_ids)],
+    })
+    audiences.append({
+      'id': str(300000 + index),
+      'name': 'audience_{}'.format(index),
+      'conditions': json.dumps(['and', ['or', {
+        'name': 'attribute_{}'.format(index % 10), 'value': 'value', 'type': 'custom_attribute'
+      }]]),
+    })
+
+  return json.dumps({
+    'version': '4',
+    'accountId': '12001',
+    'projectId': '111001',
+    'revision': '1',
+    'experiments': experiments,
+    'featureFlags': feature_flags,
+    'audiences': audiences,
+    'attributes': [{'id': str(600000 + index), 'key': 'attribute_{}'.format(index)} for index in range(10)],
+    'events': [],
+    'groups': [],
+    'rollouts': [],
+  })
+
+
+def measure_config_memory(datafile):
+  """ Measure memory in bytes held by a ProjectConfig after it is built, excluding the datafile string itself. """
+
+  gc.collect()
+  tracemalloc.start()
+  config = project_config.ProjectConfig(datafile, logger.adapt_logger(logger.NoOpLogger()),
+                                        error_handler.NoOpErrorHandler())
+  gc.collect()
+  memory, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del config
+  return memory
+
+
+def run_memory_benchmarks():
+  table_data = []
+  for experiment_count in EXPERIMENT_COUNTS:
+    memory = measure_config_memory(generate_datafile(experiment_count))
+    table_data.append([experiment_count, memory / 1024.0 / 1024.0, memory / float(experiment_count) / 1024.0])
+
+  table_headers = ['Experiments', 'ProjectConfig (MiB)', 'Per experiment (KiB)']
+  print(tabulate(table_data, headers=table_headers, floatfmt='.2f'))
+
+
+if __name__ == '__main__':
+  run_memory_benchmarks()
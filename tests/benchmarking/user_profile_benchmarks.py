@@ -0,0 +1,118 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Compares deciding for many users against a user profile service offering only per user lookup and save
+with one offering lookup_many and save_many. Both keep profiles in memory behind a simulated round trip.
+
+Run from the repository root: PYTHONPATH=. python tests/benchmarking/user_profile_benchmarks.py
+"""
+
+from __future__ import print_function
+
+import json
+import time
+from tabulate import tabulate
+
+from optimizely import optimizely
+from optimizely import user_profile
+from tests import base
+
+
+ROUND_TRIP_TIME = 0.0002
+USER_COUNTS = [100, 1000, 5000]
+EXPERIMENT_KEY = 'test_experiment'
+ATTRIBUTES = {'test_attribute': 'test_value_1'}
+
+
+class RemoteBulkUserProfileService(user_profile.InMemoryUserProfileService):
+  """ In memory user profile service paying a round trip per call, as a networked store would. """
+
+  def __init__(self):
+    super(RemoteBulkUserProfileService, self).__init__()
+    self.round_trips = 0
+
+  def _round_trip(self):
+    self.round_trips += 1
+    time.sleep(ROUND_TRIP_TIME)
+
+  def lookup(self, user_id):
+    self._round_trip()
+    return super(RemoteBulkUserProfileService, self).lookup(user_id)
+
+  def lookup_many(self, user_ids):
+    self._round_trip()
+    return super(RemoteBulkUserProfileService, self).lookup_many(user_ids)
+
+  def save(self, user_profile):
+    self._round_trip()
+    super(RemoteBulkUserProfileService, self).save(user_profile)
+
+  def save_many(self, user_profiles):
+    self._round_trip()
+    super(RemoteBulkUserProfileService, self).save_many(user_profiles)
+
+
+class RemoteUserProfileService(user_profile.UserProfileService):
+  """ Same store only exposing the per user interface. """
+
+  def __init__(self):
+    self.store = RemoteBulkUserProfileService()
+
+  def lookup(self, user_id):
+    return self.store.lookup(user_id)
+
+  def save(self, user_profile):
+    self.store.save(user_profile)
+
+
+def time_decisions(datafile, user_profile_service, user_ids):
+  """ Decide for all users twice, first bucketing them and then from their stored decisions.
+
+  Returns:
+    Tuple of total time in milliseconds and number of round trips to the store.
+  """
+  optimizely_obj = optimizely.Optimizely(datafile, user_profile_service=user_profile_service)
+  project_config = optimizely_obj.config_manager.get_config()
+  experiment = project_config.get_experiment_from_key(EXPERIMENT_KEY)
+  user_attributes = dict((user_id, ATTRIBUTES) for user_id in user_ids)
+  decision_service = optimizely_obj.decision_service
+
+  start_time = time.time()
+  for _ in range(2):
+    decision_service.get_variation_for_users(project_config, experiment, user_ids, user_attributes)
+  total_time = (time.time() - start_time) * 1000
+
+  store = getattr(user_profile_service, 'store', user_profile_service)
+  return total_time, store.round_trips
+
+
+def run_user_profile_benchmarks():
+  base_test = base.BaseTest('setUp')
+  base_test.setUp()
+  datafile = json.dumps(base_test.config_dict)
+
+  table_data = []
+  for user_count in USER_COUNTS:
+    user_ids = ['user_{}'.format(index) for index in range(user_count)]
+    per_user_time, per_user_round_trips = time_decisions(datafile, RemoteUserProfileService(), user_ids)
+    bulk_time, bulk_round_trips = time_decisions(datafile, RemoteBulkUserProfileService(), user_ids)
+    table_data.append([user_count, per_user_time, per_user_round_trips, bulk_time, bulk_round_trips])
+
+  print('Simulated round trip time: {} ms'.format(ROUND_TRIP_TIME * 1000))
+  print(tabulate(table_data,
+                 headers=['Users', 'lookup/save (ms)', 'Round trips', 'lookup_many/save_many (ms)', 'Round trips'],
+                 floatfmt='.1f'))
+
+
+if __name__ == '__main__':
+  run_user_profile_benchmarks()
@@ -87,13 +87,15 @@ class AudienceTest(base.BaseTest):
     experiment = self.project_config.get_experiment_from_key('test_experiment')
 
     # attributes set to empty dict
-    with mock.patch('optimizely.helpers.condition.CustomAttributeConditionEvaluator') as custom_attr_eval:
+    with mock.patch('optimizely.helpers.condition.CustomAttributeConditionEvaluator') as custom_attr_eval, \
+            mock.patch.object(self.project_config, 'get_compiled_audience_conditions', return_value=None):
       audience.is_user_in_experiment(self.project_config, experiment, {}, self.mock_client_logger)
 
     self.assertEqual({}, custom_attr_eval.call_args[0][1])
 
     # attributes set to None
-    with mock.patch('optimizely.helpers.condition.CustomAttributeConditionEvaluator') as custom_attr_eval:
+    with mock.patch('optimizely.helpers.condition.CustomAttributeConditionEvaluator') as custom_attr_eval, \
+            mock.patch.object(self.project_config, 'get_compiled_audience_conditions', return_value=None):
       audience.is_user_in_experiment(self.project_config, experiment, None, self.mock_client_logger)
 
     self.assertEqual({}, custom_attr_eval.call_args[0][1])
@@ -113,12 +115,14 @@ class AudienceTest(base.BaseTest):
 
     user_attributes = {'test_attribute': 'test_value_1'}
     experiment = self.project_config.get_experiment_from_key('test_experiment')
-    with mock.patch('optimizely.helpers.condition_tree_evaluator.evaluate', return_value=None):
+    with mock.patch('optimizely.helpers.condition_tree_evaluator.evaluate', return_value=None), \
+            mock.patch.object(self.project_config, 'get_compiled_audience_conditions', return_value=None):
 
       self.assertStrictFalse(audience.is_user_in_experiment(
         self.project_config, experiment, user_attributes, self.mock_client_logger))
 
-    with mock.patch('optimizely.helpers.condition_tree_evaluator.evaluate', return_value=False):
+    with mock.patch('optimizely.helpers.condition_tree_evaluator.evaluate', return_value=False), \
+            mock.patch.object(self.project_config, 'get_compiled_audience_conditions', return_value=None):
 
       self.assertStrictFalse(audience.is_user_in_experiment(
         self.project_config, experiment, user_attributes, self.mock_client_logger))
@@ -0,0 +1,190 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import mock
+
+from optimizely import entities
+from optimizely import optimizely
+from optimizely.helpers import audience
+from optimizely.helpers import audience_compiler
+from optimizely.helpers import condition as condition_helper
+from optimizely.helpers import condition_tree_evaluator
+from tests import base
+
+
+CONDITION_VALUES = ['abc', '', True, False, 10, 10.5, -3, 2**53 + 1, float('inf'), float('nan'), None, [1], {'a': 1}]
+ATTRIBUTE_VALUES = ['abc', 'xabcx', '', True, False, 10, 10.0, 10.5, 11, -3, 2**53 + 1, float('inf'), float('nan'),
+                    None, [1], {'a': 1}]
+MATCH_TYPES = [None, 'exact', 'exists', 'gt', 'lt', 'substring', 'regex']
+
+
+class AudienceCompilerTest(base.BaseTest):
+
+  def setUp(self):
+    base.BaseTest.setUp(self)
+    self.mock_client_logger = mock.MagicMock()
+
+  def assert_same_as_interpreted(self, condition, attributes):
+    interpreted_logger = mock.MagicMock()
+    compiled_logger = mock.MagicMock()
+
+    expected = condition_helper.CustomAttributeConditionEvaluator([condition], attributes,
+                                                                  interpreted_logger).evaluate(0)
+    actual = audience_compiler.compile_leaf_condition(condition)(attributes, compiled_logger)
+
+    self.assertIs(expected, actual, 'Result mismatch for %s with %s.' % (condition, attributes))
+    self.assertEqual(interpreted_logger.mock_calls, compiled_logger.mock_calls)
+
+  def test_compile_leaf_condition__matches_interpreted_evaluation(self):
+    """ Test that compiled leaf conditions return the same results and log the same messages as
+    CustomAttributeConditionEvaluator for all combinations of match types, condition values and user values. """
+
+    for match_type in MATCH_TYPES:
+      for condition_value in CONDITION_VALUES:
+        condition = ['attr', condition_value, 'custom_attribute', match_type]
+        self.assert_same_as_interpreted(condition, {})
+        for attribute_value in ATTRIBUTE_VALUES:
+          self.assert_same_as_interpreted(condition, {'attr': attribute_value})
+          self.assert_same_as_interpreted(condition, {'other_attr': attribute_value})
+
+  def test_compile_leaf_condition__unknown_condition_type(self):
+    """ Test that compiled leaf condition of unknown type logs a warning and evaluates to None. """
+
+    self.assert_same_as_interpreted(['attr', 'abc', 'canonical', 'exact'], {'attr': 'abc'})
+    self.assert_same_as_interpreted(['attr', 'abc', None, 'exact'], {'attr': 'abc'})
+
+  def test_compile_condition_tree__matches_condition_tree_evaluator(self):
+    """ Test that compiled condition trees follow the three valued rules of condition_tree_evaluator. """
+
+    leaf_values = [True, False, None]
+    trees = [
+      0, ['and', 0, 1], ['or', 0, 1], ['not', 0], ['not'], ['and'], ['or'], [0, 1, 2],
+      ['and', ['or', 0, 1], ['not', 2]], ['or', ['and', 0, 1], ['and', 1, 2], ['not', ['or', 0, 2]]],
+      ['and', 0], ['or', 2], ['and', 0, 1, 2], ['or', 0, 1, 2]
+    ]
+
+    for tree in trees:
+      for first in leaf_values:
+        for second in leaf_values:
+          for third in leaf_values:
+            values = [first, second, third]
+            expected = condition_tree_evaluator.evaluate(tree, lambda index: values[index])
+            compiled = audience_compiler.compile_condition_tree(
+              tree, lambda index: lambda attributes, logger: values[index]
+            )
+            self.assertIs(expected, compiled({}, self.mock_client_logger), 'Mismatch for %s with %s.' % (tree, values))
+
+  def test_compile_condition_tree__raises_for_malformed_conditions(self):
+    """ Test that malformed conditions raise at compile time. """
+
+    with self.assertRaises(IndexError):
+      audience_compiler.compile_condition_tree(['and', []], lambda leaf: None)
+
+    audience_11154 = self.project_config.get_audience('11154')
+    audience_with_bad_index = entities.Audience('1', 'bad', audience_11154.conditions,
+                                                conditionStructure=['and', 5],
+                                                conditionList=audience_11154.conditionList)
+    with self.assertRaises(IndexError):
+      audience_compiler.compile_audience(audience_with_bad_index)
+
+    self.assertEqual({}, audience_compiler.compile_audiences({'1': audience_with_bad_index}))
+
+  def test_compile_audience__logs_evaluation(self):
+    """ Test that compiled audience logs start and result of its evaluation. """
+
+    audience_11154 = self.project_config.get_audience('11154')
+    compiled_audience = audience_compiler.compile_audience(audience_11154)
+    expected_condition_log = {
+      'name': 'test_attribute',
+      'value': 'test_value_1',
+      'type': 'custom_attribute',
+      'match': None
+    }
+
+    self.assertStrictTrue(compiled_audience({'test_attribute': 'test_value_1'}, self.mock_client_logger))
+    self.assertIsNone(compiled_audience({}, self.mock_client_logger))
+
+    self.mock_client_logger.assert_has_calls([
+      mock.call.debug('Starting to evaluate audience "11154" with conditions: ' + audience_11154.conditions + '.'),
+      mock.call.info('Audience "11154" evaluated to TRUE.'),
+      mock.call.debug('Starting to evaluate audience "11154" with conditions: ' + audience_11154.conditions + '.'),
+      mock.call.debug(('Audience condition {} evaluated to UNKNOWN because no value was passed for user attribute '
+                       '"test_attribute".').format(json.dumps(expected_condition_log))),
+      mock.call.info('Audience "11154" evaluated to UNKNOWN.'),
+    ])
+
+  def test_compile_audience_conditions__empty(self):
+    """ Test that nothing is compiled for missing or empty audience conditions. """
+
+    self.assertIsNone(audience_compiler.compile_audience_conditions(self.project_config, None, {}))
+    self.assertIsNone(audience_compiler.compile_audience_conditions(self.project_config, [], {}))
+
+  def test_compile_audience_conditions__interprets_audiences_not_compiled(self):
+    """ Test that audiences which are not compiled are evaluated by the interpreter at call time. """
+
+    compiled_conditions = audience_compiler.compile_audience_conditions(self.project_config,
+                                                                         ['or', '11154', '42'], {})
+    self.assertEqual('["or", "11154", "42"]', compiled_conditions.source_json)
+
+    with mock.patch('optimizely.helpers.audience.evaluate_audience', side_effect=[None, True]) as mock_evaluate:
+      self.assertStrictTrue(compiled_conditions.evaluate({'a': 1}, self.mock_client_logger))
+
+    mock_evaluate.assert_has_calls([
+      mock.call(self.project_config, '11154', {'a': 1}, self.mock_client_logger),
+      mock.call(self.project_config, '42', {'a': 1}, self.mock_client_logger),
+    ])
+
+  def test_project_config__compiles_audiences_and_experiments(self):
+    """ Test that audiences and experiment audience conditions are compiled on config load. """
+
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_typed_audiences))
+    project_config = opt_obj.config_manager.get_config()
+
+    self.assertEqual(set(project_config.audience_id_map.keys()), set(project_config.compiled_audience_map.keys()))
+
+    experiment = project_config.get_experiment_from_key('audience_combinations_experiment')
+    compiled_conditions = project_config.get_compiled_audience_conditions(experiment)
+    self.assertIs(experiment.audienceConditions, compiled_conditions.source)
+    self.assertEqual(json.dumps(experiment.audienceConditions), compiled_conditions.source_json)
+
+    # Compiled conditions are not used once experiment audience conditions are replaced
+    experiment.audienceConditions = ['or', '3468206642']
+    self.assertIsNone(project_config.get_compiled_audience_conditions(experiment))
+
+  def test_is_user_in_experiment__compiled_matches_interpreted(self):
+    """ Test that is_user_in_experiment gives the same results and logs with and without compiled conditions. """
+
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_typed_audiences))
+    project_config = opt_obj.config_manager.get_config()
+    attributes_list = [
+      None, {}, {'house': 'Gryffindor'}, {'house': 'Slytherin', 'lasers': 45.5}, {'lasers': 70},
+      {'should_do_it': True}, {'favorite_ice_cream': 'chocolate'}, {'house': 'Welcome to Slytherin!'},
+      {'lasers': float('inf'), 'house': 5}, {'should_do_it': 'true'}
+    ]
+
+    for experiment in project_config.experiment_id_map.values():
+      for attributes in attributes_list:
+        interpreted_logger = mock.MagicMock()
+        compiled_logger = mock.MagicMock()
+
+        with mock.patch.object(project_config, 'get_compiled_audience_conditions', return_value=None):
+          expected = audience.is_user_in_experiment(project_config, experiment, attributes, interpreted_logger)
+
+        with mock.patch('optimizely.helpers.condition_tree_evaluator.evaluate') as mock_tree_evaluate:
+          actual = audience.is_user_in_experiment(project_config, experiment, attributes, compiled_logger)
+
+        self.assertIs(expected, actual)
+        self.assertEqual(interpreted_logger.mock_calls, compiled_logger.mock_calls)
+        if experiment.getAudienceConditionsOrIds():
+          self.assertEqual(0, mock_tree_evaluate.call_count)
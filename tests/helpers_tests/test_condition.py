@@ -713,6 +713,33 @@ class ConditionDecoderTests(base.BaseTest):
     self.assertEqual(['and', ['or', ['or', 0]]], condition_structure)
     self.assertEqual([['test_attribute', 'test_value_1', 'custom_attribute', None]], condition_list)
 
+  def test_deserialize__same_as_loads(self):
+    """ Test that deserialize produces the same condition structure and list as loads
+    does for the JSON encoding of the conditions. """
+
+    typed_audience_conditions = [
+      audience['conditions'] for audience in self.config_dict_with_typed_audiences['typedAudiences']
+    ]
+    unusual_conditions = [
+      {'name': 'single_leaf', 'value': 1, 'type': 'custom_attribute', 'match': 'gt'},
+      ['not', {'name': 'nested', 'value': {'inner': {'value': 'x'}}, 'type': 'custom_attribute'}],
+      ['or', {'name': 'list_value', 'value': [{'a': 1}, 2], 'type': 'custom_attribute'}, 'unknown', 5, None],
+      [],
+      'and',
+    ]
+
+    for conditions in typed_audience_conditions + unusual_conditions:
+      self.assertEqual(condition_helper.loads(json.dumps(conditions)), condition_helper.deserialize(conditions))
+
+  def test_deserialize__does_not_modify_conditions(self):
+    """ Test that deserialize leaves the given conditions unchanged. """
+
+    conditions = ['and', {'name': 'nested', 'value': {'value': 'x'}, 'type': 'custom_attribute'}]
+
+    condition_helper.deserialize(conditions)
+
+    self.assertEqual(['and', {'name': 'nested', 'value': {'value': 'x'}, 'type': 'custom_attribute'}], conditions)
+
   def test_audience_condition_deserializer_defaults(self):
     """ Test that audience_condition_deserializer defaults to None."""
 
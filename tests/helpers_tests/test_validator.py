@@ -20,6 +20,8 @@ from optimizely import config_manager
 from optimizely import error_handler
 from optimizely import event_dispatcher
 from optimizely import logger
+from optimizely import lru_cache
+from optimizely import user_profile
 from optimizely.helpers import validator
 
 from tests import base
@@ -27,6 +29,29 @@ from tests import base
 
 class ValidatorTest(base.BaseTest):
 
+  def test_is_bulk_user_profile_service(self):
+    """ Test that only user profile services with lookup_many and save_many methods support bulk operations. """
+
+    self.assertTrue(validator.is_bulk_user_profile_service(user_profile.BulkUserProfileService()))
+    self.assertTrue(validator.is_bulk_user_profile_service(user_profile.InMemoryUserProfileService()))
+    self.assertFalse(validator.is_bulk_user_profile_service(user_profile.UserProfileService()))
+    self.assertFalse(validator.is_bulk_user_profile_service(None))
+
+  def test_is_cache_valid__returns_true(self):
+    """ Test that valid cache returns True. """
+
+    self.assertTrue(validator.is_cache_valid(lru_cache.LRUCache(10)))
+
+  def test_is_cache_valid__returns_false(self):
+    """ Test that cache without lookup, save and reset methods returns False. """
+
+    class CustomCache(object):
+      def lookup(self, key):
+        pass
+
+    self.assertFalse(validator.is_cache_valid(CustomCache()))
+    self.assertFalse(validator.is_cache_valid({}))
+
   def test_is_config_manager_valid__returns_true(self):
     """ Test that valid config_manager returns True for valid config manager implementation. """
 
@@ -54,6 +79,28 @@ class ValidatorTest(base.BaseTest):
       'invalid_key': 'invalid_value'
     })))
 
+  def test_is_datafile_valid__caches_result(self):
+    """ Test that identical datafiles are validated against the schema once. """
+
+    validator.datafile_validation_cache.reset()
+    valid_datafile = json.dumps(self.config_dict)
+    invalid_datafile = json.dumps({'invalid_key': 'invalid_value'})
+
+    with mock.patch('optimizely.helpers.validator._validate_datafile',
+                    wraps=validator._validate_datafile) as mock_validate_datafile:
+      for _ in range(3):
+        self.assertTrue(validator.is_datafile_valid(valid_datafile))
+        self.assertTrue(validator.is_datafile_valid(valid_datafile.encode('utf-8')))
+        self.assertFalse(validator.is_datafile_valid(invalid_datafile))
+
+    self.assertEqual([mock.call(valid_datafile), mock.call(invalid_datafile)], mock_validate_datafile.call_args_list)
+
+  def test_is_datafile_valid__not_a_string(self):
+    """ Test that datafile which is not a string or bytes is invalid. """
+
+    self.assertFalse(validator.is_datafile_valid(self.config_dict))
+    self.assertFalse(validator.is_datafile_valid(None))
+
   def test_is_event_dispatcher_valid__returns_true(self):
     """ Test that valid event_dispatcher returns True. """
 
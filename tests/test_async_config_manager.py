@@ -0,0 +1,126 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import mock
+import socket
+import sys
+import threading
+import unittest
+
+from optimizely import optimizely
+from optimizely.helpers import enums
+
+from . import base
+from .test_config_manager import _DatafileRequestHandler
+from .test_config_manager import _ThreadingHTTPServer
+
+async_config_manager = None
+if sys.version_info >= (3, 5):
+    try:
+        import asyncio
+        from optimizely.aio import config_manager as async_config_manager
+    except ImportError:
+        # aiohttp is not installed.
+        pass
+
+
+@unittest.skipIf(async_config_manager is None, 'Requires Python 3.5+ and aiohttp.')
+class AsyncPollingConfigManagerTest(base.BaseTest):
+
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _DatafileRequestHandler)
+        self.server.requests = []
+        self.server.datafile = json.dumps(self.config_dict_with_features)
+        self.server.etag = '"1"'
+        self.server_thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.url = 'http://127.0.0.1:{}/datafile.json'.format(self.server.server_address[1])
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _wait_for_config_update(self, project_config_manager):
+        """ Helper method to run the loop until config is updated. """
+        config_updated = self.loop.create_future()
+        project_config_manager.notification_center.add_notification_listener(
+            enums.NotificationTypes.OPTIMIZELY_CONFIG_UPDATE,
+            lambda: self.loop.call_soon_threadsafe(config_updated.set_result, None)
+        )
+        self.loop.run_until_complete(asyncio.wait_for(config_updated, 5))
+
+    def test_start__polls_from_loop(self):
+        """ Test that datafile is fetched by a task on the loop and config set from it. """
+        project_config_manager = async_config_manager.AsyncPollingConfigManager(url=self.url, loop=self.loop)
+        self.assertFalse(project_config_manager.is_running)
+
+        self._wait_for_config_update(project_config_manager)
+
+        self.assertTrue(project_config_manager.is_running)
+        self.assertEqual('1', project_config_manager.get_config().get_revision())
+        self.assertEqual('"1"', project_config_manager.etag)
+        self.assertIn('gzip', self.server.requests[0][1]['accept-encoding'])
+
+        self.loop.run_until_complete(project_config_manager.close())
+        self.assertFalse(project_config_manager.is_running)
+
+    def test_fetch_datafile__not_modified(self):
+        """ Test that datafile is not parsed again while its ETag is unchanged and polls share a connection. """
+        with mock.patch('optimizely.aio.config_manager.AsyncPollingConfigManager.start'):
+            project_config_manager = async_config_manager.AsyncPollingConfigManager(url=self.url, loop=self.loop)
+
+        self.loop.run_until_complete(project_config_manager.fetch_datafile())
+        config = project_config_manager.get_config()
+        self.assertEqual('1', config.get_revision())
+
+        with mock.patch('optimizely.config_manager.StaticConfigManager._set_config') as mock_set_config:
+            self.loop.run_until_complete(project_config_manager.fetch_datafile())
+        self.assertEqual(0, mock_set_config.call_count)
+        self.assertEqual('"1"', self.server.requests[1][1]['if-none-match'])
+        self.assertEqual(1, len(set(client_port for client_port, _ in self.server.requests)))
+
+        self.loop.run_until_complete(project_config_manager.close())
+
+    def test_fetch_datafile__connection_error(self):
+        """ Test that error is logged and config left unchanged if datafile can not be fetched. """
+        unused_socket = socket.socket()
+        unused_socket.bind(('127.0.0.1', 0))
+        unused_url = 'http://127.0.0.1:{}/datafile.json'.format(unused_socket.getsockname()[1])
+        unused_socket.close()
+        mock_logger = mock.Mock()
+        with mock.patch('optimizely.aio.config_manager.AsyncPollingConfigManager.start'):
+            project_config_manager = async_config_manager.AsyncPollingConfigManager(
+                url=unused_url, datafile=json.dumps(self.config_dict), logger=mock_logger, loop=self.loop
+            )
+
+        self.loop.run_until_complete(project_config_manager.fetch_datafile())
+        self.loop.run_until_complete(project_config_manager.close())
+
+        self.assertEqual('42', project_config_manager.get_config().get_revision())
+        self.assertTrue(mock_logger.error.call_args[0][0].startswith(
+            'Fetching datafile from {} failed. Error: '.format(unused_url)
+        ))
+
+    def test_optimizely(self):
+        """ Test that Optimizely can use the asyncio config manager. """
+        project_config_manager = async_config_manager.AsyncPollingConfigManager(url=self.url, loop=self.loop)
+        opt_obj = optimizely.Optimizely(config_manager=project_config_manager)
+        self._wait_for_config_update(project_config_manager)
+
+        self.assertEqual('control', opt_obj.get_variation('test_experiment', 'user_1'))
+        self.loop.run_until_complete(project_config_manager.close())
@@ -0,0 +1,117 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import mock
+import sys
+import threading
+import unittest
+
+from optimizely import event_builder
+from optimizely import optimizely
+
+from . import base
+from .test_event_dispatcher import _RecordingRequestHandler
+from .test_event_dispatcher import _ThreadingHTTPServer
+
+async_event_dispatcher = None
+if sys.version_info >= (3, 5):
+  try:
+    import asyncio
+    from optimizely.aio import event_dispatcher as async_event_dispatcher
+  except ImportError:
+    # aiohttp is not installed.
+    pass
+
+
+@unittest.skipIf(async_event_dispatcher is None, 'Requires Python 3.5+ and aiohttp.')
+class AsyncEventDispatcherTest(base.BaseTest):
+
+  def setUp(self):
+    base.BaseTest.setUp(self)
+    self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _RecordingRequestHandler)
+    self.server.requests = []
+    self.server.response_statuses = []
+    self.server_thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+    self.server_thread.daemon = True
+    self.server_thread.start()
+    self.url = 'http://127.0.0.1:{}/v1/events'.format(self.server.server_address[1])
+    self.loop = asyncio.new_event_loop()
+    self.dispatcher = async_event_dispatcher.AsyncEventDispatcher(loop=self.loop)
+
+  def tearDown(self):
+    self.loop.close()
+    self.server.shutdown()
+    self.server.server_close()
+
+  def test_dispatch_event__sends_queued_events_together(self):
+    """ Test that dispatch_event only queues events, which are then sent together from the loop. """
+
+    params = {'accountId': '111001', 'visitors': []}
+    for _ in range(3):
+      self.dispatcher.dispatch_event(
+        event_builder.Event(self.url, params, http_verb='POST', headers={'Content-Type': 'application/json'})
+      )
+    self.dispatcher.dispatch_event(event_builder.Event(self.url, {'a': '111001'}))
+    self.assertEqual([], self.server.requests)
+
+    self.loop.run_until_complete(self.dispatcher.close())
+
+    self.assertEqual(['GET', 'POST', 'POST', 'POST'], sorted(request[0] for request in self.server.requests))
+    self.assertIn(json.dumps(params), [request[2] for request in self.server.requests])
+
+  def test_dispatch_event__reuses_connection(self):
+    """ Test that events sent one after another reuse the kept alive connection. """
+
+    for _ in range(3):
+      self.dispatcher.dispatch_event(event_builder.Event(self.url, {'a': '111001'}))
+      self.loop.run_until_complete(asyncio.sleep(0.05))
+    self.loop.run_until_complete(self.dispatcher.close())
+
+    self.assertEqual(3, len(self.server.requests))
+    self.assertEqual(1, len(set(request[1] for request in self.server.requests)))
+
+  def test_dispatch_event__from_other_thread(self):
+    """ Test that events can be dispatched from threads other than the loop's. """
+
+    dispatch_thread = threading.Thread(target=self.dispatcher.dispatch_event,
+                                       args=(event_builder.Event(self.url, {'a': '111001'}),))
+    dispatch_thread.start()
+    dispatch_thread.join()
+    self.loop.run_until_complete(self.dispatcher.close())
+
+    self.assertEqual(1, len(self.server.requests))
+
+  def test_dispatch_event__logs_error(self):
+    """ Test that an error is logged when the event can not be dispatched. """
+
+    self.server.response_statuses = [500]
+    with mock.patch('logging.error') as mock_log_error:
+      self.dispatcher.dispatch_event(event_builder.Event(self.url, {'a': '111001'}))
+      self.loop.run_until_complete(self.dispatcher.close())
+
+    self.assertEqual(1, mock_log_error.call_count)
+    self.assertIn('Dispatch event failed. Error: ', mock_log_error.call_args[0][0])
+    self.assertIn('500', mock_log_error.call_args[0][0])
+
+  def test_activate(self):
+    """ Test that Optimizely sends the impression event through the asyncio event dispatcher. """
+
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), event_dispatcher=self.dispatcher)
+    with mock.patch('optimizely.event_builder.EventBuilder.EVENTS_URL', self.url):
+      self.assertEqual('control', opt_obj.activate('test_experiment', 'user_1'))
+    self.loop.run_until_complete(self.dispatcher.close())
+
+    self.assertEqual(1, len(self.server.requests))
+    self.assertEqual('POST', self.server.requests[0][0])
+    self.assertEqual(self.config_dict['accountId'], json.loads(self.server.requests[0][2])['account_id'])
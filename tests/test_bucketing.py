@@ -15,10 +15,13 @@ import json
 import mmh3
 import mock
 import random
+import six
+import unittest
 
 from optimizely import bucketer
 from optimizely import entities
 from optimizely import logger
+from optimizely import lru_cache
 from optimizely import optimizely
 from optimizely.lib import pymmh3
 
@@ -77,6 +80,40 @@ class BucketerTest(base.BaseTest):
       )
     mock_generate_bucket_value.assert_called_once_with('test_user111127')
 
+  def test_bucket__bucket_value_cache(self):
+    """ Test that bucket values are cached per bucketing ID and parent ID when a cache is provided. """
+
+    bucket_value_cache = lru_cache.LRUCache(10)
+    caching_bucketer = bucketer.Bucketer(bucket_value_cache)
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+
+    with mock.patch('optimizely.bucketer.Bucketer._generate_bucket_value',
+                    return_value=42) as mock_generate_bucket_value:
+      for _ in range(3):
+        self.assertEqual(entities.Variation('111128', 'control'),
+                         caching_bucketer.bucket(self.project_config, experiment, 'test_user', 'test_user'))
+
+    mock_generate_bucket_value.assert_called_once_with('test_user111127')
+    self.assertEqual(42, bucket_value_cache.lookup(('test_user', '111127')))
+    self.assertEqual(3, bucket_value_cache.hits)
+
+  def test_bucket__bucket_value_cache_reset_on_new_revision(self):
+    """ Test that the bucket value cache is reset when a config with another revision is used. """
+
+    bucket_value_cache = lru_cache.LRUCache(10)
+    caching_bucketer = bucketer.Bucketer(bucket_value_cache)
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+
+    with mock.patch('optimizely.bucketer.Bucketer._generate_bucket_value',
+                    return_value=42) as mock_generate_bucket_value:
+      caching_bucketer.bucket(self.project_config, experiment, 'test_user', 'test_user')
+      caching_bucketer.bucket(self.project_config, experiment, 'test_user', 'test_user')
+      self.project_config.revision = '43'
+      caching_bucketer.bucket(self.project_config, experiment, 'test_user', 'test_user')
+
+    self.assertEqual(2, mock_generate_bucket_value.call_count)
+    self.assertEqual(1, len(bucket_value_cache))
+
   def test_bucket__invalid_experiment(self):
     """ Test that bucket returns None for unknown experiment. """
 
@@ -167,6 +204,74 @@ class BucketerTest(base.BaseTest):
       random_value = str(random.random())
       self.assertEqual(mmh3.hash(random_value), pymmh3.hash(random_value))
 
+  def test_hash_values__all_tail_sizes_and_seeds(self):
+    """ Test that pymmh3 matches mmh3 for keys of every length modulo 4 and random seeds. """
+
+    for length in range(0, 66):
+      random_value = ''.join(chr(random.randint(32, 126)) for _ in range(length))
+      seed = random.randint(0, 0xFFFFFFFF)
+      self.assertEqual(mmh3.hash(random_value, seed), pymmh3.hash(random_value, seed))
+      self.assertEqual(mmh3.hash(random_value, bucketer.HASH_SEED), pymmh3.hash(random_value, bucketer.HASH_SEED))
+
+  def test_hash_values__unicode_and_bytes(self):
+    """ Test that pymmh3 matches mmh3 for non-ASCII text as well as bytes and bytearray keys. """
+
+    for i in range(200):
+      random_value = u''.join(six.unichr(random.randint(32, 0x2FFF)) for _ in range(random.randint(0, 40)))
+      encoded_value = random_value.encode('utf-8')
+      expected_hash = mmh3.hash(encoded_value, bucketer.HASH_SEED)
+
+      self.assertEqual(expected_hash, pymmh3.hash(random_value, bucketer.HASH_SEED))
+      self.assertEqual(expected_hash, pymmh3.hash(encoded_value, bucketer.HASH_SEED))
+      self.assertEqual(expected_hash, pymmh3.hash(bytearray(encoded_value), bucketer.HASH_SEED))
+
+  def _assert_bucket_many_matches_bucket(self, experiment_key):
+    experiment = self.project_config.get_experiment_from_key(experiment_key)
+    bucketing_ids = [str(random.random()) for _ in range(500)] + ['ppid1', 'ppid1', '']
+
+    expected_variation_ids = []
+    for bucketing_id in bucketing_ids:
+      variation = self.bucketer.bucket(self.project_config, experiment, bucketing_id, bucketing_id)
+      expected_variation_ids.append(variation.id if variation else None)
+
+    self.assertEqual(expected_variation_ids, self.bucketer.bucket_many(self.project_config, experiment, bucketing_ids))
+
+  def test_bucket_many__without_numpy(self):
+    """ Test that bucket_many matches bucket for every bucketing ID when NumPy is unavailable. """
+
+    with mock.patch('optimizely.bucketer.numpy', None):
+      self._assert_bucket_many_matches_bucket('test_experiment')
+      self._assert_bucket_many_matches_bucket('group_exp_1')
+      self._assert_bucket_many_matches_bucket('group_exp_2')
+
+  @unittest.skipIf(bucketer.numpy is None, 'NumPy is not installed.')
+  def test_bucket_many__with_numpy(self):
+    """ Test that bucket_many matches bucket for every bucketing ID when NumPy is available. """
+
+    self._assert_bucket_many_matches_bucket('test_experiment')
+    self._assert_bucket_many_matches_bucket('group_exp_1')
+    self._assert_bucket_many_matches_bucket('group_exp_2')
+
+  def test_generate_bucket_values(self):
+    """ Test that _generate_bucket_values is identical to _generate_bucket_value for every key. """
+
+    bucketing_keys = [str(random.random()) for _ in range(1000)]
+    expected_bucket_values = [self.bucketer._generate_bucket_value(key) for key in bucketing_keys]
+
+    with mock.patch('optimizely.bucketer.numpy', None):
+      self.assertEqual(expected_bucket_values, list(self.bucketer._generate_bucket_values(bucketing_keys)))
+
+    if bucketer.numpy is not None:
+      self.assertEqual(expected_bucket_values, list(self.bucketer._generate_bucket_values(bucketing_keys)))
+
+  def test_bucket_many__invalid_group(self):
+    """ Test that bucket_many returns None for every bucketing ID when group is unknown. """
+
+    experiment = self.project_config.get_experiment_from_key('group_exp_1')
+    experiment.groupId = 'invalid_group_id'
+
+    self.assertEqual([None, None], self.bucketer.bucket_many(self.project_config, experiment, ['a', 'b']))
+
 
 class BucketerWithLoggingTest(base.BaseTest):
   def setUp(self, *args, **kwargs):
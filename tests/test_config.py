@@ -19,6 +19,8 @@ from optimizely import error_handler
 from optimizely import exceptions
 from optimizely import logger
 from optimizely import optimizely
+from optimizely.project_config import ProjectConfig
+from optimizely.helpers import condition as condition_helper
 from optimizely.helpers import enums
 
 from . import base
@@ -807,6 +809,44 @@ class ConfigTest(base.BaseTest):
       json.loads(audience.conditions)
     )
 
+  def test_init__entities_are_compact(self):
+    """ Test that entities keep attributes in slots and compare equal by attribute values. """
+
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+
+    self.assertFalse(hasattr(experiment, '__dict__'))
+    self.assertEqual(entities.Variation('111128', 'control'), entities.Variation('111128', 'control'))
+    self.assertNotEqual(entities.Variation('111128', 'control'), entities.Variation('111129', 'control'))
+    self.assertEqual(entities.Experiment(**self.config_dict['experiments'][0]), experiment)
+
+    experiment_in_group = self.project_config.get_experiment_from_key('group_exp_1')
+    self.assertEqual('19228', experiment_in_group.groupId)
+    self.assertEqual('random', experiment_in_group.groupPolicy)
+
+  def test_init__not_warmed(self):
+    """ Test that config built without warming only builds derived structures when warmed. """
+
+    config = ProjectConfig(json.dumps(self.config_dict_with_typed_audiences), logger.NoOpLogger(), None, warm=False)
+    experiment = config.get_experiment_from_key('audience_combinations_experiment')
+    self.assertEqual({}, config.traffic_allocation_table_map)
+    self.assertIsNone(config.get_compiled_audience_conditions(experiment))
+    self.assertEqual(self.project_config._generate_traffic_allocation_table(experiment.trafficAllocation),
+                     config.get_traffic_allocation_table(experiment))
+
+    config.warm()
+    self.assertIn(experiment.id, config.traffic_allocation_table_map)
+    self.assertIsNotNone(config.get_compiled_audience_conditions(experiment))
+
+  def test_init__typed_audience_conditions_deserialized(self):
+    """ Test that conditions of all audiences are deserialized the same as decoding their JSON conditions would. """
+
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_typed_audiences))
+    config = opt_obj.config_manager.get_config()
+
+    for audience in config.audience_id_map.values():
+      self.assertEqual((audience.conditionStructure, audience.conditionList),
+                       condition_helper.loads(audience.conditions))
+
   def test_get_variation_from_key__valid_experiment_key(self):
     """ Test that variation is retrieved correctly when valid experiment key and variation key are provided. """
 
@@ -886,6 +926,46 @@ class ConfigTest(base.BaseTest):
 
     self.assertIsNone(self.project_config.get_group('42'))
 
+  def test_get_traffic_allocation_table__experiment(self):
+    """ Test that traffic allocation table for an experiment resolves variations. """
+
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+    self.assertEqual(
+      entities.TrafficAllocationTable(
+        (4000, 5000, 9000),
+        ('111128', '', '111129', None),
+        (entities.Variation('111128', 'control'), None, entities.Variation('111129', 'variation'), None)
+      ),
+      self.project_config.get_traffic_allocation_table(experiment)
+    )
+
+  def test_get_traffic_allocation_table__group(self):
+    """ Test that traffic allocation table for a group resolves experiments. """
+
+    group = self.project_config.get_group('19228')
+    self.assertEqual(
+      entities.TrafficAllocationTable(
+        (3000, 7500),
+        ('32222', '32223', None),
+        (self.project_config.get_experiment_from_id('32222'), self.project_config.get_experiment_from_id('32223'), None)
+      ),
+      self.project_config.get_traffic_allocation_table(group)
+    )
+
+  def test_get_traffic_allocation_table__unsorted_end_of_ranges(self):
+    """ Test that end of ranges in the table never decrease so that bisecting matches a linear walk. """
+
+    experiment = entities.Experiment('1', 'exp', 'Running', [], [], {}, [
+      {'entityId': '11', 'endOfRange': 5000},
+      {'entityId': '12', 'endOfRange': 2000},
+      {'entityId': '13', 'endOfRange': 10000},
+    ], '1')
+
+    self.assertEqual(
+      entities.TrafficAllocationTable((5000, 5000, 10000), ('11', '12', '13', None), (None, None, None, None)),
+      self.project_config.get_traffic_allocation_table(experiment)
+    )
+
   def test_get_feature_from_key__valid_feature_key(self):
     """ Test that a valid feature is returned given a valid feature key. """
     opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
@@ -13,7 +13,15 @@
 
 import json
 import mock
+import os
 import requests
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
 
 from optimizely import config_manager
 from optimizely import exceptions as optimizely_exceptions
@@ -62,7 +70,10 @@ class StaticConfigManagerTest(base.BaseTest):
         project_config_manager._set_config(test_datafile)
         mock_logger.debug.assert_called_with('Received new datafile and updated config. '
                                              'Old revision number: None. New revision number: 1.')
-        mock_notification_center.send_notifications.assert_called_once_with('OPTIMIZELY_CONFIG_UPDATE')
+        self.assertEqual([
+            mock.call(enums.NotificationTypes.OPTIMIZELY_CONFIG_BUILD, '1', mock.ANY, mock.ANY),
+            mock.call('OPTIMIZELY_CONFIG_UPDATE')
+        ], mock_notification_center.send_notifications.call_args_list)
 
     def test_set_config__twice(self):
         """ Test calling set_config twice with same content to ensure config is not updated. """
@@ -79,7 +90,7 @@ class StaticConfigManagerTest(base.BaseTest):
         mock_logger.debug.assert_called_with('Received new datafile and updated config. '
                                              'Old revision number: None. New revision number: 1.')
         self.assertEqual(1, mock_logger.debug.call_count)
-        mock_notification_center.send_notifications.assert_called_once_with('OPTIMIZELY_CONFIG_UPDATE')
+        mock_notification_center.send_notifications.assert_called_with('OPTIMIZELY_CONFIG_UPDATE')
 
         mock_logger.reset_mock()
         mock_notification_center.reset_mock()
@@ -89,6 +100,63 @@ class StaticConfigManagerTest(base.BaseTest):
         self.assertEqual(0, mock_logger.debug.call_count)
         self.assertEqual(0, mock_notification_center.call_count)
 
+    def test_set_config__warms_config_before_update(self):
+        """ Test that new config is warmed and build durations are sent before config is replaced. """
+        test_datafile = json.dumps(self.config_dict_with_features)
+        notification_center = mock.Mock()
+        with mock.patch('optimizely.config_manager.BaseConfigManager._validate_instantiation_options'), \
+                mock.patch('optimizely.project_config.ProjectConfig.warm') as mock_warm:
+            project_config_manager = config_manager.StaticConfigManager(datafile=test_datafile,
+                                                                        notification_center=notification_center)
+
+        mock_warm.assert_called_once_with()
+        self.assertEqual({}, project_config_manager.get_config().compiled_audience_conditions_map)
+        build_call, update_call = notification_center.send_notifications.call_args_list
+        notification_type, revision, parse_time, warm_time = build_call[0]
+        self.assertEqual(enums.NotificationTypes.OPTIMIZELY_CONFIG_BUILD, notification_type)
+        self.assertEqual('1', revision)
+        self.assertGreaterEqual(parse_time, 0)
+        self.assertGreaterEqual(warm_time, 0)
+        self.assertEqual(mock.call(enums.NotificationTypes.OPTIMIZELY_CONFIG_UPDATE), update_call)
+
+    def test_set_config__update_count(self):
+        """ Test that config_update_count is only incremented when config is replaced. """
+        test_datafile = json.dumps(self.config_dict_with_features)
+        project_config_manager = config_manager.StaticConfigManager(datafile=test_datafile)
+        self.assertEqual(1, project_config_manager.config_update_count)
+        initial_config = project_config_manager.get_config()
+
+        project_config_manager._set_config(test_datafile)
+        self.assertEqual(1, project_config_manager.config_update_count)
+
+        other_datafile = json.loads(test_datafile)
+        other_datafile['revision'] = '42'
+        project_config_manager._set_config(json.dumps(other_datafile))
+        self.assertEqual(2, project_config_manager.config_update_count)
+        self.assertEqual('42', project_config_manager.get_config().get_revision())
+        # Config obtained before the update remains at its revision.
+        self.assertEqual('1', initial_config.get_revision())
+
+    def test_set_config__same_datafile_skips_validation_and_parsing(self):
+        """ Test that set_config does not validate or parse a datafile identical to the current one. """
+        test_datafile = json.dumps(self.config_dict_with_features)
+        project_config_manager = config_manager.StaticConfigManager(datafile=test_datafile)
+        current_config = project_config_manager.get_config()
+
+        with mock.patch('optimizely.helpers.validator.is_datafile_valid') as mock_validate_datafile, \
+                mock.patch('optimizely.config_manager.StaticConfigManager._build_config') as mock_build_config:
+            project_config_manager._set_config(test_datafile)
+            project_config_manager._set_config(test_datafile.encode('utf-8'))
+
+        self.assertEqual(0, mock_validate_datafile.call_count)
+        self.assertEqual(0, mock_build_config.call_count)
+        self.assertIs(current_config, project_config_manager.get_config())
+
+        # Changed datafile is parsed
+        other_datafile = json.dumps(dict(self.config_dict_with_features, revision='2'))
+        project_config_manager._set_config(other_datafile)
+        self.assertEqual('2', project_config_manager.get_config().get_revision())
+
     def test_set_config__schema_validation(self):
         """ Test set_config calls or does not call schema validation based on skip_json_validation value. """
 
@@ -158,8 +226,49 @@ class StaticConfigManagerTest(base.BaseTest):
         # Assert that config is set.
         self.assertIsInstance(project_config_manager.get_config(), project_config.ProjectConfig)
 
+    def test_set_config__snapshot(self):
+        """ Test that config is saved to the snapshot and loaded from it by the next config manager. """
+        test_datafile = json.dumps(self.config_dict_with_features)
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir)
+        snapshot_path = os.path.join(snapshot_dir, 'config.snapshot')
+
+        project_config_manager = config_manager.StaticConfigManager(datafile=test_datafile,
+                                                                    snapshot_path=snapshot_path)
+        self.assertTrue(os.path.isfile(snapshot_path))
+
+        mock_logger = mock.Mock()
+        with mock.patch('optimizely.config_manager.StaticConfigManager._build_config') as mock_build_config:
+            snapshot_config_manager = config_manager.StaticConfigManager(datafile=test_datafile,
+                                                                         logger=mock_logger,
+                                                                         snapshot_path=snapshot_path)
+
+        self.assertEqual(0, mock_build_config.call_count)
+        snapshot_config = snapshot_config_manager.get_config()
+        self.assertIsInstance(snapshot_config, project_config.ProjectConfig)
+        self.assertIs(mock_logger, snapshot_config.logger)
+        self.assertEqual(project_config_manager.get_config().get_revision(), snapshot_config.get_revision())
+        self.assertEqual(sorted(project_config_manager.get_config().feature_key_map),
+                         sorted(snapshot_config.feature_key_map))
+
+    def test_set_config__snapshot_of_other_datafile(self):
+        """ Test that config is built from the datafile and snapshot replaced if snapshot is for another datafile. """
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir)
+        snapshot_path = os.path.join(snapshot_dir, 'config.snapshot')
+        config_manager.StaticConfigManager(datafile=json.dumps(self.config_dict), snapshot_path=snapshot_path)
+
+        test_datafile = json.dumps(self.config_dict_with_features)
+        project_config_manager = config_manager.StaticConfigManager(datafile=test_datafile,
+                                                                    snapshot_path=snapshot_path)
 
-@mock.patch('requests.get')
+        self.assertIn('test_feature_in_experiment', project_config_manager.get_config().feature_key_map)
+        with mock.patch('optimizely.config_manager.StaticConfigManager._build_config') as mock_build_config:
+            config_manager.StaticConfigManager(datafile=test_datafile, snapshot_path=snapshot_path)
+        self.assertEqual(0, mock_build_config.call_count)
+
+
+@mock.patch('requests.Session.get')
 class PollingConfigManagerTest(base.BaseTest):
     def test_init__no_sdk_key_no_url__fails(self, _):
         """ Test that initialization fails if there is no sdk_key or url provided. """
@@ -247,6 +356,13 @@ class PollingConfigManagerTest(base.BaseTest):
         project_config_manager.set_last_modified(test_response_headers)
         self.assertEqual(last_modified_time, project_config_manager.last_modified)
 
+    def test_set_etag(self, _):
+        """ Test that set_etag sets etag field based on header. """
+        with mock.patch('optimizely.config_manager.PollingConfigManager.fetch_datafile'):
+            project_config_manager = config_manager.PollingConfigManager(sdk_key='some_key')
+        project_config_manager.set_etag({'ETag': '"abc"'})
+        self.assertEqual('"abc"', project_config_manager.etag)
+
     def test_fetch_datafile(self, _):
         """ Test that fetch_datafile sets config and last_modified based on response. """
         with mock.patch('optimizely.config_manager.PollingConfigManager.fetch_datafile'):
@@ -260,14 +376,14 @@ class PollingConfigManagerTest(base.BaseTest):
         test_response.status_code = 200
         test_response.headers = test_headers
         test_response._content = test_datafile
-        with mock.patch('requests.get', return_value=test_response):
+        with mock.patch('requests.Session.get', return_value=test_response):
             project_config_manager.fetch_datafile()
 
         self.assertEqual(test_headers['Last-Modified'], project_config_manager.last_modified)
         self.assertIsInstance(project_config_manager.get_config(), project_config.ProjectConfig)
 
         # Call fetch_datafile again and assert that request to URL is with If-Modified-Since header.
-        with mock.patch('requests.get', return_value=test_response) as mock_requests:
+        with mock.patch('requests.Session.get', return_value=test_response) as mock_requests:
             project_config_manager.fetch_datafile()
 
         mock_requests.assert_called_once_with(expected_datafile_url,
@@ -276,9 +392,318 @@ class PollingConfigManagerTest(base.BaseTest):
         self.assertEqual(test_headers['Last-Modified'], project_config_manager.last_modified)
         self.assertIsInstance(project_config_manager.get_config(), project_config.ProjectConfig)
 
+    def test_init__snapshot(self, _):
+        """ Test that config is loaded from the snapshot before the first datafile is fetched. """
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir)
+        snapshot_path = os.path.join(snapshot_dir, 'config.snapshot')
+        with mock.patch('optimizely.config_manager.PollingConfigManager.fetch_datafile'):
+            config_manager.PollingConfigManager(sdk_key='some_key',
+                                                datafile=json.dumps(self.config_dict_with_features),
+                                                snapshot_path=snapshot_path)
+            project_config_manager = config_manager.PollingConfigManager(sdk_key='some_key',
+                                                                         snapshot_path=snapshot_path)
+
+        self.assertIsInstance(project_config_manager.get_config(), project_config.ProjectConfig)
+        self.assertEqual('1', project_config_manager.get_config().get_revision())
+
+    def test_init__snapshot_of_other_sdk_key(self, _):
+        """ Test that config is not loaded from a snapshot saved for another SDK key. """
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir)
+        snapshot_path = os.path.join(snapshot_dir, 'config.snapshot')
+        mock_logger = mock.Mock()
+
+        with mock.patch('optimizely.config_manager.PollingConfigManager.fetch_datafile'):
+            config_manager.PollingConfigManager(sdk_key='other_key',
+                                                datafile=json.dumps(self.config_dict_with_features),
+                                                snapshot_path=snapshot_path)
+            project_config_manager = config_manager.PollingConfigManager(sdk_key='some_key',
+                                                                         logger=mock_logger,
+                                                                         snapshot_path=snapshot_path)
+
+        self.assertIsNone(project_config_manager.get_config())
+        mock_logger.debug.assert_any_call(
+            'Ignoring config snapshot {} saved for a different datafile source.'.format(snapshot_path)
+        )
+
     def test_is_running(self, _):
         """ Test that polling thread is running after instance of PollingConfigManager is created. """
         with mock.patch('optimizely.config_manager.PollingConfigManager.fetch_datafile') as mock_fetch_datafile:
             project_config_manager = config_manager.PollingConfigManager(sdk_key='some_key')
             self.assertTrue(project_config_manager.is_running)
         mock_fetch_datafile.assert_called_with()
+
+
+class FileConfigManagerTest(base.BaseTest):
+
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        datafile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, datafile_dir)
+        self.file_path = os.path.join(datafile_dir, 'datafile.json')
+        self._write_datafile('1')
+
+    def _write_datafile(self, revision):
+        datafile = dict(self.config_dict_with_features)
+        datafile['revision'] = revision
+        # Datafile is replaced atomically the way a config distribution system would.
+        temp_path = self.file_path + '.tmp'
+        with open(temp_path, 'w') as datafile_file:
+            datafile_file.write(json.dumps(datafile))
+        os.rename(temp_path, self.file_path)
+
+    def test_init__invalid_file_path(self):
+        """ Test that initialization fails if file_path is not provided. """
+        self.assertRaisesRegexp(optimizely_exceptions.InvalidInputException,
+                                'Provided "file_path" is in an invalid format.',
+                                config_manager.FileConfigManager, None)
+
+    def test_check_file(self):
+        """ Test that config is set from the datafile and updated only when the file changes. """
+        with mock.patch('threading.Thread.start'):
+            project_config_manager = config_manager.FileConfigManager(self.file_path)
+        self.assertEqual('1', project_config_manager.get_config().get_revision())
+
+        with mock.patch('optimizely.config_manager.StaticConfigManager._set_config') as mock_set_config:
+            project_config_manager.check_file()
+        self.assertEqual(0, mock_set_config.call_count)
+
+        self._write_datafile('42')
+        project_config_manager.check_file()
+        self.assertEqual('42', project_config_manager.get_config().get_revision())
+        self.assertEqual(2, project_config_manager.config_update_count)
+
+    def test_check_file__missing_file(self):
+        """ Test that config is left unchanged and error logged if the datafile can not be read. """
+        mock_logger = mock.Mock()
+        with mock.patch('threading.Thread.start'):
+            project_config_manager = config_manager.FileConfigManager(self.file_path, logger=mock_logger)
+        config = project_config_manager.get_config()
+
+        os.remove(self.file_path)
+        project_config_manager.check_file()
+
+        self.assertIs(config, project_config_manager.get_config())
+        mock_logger.error.assert_called_once_with(mock.ANY)
+        self.assertTrue(mock_logger.error.call_args[0][0].startswith(
+            'Unable to read datafile from {}.'.format(self.file_path)
+        ))
+
+    def test_run__updates_on_file_change(self):
+        """ Test that watching thread picks up a changed datafile before the update interval elapses. """
+        project_config_manager = config_manager.FileConfigManager(self.file_path, update_interval=60)
+        self.addCleanup(project_config_manager.stop)
+        if project_config_manager._inotify_fd is None:
+            self.skipTest('inotify is not available.')
+
+        self.assertTrue(project_config_manager.is_running)
+        self._write_datafile('42')
+        for _ in range(200):
+            if project_config_manager.get_config().get_revision() == '42':
+                break
+            time.sleep(0.01)
+
+        self.assertEqual('42', project_config_manager.get_config().get_revision())
+
+    def test_wait_for_change__without_inotify(self):
+        """ Test that without inotify the datafile is checked after each update interval. """
+        with mock.patch('threading.Thread.start'), \
+                mock.patch('optimizely.config_manager._create_inotify_watch', return_value=None):
+            project_config_manager = config_manager.FileConfigManager(self.file_path, update_interval=5)
+
+        with mock.patch.object(project_config_manager._stop_event, 'wait') as mock_wait:
+            project_config_manager._wait_for_change()
+        mock_wait.assert_called_once_with(5)
+
+    def test_init__invalid_update_interval(self):
+        """ Test that initialization fails if update_interval is not a positive number. """
+        for update_interval in [0, -1, '5', True]:
+            self.assertRaisesRegexp(optimizely_exceptions.InvalidInputException,
+                                    'Invalid update_interval "{}" provided.'.format(update_interval),
+                                    config_manager.FileConfigManager, self.file_path, update_interval)
+
+    def test_stop(self):
+        """ Test that stop ends the watching thread without waiting for the update interval and closes the
+        inotify watch, and start watches the datafile again. """
+        project_config_manager = config_manager.FileConfigManager(self.file_path, update_interval=60)
+        inotify_fd = project_config_manager._inotify_fd
+        self.assertTrue(project_config_manager.is_running)
+
+        start_time = time.time()
+        project_config_manager.stop()
+        self.assertLess(time.time() - start_time, 30)
+        self.assertFalse(project_config_manager.is_running)
+        self.assertIsNone(project_config_manager._inotify_fd)
+        self.assertEqual('1', project_config_manager.get_config().get_revision())
+        if inotify_fd is not None:
+            self.assertRaises(OSError, os.fstat, inotify_fd)
+
+        project_config_manager.start()
+        self.assertTrue(project_config_manager.is_running)
+        project_config_manager.stop()
+        self.assertFalse(project_config_manager.is_running)
+
+
+class SnapshotConfigManagerTest(base.BaseTest):
+
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir)
+        self.snapshot_path = os.path.join(snapshot_dir, 'config.snapshot')
+
+    def _publish(self, revision):
+        datafile = dict(self.config_dict_with_features)
+        datafile['revision'] = revision
+        config_manager.StaticConfigManager(datafile=json.dumps(datafile), snapshot_path=self.snapshot_path)
+
+    def test_init__invalid_snapshot_path(self):
+        """ Test that initialization fails if snapshot_path is not provided. """
+        self.assertRaisesRegexp(optimizely_exceptions.InvalidInputException,
+                                'Provided "snapshot_path" is in an invalid format.',
+                                config_manager.SnapshotConfigManager, None)
+
+    def test_init__no_snapshot_published(self):
+        """ Test that config is not set until a snapshot is published. """
+        mock_logger = mock.Mock()
+        with mock.patch('threading.Thread.start'):
+            project_config_manager = config_manager.SnapshotConfigManager(self.snapshot_path, logger=mock_logger)
+
+        self.assertIsNone(project_config_manager.get_config())
+        self.assertEqual(0, mock_logger.error.call_count)
+        self.assertEqual(0, mock_logger.warning.call_count)
+
+    def test_check_snapshot(self):
+        """ Test that config is loaded from each newly published snapshot without building it from the datafile. """
+        self._publish('1')
+        mock_notification_center = mock.Mock()
+        with mock.patch('threading.Thread.start'), \
+                mock.patch('optimizely.config_manager.BaseConfigManager._validate_instantiation_options'), \
+                mock.patch('optimizely.project_config.ProjectConfig.__init__') as mock_config_init:
+            project_config_manager = config_manager.SnapshotConfigManager(
+                self.snapshot_path, notification_center=mock_notification_center
+            )
+
+            self.assertEqual('1', project_config_manager.get_config().get_revision())
+            self.assertIn('test_feature_in_experiment', project_config_manager.get_config().feature_key_map)
+
+            # Nothing is loaded again while the snapshot is unchanged.
+            with mock.patch('optimizely.config_snapshot.load_snapshot') as mock_load_snapshot:
+                project_config_manager.check_snapshot()
+            self.assertEqual(0, mock_load_snapshot.call_count)
+
+        self.assertEqual(0, mock_config_init.call_count)
+        self.assertEqual(1, project_config_manager.config_update_count)
+
+        self._publish('42')
+        project_config_manager.check_snapshot()
+        self.assertEqual('42', project_config_manager.get_config().get_revision())
+        self.assertEqual(2, project_config_manager.config_update_count)
+        self.assertEqual([mock.call('OPTIMIZELY_CONFIG_UPDATE')] * 2,
+                         mock_notification_center.send_notifications.call_args_list)
+
+    def test_is_running(self):
+        """ Test that polling thread is running after instance of SnapshotConfigManager is created. """
+        with mock.patch('optimizely.config_manager.SnapshotConfigManager.check_snapshot') as mock_check_snapshot:
+            project_config_manager = config_manager.SnapshotConfigManager(self.snapshot_path)
+            self.assertTrue(project_config_manager.is_running)
+
+        mock_check_snapshot.assert_called_with()
+
+    def test_stop(self):
+        """ Test that stop ends the polling thread, keeps the loaded config and start resumes polling. """
+        self._publish('1')
+        project_config_manager = config_manager.SnapshotConfigManager(self.snapshot_path, update_interval=60)
+        self.assertTrue(project_config_manager.is_running)
+
+        project_config_manager.stop()
+        self.assertFalse(project_config_manager.is_running)
+        self.assertEqual('1', project_config_manager.get_config().get_revision())
+
+        project_config_manager.start()
+        self.assertTrue(project_config_manager.is_running)
+        project_config_manager.stop()
+        self.assertFalse(project_config_manager.is_running)
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _DatafileRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """ Request handler which serves the datafile gzip compressed with an ETag and answers
+    conditional requests for the current ETag with 304. """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        # Header names are lowercased as Python 2 does so for received headers.
+        headers = dict((name.lower(), value) for name, value in self.headers.items())
+        self.server.requests.append((self.client_address[1], headers))
+        if self.headers.get('If-None-Match') == self.server.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.server.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        body = compressor.compress(self.server.datafile.encode('utf-8')) + compressor.flush()
+        self.send_response(200)
+        self.send_header('ETag', self.server.etag)
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PollingConfigManagerHTTPTest(base.BaseTest):
+
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _DatafileRequestHandler)
+        self.server.requests = []
+        self.server.datafile = json.dumps(self.config_dict_with_features)
+        self.server.etag = '"1"'
+        self.server_thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        url = 'http://127.0.0.1:{}/datafile.json'.format(self.server.server_address[1])
+        # Polling thread is not started so that only the test's requests reach the server.
+        with mock.patch('optimizely.config_manager.PollingConfigManager.start'):
+            self.project_config_manager = config_manager.PollingConfigManager(url=url)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fetch_datafile__etag_and_gzip(self):
+        """ Test that datafile is requested compressed, is not downloaded again while its ETag is unchanged
+        and that polls share a single connection. """
+        self.project_config_manager.fetch_datafile()
+        initial_config = self.project_config_manager.get_config()
+        self.assertEqual('1', initial_config.get_revision())
+        self.assertEqual('"1"', self.project_config_manager.etag)
+        self.assertIn('gzip', self.server.requests[0][1]['accept-encoding'])
+        self.assertNotIn('if-none-match', self.server.requests[0][1])
+
+        # Datafile is unchanged so server responds with 304 and config is left as is.
+        self.project_config_manager.fetch_datafile()
+        self.assertEqual('"1"', self.server.requests[1][1]['if-none-match'])
+        self.assertIs(initial_config, self.project_config_manager.get_config())
+
+        # Datafile is updated so server responds with new datafile and ETag.
+        updated_datafile = dict(self.config_dict_with_features)
+        updated_datafile['revision'] = '2'
+        self.server.datafile = json.dumps(updated_datafile)
+        self.server.etag = '"2"'
+        self.project_config_manager.fetch_datafile()
+        self.assertEqual('"1"', self.server.requests[2][1]['if-none-match'])
+        self.assertEqual('2', self.project_config_manager.get_config().get_revision())
+        self.assertEqual('"2"', self.project_config_manager.etag)
+
+        self.assertEqual(1, len(set(client_port for client_port, _ in self.server.requests)))
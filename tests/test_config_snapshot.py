@@ -0,0 +1,166 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import mock
+import os
+import shutil
+import tempfile
+
+from optimizely import config_snapshot
+from optimizely import error_handler
+from optimizely import project_config
+from optimizely.helpers import audience
+
+from . import base
+
+
+class ConfigSnapshotTest(base.BaseTest):
+
+  def setUp(self):
+    base.BaseTest.setUp(self, 'config_dict_with_typed_audiences')
+    self.datafile = json.dumps(self.config_dict_with_typed_audiences)
+    self.snapshot_dir = tempfile.mkdtemp()
+    self.snapshot_path = os.path.join(self.snapshot_dir, 'config.snapshot')
+    self.mock_logger = mock.MagicMock()
+
+  def tearDown(self):
+    shutil.rmtree(self.snapshot_dir)
+
+  def _save_snapshot(self):
+    self.assertTrue(config_snapshot.save_snapshot(self.snapshot_path, self.project_config, self.datafile,
+                                                  self.mock_logger))
+
+  def test_save_and_load_snapshot(self):
+    """ Test that config loaded from a snapshot matches the config it was saved from. """
+
+    self._save_snapshot()
+    custom_error_handler = error_handler.RaiseExceptionErrorHandler()
+    loaded_config = config_snapshot.load_snapshot(self.snapshot_path, self.datafile, self.mock_logger,
+                                                  custom_error_handler)
+
+    self.assertIsInstance(loaded_config, project_config.ProjectConfig)
+    self.assertIs(self.mock_logger, loaded_config.logger)
+    self.assertIs(custom_error_handler, loaded_config.error_handler)
+    self.assertEqual(self.project_config.get_revision(), loaded_config.get_revision())
+    self.assertEqual(sorted(self.project_config.experiment_key_map), sorted(loaded_config.experiment_key_map))
+    self.assertEqual(sorted(self.project_config.feature_key_map), sorted(loaded_config.feature_key_map))
+    self.assertEqual(self.project_config.audience_id_map['3468206642'].conditionStructure,
+                     loaded_config.audience_id_map['3468206642'].conditionStructure)
+    # Entities referenced from several maps are still the same objects
+    experiment = loaded_config.get_experiment_from_key('audience_combinations_experiment')
+    self.assertEqual(
+      self.project_config.traffic_allocation_table_map[experiment.id].end_of_ranges,
+      loaded_config.get_traffic_allocation_table(experiment).end_of_ranges
+    )
+    self.assertIs(experiment, loaded_config.get_experiment_from_id(experiment.id))
+
+    # Audience conditions are compiled again
+    self.assertEqual(sorted(self.project_config.compiled_audience_conditions_map),
+                     sorted(loaded_config.compiled_audience_conditions_map))
+    for attributes in [{'house': 'Gryffindor'}, {'lasers': 45.5}, {'should_do_it': True}, {}]:
+      self.assertEqual(
+        audience.is_user_in_experiment(self.project_config, self.project_config.get_experiment_from_key(
+          'audience_combinations_experiment'), attributes, self.mock_logger),
+        audience.is_user_in_experiment(loaded_config, experiment, attributes, self.mock_logger)
+      )
+
+  def test_save_snapshot__leaves_out_logger_and_error_handler(self):
+    """ Test that logger, error handler and compiled audience conditions are not part of the snapshot. """
+
+    state = self.project_config.__getstate__()
+
+    for attribute in project_config.UNPICKLABLE_ATTRIBUTES:
+      self.assertNotIn(attribute, state)
+    self.assertIn('experiment_key_map', state)
+
+  def test_save_snapshot__invalid_path(self):
+    """ Test that a warning is logged if the snapshot can not be saved. """
+
+    snapshot_path = os.path.join(self.snapshot_dir, 'missing_dir', 'config.snapshot')
+
+    self.assertFalse(config_snapshot.save_snapshot(snapshot_path, self.project_config, self.datafile,
+                                                   self.mock_logger))
+    self.assertEqual(1, self.mock_logger.warning.call_count)
+    self.assertFalse(os.path.exists(snapshot_path))
+
+  def test_load_snapshot__no_snapshot(self):
+    """ Test that None is returned if there is no snapshot file. """
+
+    self.assertIsNone(config_snapshot.load_snapshot(self.snapshot_path, self.datafile, self.mock_logger, None))
+    self.mock_logger.debug.assert_called_once_with('No config snapshot found at {}.'.format(self.snapshot_path))
+
+  def test_load_snapshot__different_datafile(self):
+    """ Test that snapshot saved for another datafile is not loaded, unless no datafile is provided. """
+
+    self._save_snapshot()
+    other_datafile = json.dumps(dict(self.config_dict_with_typed_audiences, revision='4'))
+
+    self.assertIsNone(config_snapshot.load_snapshot(self.snapshot_path, other_datafile, self.mock_logger, None))
+    self.mock_logger.debug.assert_called_with(
+      'Ignoring config snapshot {} saved for a different datafile.'.format(self.snapshot_path)
+    )
+    self.assertIsInstance(config_snapshot.load_snapshot(self.snapshot_path, None, self.mock_logger, None),
+                          project_config.ProjectConfig)
+
+  def test_load_snapshot__different_source(self):
+    """ Test that snapshot saved for another datafile source is not loaded, unless no source is provided. """
+
+    config_snapshot.save_snapshot(self.snapshot_path, self.project_config, self.datafile, self.mock_logger,
+                                  source='https://cdn.optimizely.com/datafiles/other_key.json')
+
+    self.assertIsNone(config_snapshot.load_snapshot(self.snapshot_path, None, self.mock_logger, None,
+                                                    source='https://cdn.optimizely.com/datafiles/some_key.json'))
+    self.mock_logger.debug.assert_called_with(
+      'Ignoring config snapshot {} saved for a different datafile source.'.format(self.snapshot_path)
+    )
+    self.assertIsInstance(config_snapshot.load_snapshot(
+      self.snapshot_path, None, self.mock_logger, None, source='https://cdn.optimizely.com/datafiles/other_key.json'
+    ), project_config.ProjectConfig)
+    self.assertIsInstance(config_snapshot.load_snapshot(self.snapshot_path, None, self.mock_logger, None),
+                          project_config.ProjectConfig)
+
+  def test_load_snapshot__different_project(self):
+    """ Test that snapshot saved for another project is not loaded. """
+
+    self._save_snapshot()
+
+    self.assertIsNone(config_snapshot.load_snapshot(self.snapshot_path, None, self.mock_logger, None,
+                                                    project_id='other_project'))
+    self.mock_logger.debug.assert_called_with(
+      'Ignoring config snapshot {} saved for a different project.'.format(self.snapshot_path)
+    )
+    self.assertIsInstance(config_snapshot.load_snapshot(self.snapshot_path, None, self.mock_logger, None,
+                                                        project_id=self.project_config.get_project_id()),
+                          project_config.ProjectConfig)
+
+  def test_load_snapshot__different_sdk_version(self):
+    """ Test that snapshot saved by another SDK version is not loaded. """
+
+    self._save_snapshot()
+
+    with mock.patch('optimizely.version.__version__', '0.0.1'):
+      self.assertIsNone(config_snapshot.load_snapshot(self.snapshot_path, self.datafile, self.mock_logger, None))
+
+    self.mock_logger.debug.assert_called_with(
+      'Ignoring config snapshot {} saved by a different SDK or Python version.'.format(self.snapshot_path)
+    )
+
+  def test_load_snapshot__corrupt_snapshot(self):
+    """ Test that a warning is logged and None returned if the snapshot can not be read. """
+
+    with open(self.snapshot_path, 'wb') as snapshot_file:
+      snapshot_file.write(b'not a snapshot')
+
+    self.assertIsNone(config_snapshot.load_snapshot(self.snapshot_path, self.datafile, self.mock_logger, None))
+    self.assertEqual(1, self.mock_logger.warning.call_count)
@@ -13,9 +13,11 @@
 
 import json
 import mock
+import unittest
 
 from optimizely import decision_service
 from optimizely import entities
+from optimizely import lru_cache
 from optimizely import optimizely
 from optimizely import user_profile
 from optimizely.helpers import enums
@@ -393,6 +395,181 @@ class DecisionServiceTest(base.BaseTest):
     mock_save.assert_called_once_with({'user_id': 'test_user',
                                        'experiment_bucket_map': {'111127': {'variation_id': '111129'}}})
 
+  def test_get_variations__looks_up_and_saves_user_profile_once(self):
+    """ Test that get_variations looks up the user profile once and saves all new decisions with a single save. """
+
+    experiments = [self.project_config.get_experiment_from_key('test_experiment'),
+                   self.project_config.get_experiment_from_key('group_exp_1')]
+    attributes = {'$opt_bucketing_id': 'test_bucketing_id'}
+    with mock.patch('optimizely.helpers.audience.is_user_in_experiment', return_value=True), \
+      mock.patch('optimizely.bucketer.Bucketer.bucket',
+                 side_effect=[entities.Variation('111129', 'variation'),
+                              entities.Variation('28901', 'group_exp_1_control')]) as mock_bucket, \
+      mock.patch('optimizely.decision_service.DecisionService._get_bucketing_id',
+                 wraps=self.decision_service._get_bucketing_id) as mock_get_bucketing_id, \
+      mock.patch('optimizely.user_profile.UserProfileService.lookup',
+                 return_value={'user_id': 'test_user', 'experiment_bucket_map': {}}) as mock_lookup, \
+      mock.patch('optimizely.user_profile.UserProfileService.save') as mock_save:
+      self.assertEqual(
+        [entities.Variation('111129', 'variation'), entities.Variation('28901', 'group_exp_1_control')],
+        self.decision_service.get_variations(self.project_config, experiments, 'test_user', attributes)
+      )
+
+    mock_get_bucketing_id.assert_called_once_with('test_user', attributes)
+    mock_bucket.assert_called_with(self.project_config, experiments[1], 'test_user', 'test_bucketing_id')
+    mock_lookup.assert_called_once_with('test_user')
+    mock_save.assert_called_once_with({'user_id': 'test_user',
+                                       'experiment_bucket_map': {'111127': {'variation_id': '111129'},
+                                                                 '32222': {'variation_id': '28901'}}})
+
+  def test_get_variations__stored_decisions__does_not_save_user_profile(self):
+    """ Test that get_variations does not save the user profile when all decisions were already stored in it. """
+
+    experiments = [self.project_config.get_experiment_from_key('test_experiment')]
+    with mock.patch('optimizely.bucketer.Bucketer.bucket') as mock_bucket, \
+      mock.patch('optimizely.user_profile.UserProfileService.lookup',
+                 return_value={'user_id': 'test_user',
+                               'experiment_bucket_map': {'111127': {'variation_id': '111128'}}}) as mock_lookup, \
+      mock.patch('optimizely.user_profile.UserProfileService.save') as mock_save:
+      self.assertEqual([entities.Variation('111128', 'control')],
+                       self.decision_service.get_variations(self.project_config, experiments, 'test_user', None))
+
+    mock_lookup.assert_called_once_with('test_user')
+    self.assertEqual(0, mock_bucket.call_count)
+    self.assertEqual(0, mock_save.call_count)
+
+  def test_get_variation_for_users__bulk_user_profile_service(self):
+    """ Test that get_variation_for_users looks up and saves all users' profiles with single bulk calls
+    and returns the same variations as get_variation. """
+
+    experiment = self.project_config.get_experiment_from_key('group_exp_1')
+    user_ids = ['test_user_{}'.format(index) for index in range(20)] + ['test_user_0']
+    expected_variations = [self.decision_service.get_variation(self.project_config, experiment, user_id, None,
+                                                               ignore_user_profile=True)
+                           for user_id in user_ids]
+
+    user_profile_service = user_profile.InMemoryUserProfileService()
+    user_profile_service.save({'user_id': 'test_user_1', 'experiment_bucket_map': {'32222': {'variation_id': '28902'}}})
+    self.decision_service.user_profile_service = user_profile_service
+    expected_variations[1] = self.project_config.get_variation_from_id('group_exp_1', '28902')
+    with mock.patch.object(user_profile_service, 'lookup_many',
+                           wraps=user_profile_service.lookup_many) as mock_lookup_many, \
+      mock.patch.object(user_profile_service, 'save_many', wraps=user_profile_service.save_many) as mock_save_many, \
+      mock.patch.object(user_profile_service, 'lookup') as mock_lookup, \
+      mock.patch.object(user_profile_service, 'save') as mock_save:
+      self.assertEqual(expected_variations, self.decision_service.get_variation_for_users(
+        self.project_config, experiment, user_ids
+      ))
+
+    mock_lookup_many.assert_called_once_with(user_ids[:-1])
+    self.assertEqual(1, mock_save_many.call_count)
+    self.assertEqual(0, mock_lookup.call_count)
+    self.assertEqual(0, mock_save.call_count)
+    for user_id, variation in zip(user_ids, expected_variations):
+      self.assertEqual(variation.id if variation else None,
+                       user_profile.UserProfile(**user_profile_service.lookup(user_id))
+                       .get_variation_for_experiment(experiment.id))
+
+  def test_get_variation_for_users__user_profile_service(self):
+    """ Test that get_variation_for_users looks up and saves each user's profile once
+    when the user profile service does not support bulk operations. """
+
+    experiment = self.project_config.get_experiment_from_key('group_exp_1')
+    variation = self.project_config.get_variation_from_id('group_exp_1', '28901')
+    with mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=variation) as mock_bucket, \
+      mock.patch('optimizely.user_profile.UserProfileService.lookup', side_effect=lambda user_id: {
+        'user_id': user_id, 'experiment_bucket_map': {}
+      }) as mock_lookup, \
+      mock.patch('optimizely.user_profile.UserProfileService.save') as mock_save:
+      self.assertEqual([variation] * 3, self.decision_service.get_variation_for_users(
+        self.project_config, experiment, ['test_user_1', 'test_user_2', 'test_user_1'],
+        {'test_user_1': {'test_attribute': 'a'}}
+      ))
+
+    # Repeated user gets the decision stored in its profile earlier in the call.
+    self.assertEqual(2, mock_bucket.call_count)
+
+    self.assertEqual([mock.call('test_user_1'), mock.call('test_user_2')], mock_lookup.call_args_list)
+    self.assertEqual(2, mock_save.call_count)
+
+  def test_get_variation_for_users__experiment_not_running(self):
+    """ Test that no profiles are looked up for an experiment that is not running. """
+
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+    self.decision_service.user_profile_service = mock.Mock()
+    with mock.patch('optimizely.helpers.experiment.is_experiment_running', return_value=False), \
+      mock.patch.object(self.decision_service, 'logger') as mock_decision_service_logging:
+      self.assertEqual([None, None], self.decision_service.get_variation_for_users(
+        self.project_config, experiment, ['test_user_1', 'test_user_2']
+      ))
+
+    mock_decision_service_logging.info.assert_called_once_with('Experiment "test_experiment" is not running.')
+    self.assertEqual([], self.decision_service.user_profile_service.mock_calls)
+
+  def test_get_variation_for_users__decision_cache(self):
+    """ Test that profiles are only looked up in bulk for users whose decision is not cached. """
+
+    experiment = self.project_config.get_experiment_from_key('group_exp_1')
+    variation = self.project_config.get_variation_from_id('group_exp_1', '28901')
+    self.decision_service.decision_cache = lru_cache.LRUCache(10)
+    self.decision_service.user_profile_service = user_profile.InMemoryUserProfileService()
+    with mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=variation):
+      self.decision_service.get_variation_for_users(self.project_config, experiment, ['test_user_1'])
+
+      with mock.patch.object(self.decision_service.user_profile_service, 'lookup_many',
+                             wraps=self.decision_service.user_profile_service.lookup_many) as mock_lookup_many:
+        self.assertEqual([variation] * 2, self.decision_service.get_variation_for_users(
+          self.project_config, experiment, ['test_user_1', 'test_user_2']
+        ))
+        mock_lookup_many.assert_called_once_with(['test_user_2'])
+        mock_lookup_many.reset_mock()
+
+        self.assertEqual([variation] * 2, self.decision_service.get_variation_for_users(
+          self.project_config, experiment, ['test_user_1', 'test_user_2']
+        ))
+        self.assertEqual(0, mock_lookup_many.call_count)
+
+  def test_get_variation_for_users__bulk_lookup_fails(self):
+    """ Test that exception is logged and users are decided without stored decisions when lookup_many fails. """
+
+    experiment = self.project_config.get_experiment_from_key('group_exp_1')
+    self.decision_service.user_profile_service = mock.Mock()
+    self.decision_service.user_profile_service.lookup_many.side_effect = Exception('Redis unavailable')
+    with mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=entities.Variation('28901', 'control')), \
+      mock.patch.object(self.decision_service, 'logger') as mock_decision_service_logging:
+      self.assertEqual([entities.Variation('28901', 'control')] * 2, self.decision_service.get_variation_for_users(
+        self.project_config, experiment, ['test_user_1', 'test_user_2']
+      ))
+
+    mock_decision_service_logging.exception.assert_called_once_with(
+      'Unable to retrieve user profiles for 2 users as lookup failed.'
+    )
+    self.assertEqual(0, self.decision_service.user_profile_service.lookup.call_count)
+    self.decision_service.user_profile_service.save_many.assert_called_once_with([
+      {'user_id': 'test_user_1', 'experiment_bucket_map': {'32222': {'variation_id': '28901'}}},
+      {'user_id': 'test_user_2', 'experiment_bucket_map': {'32222': {'variation_id': '28901'}}},
+    ])
+
+  def test_get_variation_for_users__bulk_lookup_invalid(self):
+    """ Test that warning is logged and users are decided without stored decisions when lookup_many
+    returns something other than a dict. """
+
+    experiment = self.project_config.get_experiment_from_key('group_exp_1')
+    self.decision_service.user_profile_service = mock.Mock()
+    self.decision_service.user_profile_service.lookup_many.return_value = None
+    with mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=entities.Variation('28901', 'control')), \
+      mock.patch.object(self.decision_service, 'logger') as mock_decision_service_logging:
+      self.assertEqual([entities.Variation('28901', 'control')] * 2, self.decision_service.get_variation_for_users(
+        self.project_config, experiment, ['test_user_1', 'test_user_2']
+      ))
+
+    mock_decision_service_logging.warning.assert_called_once_with('User profiles for 2 users have invalid format.')
+    self.assertEqual(0, self.decision_service.user_profile_service.lookup.call_count)
+    self.decision_service.user_profile_service.save_many.assert_called_once_with([
+      {'user_id': 'test_user_1', 'experiment_bucket_map': {'32222': {'variation_id': '28901'}}},
+      {'user_id': 'test_user_2', 'experiment_bucket_map': {'32222': {'variation_id': '28901'}}},
+    ])
+
   def test_get_variation__user_bucketed_for_new_experiment__user_profile_service_not_available(self):
     """ Test that get_variation buckets and returns variation if
     no forced variation and no user profile service available. """
@@ -562,6 +739,92 @@ class DecisionServiceTest(base.BaseTest):
     self.assertEqual(0, mock_lookup.call_count)
     self.assertEqual(0, mock_save.call_count)
 
+  def test_get_variation__decision_cache(self):
+    """ Test that repeated decisions for same user, attributes and experiment are served from the decision cache. """
+
+    self.decision_service.decision_cache = lru_cache.LRUCache(10)
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+    variation = entities.Variation('111129', 'variation')
+    attributes = {'test_attribute': 'test_value'}
+
+    with mock.patch('optimizely.helpers.audience.is_user_in_experiment', return_value=True), \
+      mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=variation) as mock_bucket:
+      for _ in range(3):
+        self.assertEqual(variation, self.decision_service.get_variation(
+          self.project_config, experiment, 'test_user', dict(attributes)
+        ))
+
+      # Different attribute value, attribute value type or user require a new decision
+      self.decision_service.get_variation(self.project_config, experiment, 'test_user', {'test_attribute': 'other'})
+      self.decision_service.get_variation(self.project_config, experiment, 'test_user', {'test_attribute': True})
+      self.decision_service.get_variation(self.project_config, experiment, 'test_user', {'test_attribute': 1})
+      self.decision_service.get_variation(self.project_config, experiment, 'other_user', attributes)
+
+    self.assertEqual(5, mock_bucket.call_count)
+    self.assertEqual(2, self.decision_service.decision_cache.hits)
+
+  def test_get_variation__decision_cache_stores_no_variation(self):
+    """ Test that a decision with no variation is cached as well. """
+
+    self.decision_service.decision_cache = lru_cache.LRUCache(10)
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+
+    with mock.patch('optimizely.helpers.audience.is_user_in_experiment', return_value=True), \
+      mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=None) as mock_bucket:
+      self.assertIsNone(self.decision_service.get_variation(self.project_config, experiment, 'test_user', None))
+      self.assertIsNone(self.decision_service.get_variation(self.project_config, experiment, 'test_user', {}))
+
+    self.assertEqual(1, mock_bucket.call_count)
+
+  def test_get_variation__decision_cache_skipped_for_unhashable_attributes(self):
+    """ Test that decisions are not cached when attribute values are not hashable. """
+
+    self.decision_service.decision_cache = lru_cache.LRUCache(10)
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+
+    with mock.patch('optimizely.helpers.audience.is_user_in_experiment', return_value=True), \
+      mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=None) as mock_bucket:
+      self.decision_service.get_variation(self.project_config, experiment, 'test_user', {'list': [1]})
+      self.decision_service.get_variation(self.project_config, experiment, 'test_user', {'list': [1]})
+
+    self.assertEqual(2, mock_bucket.call_count)
+    self.assertEqual(0, len(self.decision_service.decision_cache))
+
+  def test_get_variation__decision_cache_keyed_by_revision(self):
+    """ Test that decisions cached for one config revision are not used for another. """
+
+    self.decision_service.decision_cache = lru_cache.LRUCache(10)
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+
+    with mock.patch('optimizely.helpers.audience.is_user_in_experiment', return_value=True), \
+      mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=None) as mock_bucket:
+      self.decision_service.get_variation(self.project_config, experiment, 'test_user', None)
+      self.project_config.revision = '43'
+      self.decision_service.get_variation(self.project_config, experiment, 'test_user', None)
+
+    self.assertEqual(2, mock_bucket.call_count)
+
+  def test_set_forced_variation__resets_decision_cache(self):
+    """ Test that forcing a variation or removing a forced variation resets the decision cache. """
+
+    self.decision_service.decision_cache = lru_cache.LRUCache(10)
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+
+    with mock.patch('optimizely.bucketer.Bucketer.bucket', return_value=None):
+      self.assertIsNone(self.decision_service.get_variation(self.project_config, experiment, 'test_user', None))
+
+      self.assertTrue(self.decision_service.set_forced_variation(
+        self.project_config, 'test_experiment', 'test_user', 'variation'
+      ))
+      self.assertEqual(entities.Variation('111129', 'variation'), self.decision_service.get_variation(
+        self.project_config, experiment, 'test_user', None
+      ))
+
+      self.assertTrue(self.decision_service.set_forced_variation(
+        self.project_config, 'test_experiment', 'test_user', None
+      ))
+      self.assertIsNone(self.decision_service.get_variation(self.project_config, experiment, 'test_user', None))
+
 
 class FeatureFlagDecisionTests(base.BaseTest):
 
@@ -573,6 +836,22 @@ class FeatureFlagDecisionTests(base.BaseTest):
     self.mock_decision_logger = mock.patch.object(self.decision_service, 'logger')
     self.mock_config_logger = mock.patch.object(self.project_config, 'logger')
 
+  def test_get_variation_for_feature__decision_cache(self):
+    """ Test that repeated feature decisions for same user and attributes are served from the decision cache. """
+
+    self.decision_service.decision_cache = lru_cache.LRUCache(10)
+    feature = self.project_config.get_feature_from_key('test_feature_in_experiment')
+
+    with mock.patch('optimizely.decision_service.DecisionService._get_variation_for_feature',
+                    return_value=decision_service.Decision(None, None, enums.DecisionSources.ROLLOUT)) as mock_decision:
+      for _ in range(3):
+        self.assertEqual(
+          decision_service.Decision(None, None, enums.DecisionSources.ROLLOUT),
+          self.decision_service.get_variation_for_feature(self.project_config, feature, 'test_user', {'a': 'b'})
+        )
+
+    mock_decision.assert_called_once_with(self.project_config, feature, 'test_user', {'a': 'b'})
+
   def test_get_variation_for_rollout__returns_none_if_no_experiments(self):
     """ Test that get_variation_for_rollout returns None if there are no experiments (targeting rules). """
 
@@ -728,7 +1007,8 @@ class FeatureFlagDecisionTests(base.BaseTest):
                        self.decision_service.get_variation_for_feature(self.project_config, feature, 'test_user'))
 
     mock_decision.assert_called_once_with(
-      self.project_config, self.project_config.get_experiment_from_key('test_experiment'), 'test_user', None
+      self.project_config, self.project_config.get_experiment_from_key('test_experiment'), 'test_user', None,
+      user_profile_session=None
     )
 
     # Check log message
@@ -754,7 +1034,8 @@ class FeatureFlagDecisionTests(base.BaseTest):
       ))
 
     expected_rollout = self.project_config.get_rollout_from_id('211111')
-    mock_get_variation_for_rollout.assert_called_once_with(self.project_config, expected_rollout, 'test_user', None)
+    mock_get_variation_for_rollout.assert_called_once_with(self.project_config, expected_rollout, 'test_user', None,
+                                                           'test_user')
 
     # Assert no log messages were generated
     self.assertEqual(0, mock_decision_service_logging.debug.call_count)
@@ -808,9 +1089,57 @@ class FeatureFlagDecisionTests(base.BaseTest):
       self.project_config, self.project_config.get_group('19228'), 'test_user'
     )
     mock_decision.assert_called_once_with(
-      self.project_config, self.project_config.get_experiment_from_key('group_exp_1'), 'test_user', None
+      self.project_config, self.project_config.get_experiment_from_key('group_exp_1'), 'test_user', None,
+      user_profile_session=None
+    )
+
+  def test_get_variations_for_features__buckets_into_group_once(self):
+    """ Test that get_variations_for_features buckets the user into a mutex group once
+    and returns the same decisions as get_variation_for_feature. """
+
+    features = [
+      self.project_config.get_feature_from_key('test_feature_in_group'),
+      self.project_config.get_feature_from_key('test_feature_in_experiment'),
+      self.project_config.get_feature_from_key('test_feature_in_group'),
+      self.project_config.get_feature_from_key('test_feature_in_rollout'),
+    ]
+    attributes = {'test_attribute': 'a'}
+    expected_decisions = [
+      self.decision_service.get_variation_for_feature(self.project_config, feature, 'test_user', attributes)
+      for feature in features
+    ]
+
+    with mock.patch.object(self.decision_service, 'get_experiment_in_group',
+                           wraps=self.decision_service.get_experiment_in_group) as mock_get_experiment_in_group:
+      self.assertEqual(expected_decisions, self.decision_service.get_variations_for_features(
+        self.project_config, features, 'test_user', attributes
+      ))
+
+    mock_get_experiment_in_group.assert_called_once_with(
+      self.project_config, self.project_config.get_group('19228'), 'test_user'
+    )
+
+  def test_get_variations_for_features__looks_up_and_saves_user_profile_once(self):
+    """ Test that get_variations_for_features shares one lookup and one save of the user profile across features. """
+
+    self.decision_service.user_profile_service = mock.Mock()
+    self.decision_service.user_profile_service.lookup.return_value = {'user_id': 'test_user',
+                                                                       'experiment_bucket_map': {}}
+    features = list(self.project_config.feature_key_map.values())
+    decisions = self.decision_service.get_variations_for_features(
+      self.project_config, features, 'test_user', {'test_attribute': 'test_value'}
     )
 
+    self.decision_service.user_profile_service.lookup.assert_called_once_with('test_user')
+    self.decision_service.user_profile_service.save.assert_called_once_with({
+      'user_id': 'test_user',
+      'experiment_bucket_map': dict(
+        (decision.experiment.id, {'variation_id': decision.variation.id})
+        for decision in decisions if decision.source == enums.DecisionSources.FEATURE_TEST
+      )
+    })
+    self.assertEqual(2, len(self.decision_service.user_profile_service.save.call_args[0][0]['experiment_bucket_map']))
+
   def test_get_variation_for_feature__returns_none_for_user_not_in_group(self):
     """ Test that get_variation_for_feature returns None for
     user not in group and the feature is not part of a rollout. """
@@ -840,7 +1169,8 @@ class FeatureFlagDecisionTests(base.BaseTest):
                        self.decision_service.get_variation_for_feature(self.project_config, feature, 'test_user'))
 
     mock_decision.assert_called_once_with(
-      self.project_config, self.project_config.get_experiment_from_key('test_experiment'), 'test_user', None
+      self.project_config, self.project_config.get_experiment_from_key('test_experiment'), 'test_user', None,
+      user_profile_session=None
     )
 
   def test_get_variation_for_feature__returns_none_for_invalid_group_id(self):
@@ -899,3 +1229,78 @@ class FeatureFlagDecisionTests(base.BaseTest):
     mock_decision_service_logging.info.assert_called_once_with(
       'User with bucketing ID "test_user" is not in any experiments of group 19228.'
     )
+
+
+class UserProfileSessionTest(unittest.TestCase):
+
+  def setUp(self):
+    self.user_profile_service = mock.Mock()
+    self.user_profile_service.lookup.return_value = {'user_id': 'test_user',
+                                                     'experiment_bucket_map': {'111127': {'variation_id': '111128'}}}
+    self.mock_logger = mock.Mock()
+    self.session = decision_service.UserProfileSession(self.user_profile_service, 'test_user', self.mock_logger)
+
+  def test_bool(self):
+    """ Test that session is only truthy when there is a user profile service. """
+
+    self.assertTrue(self.session)
+    self.assertFalse(decision_service.UserProfileSession(None, 'test_user', self.mock_logger))
+
+  def test_lookup__only_once(self):
+    """ Test that profile is retrieved from the user profile service on first lookup only. """
+
+    self.assertEqual(0, self.user_profile_service.lookup.call_count)
+    expected_profile = user_profile.UserProfile('test_user', {'111127': {'variation_id': '111128'}})
+    self.assertEqual(expected_profile, self.session.lookup())
+    self.assertEqual(expected_profile, self.session.lookup())
+    self.user_profile_service.lookup.assert_called_once_with('test_user')
+
+  def test_lookup__fails(self):
+    """ Test that None is returned and lookup is not retried when it raises. """
+
+    self.user_profile_service.lookup.side_effect = Exception('Redis unavailable')
+    self.assertIsNone(self.session.lookup())
+    self.assertIsNone(self.session.lookup())
+
+    self.assertEqual(1, self.user_profile_service.lookup.call_count)
+    self.mock_logger.exception.assert_called_once_with(
+      'Unable to retrieve user profile for user "test_user" as lookup failed.'
+    )
+    self.mock_logger.warning.assert_called_once_with('User profile has invalid format.')
+
+  def test_save__only_with_new_decisions(self):
+    """ Test that profile is saved once with all new decisions and not at all without them. """
+
+    self.session.save_variation_for_experiment('111127', '111128')
+    self.session.save()
+    self.assertEqual(0, self.user_profile_service.save.call_count)
+
+    self.session.save_variation_for_experiment('111127', '111129')
+    self.session.save_variation_for_experiment('32222', '28901')
+    self.session.save()
+    self.session.save()
+
+    self.user_profile_service.save.assert_called_once_with({
+      'user_id': 'test_user',
+      'experiment_bucket_map': {'111127': {'variation_id': '111129'}, '32222': {'variation_id': '28901'}}
+    })
+
+  def test_save__invalid_profile(self):
+    """ Test that new decisions are saved to a new profile when the one looked up is invalid. """
+
+    self.user_profile_service.lookup.return_value = {'user_id': 'test_user'}
+    self.session.save_variation_for_experiment('111127', '111129')
+    self.session.save()
+
+    self.user_profile_service.save.assert_called_once_with({
+      'user_id': 'test_user', 'experiment_bucket_map': {'111127': {'variation_id': '111129'}}
+    })
+
+  def test_save__fails(self):
+    """ Test that exception is logged when the user profile service fails to save. """
+
+    self.user_profile_service.save.side_effect = Exception('Redis unavailable')
+    self.session.save_variation_for_experiment('32222', '28901')
+    self.session.save()
+
+    self.mock_logger.exception.assert_called_once_with('Unable to save user profile for user "test_user".')
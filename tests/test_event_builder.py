@@ -101,6 +101,61 @@ class EventBuilderTest(base.BaseTest):
                                 event_builder.EventBuilder.HTTP_VERB,
                                 event_builder.EventBuilder.HTTP_HEADERS)
 
+  def test_create_combined_impression_event(self):
+    """ Test that create_combined_impression_event creates Event object with a snapshot per experiment. """
+
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+    group_experiment = self.project_config.get_experiment_from_key('group_exp_1')
+    expected_params = {
+      'account_id': '12001',
+      'project_id': '111001',
+      'visitors': [{
+        'visitor_id': 'test_user',
+        'attributes': [],
+        'snapshots': [{
+          'decisions': [{
+            'variation_id': '111129',
+            'experiment_id': '111127',
+            'campaign_id': '111182'
+          }],
+          'events': [{
+            'timestamp': 42123,
+            'entity_id': '111182',
+            'uuid': 'a68cf1ad-0393-4e18-af87-efe8f01a7c9c',
+            'key': 'campaign_activated'
+          }]
+        }, {
+          'decisions': [{
+            'variation_id': '28901',
+            'experiment_id': '32222',
+            'campaign_id': group_experiment.layerId
+          }],
+          'events': [{
+            'timestamp': 42123,
+            'entity_id': group_experiment.layerId,
+            'uuid': 'a68cf1ad-0393-4e18-af87-efe8f01a7c9c',
+            'key': 'campaign_activated'
+          }]
+        }]
+      }],
+      'client_name': 'python-sdk',
+      'client_version': version.__version__,
+      'enrich_decisions': True,
+      'anonymize_ip': False,
+      'revision': '42'
+    }
+
+    with mock.patch('time.time', return_value=42.123), \
+         mock.patch('uuid.uuid4', return_value='a68cf1ad-0393-4e18-af87-efe8f01a7c9c'):
+      event_obj = self.event_builder.create_combined_impression_event(
+        self.project_config, [(experiment, '111129'), (group_experiment, '28901')], 'test_user', None
+      )
+    self._validate_event_object(event_obj,
+                                event_builder.EventBuilder.EVENTS_URL,
+                                expected_params,
+                                event_builder.EventBuilder.HTTP_VERB,
+                                event_builder.EventBuilder.HTTP_HEADERS)
+
   def test_create_impression_event__with_attributes(self):
     """ Test that create_impression_event creates Event object
     with right params when attributes are provided. """
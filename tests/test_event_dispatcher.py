@@ -13,8 +13,11 @@
 
 import mock
 import json
+import threading
 import unittest
 from requests import exceptions as request_exception
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
 
 from optimizely import event_builder
 from optimizely import event_dispatcher
@@ -79,3 +82,125 @@ class EventDispatcherTest(unittest.TestCase):
                                               headers={'Content-Type': 'application/json'},
                                               timeout=event_dispatcher.REQUEST_TIMEOUT)
     mock_log_error.assert_called_once_with('Dispatch event failed. Error: Failed Request')
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+  daemon_threads = True
+
+
+class _RecordingRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+  """ Request handler which keeps connections alive and records the client port and body of each request. """
+
+  protocol_version = 'HTTP/1.1'
+
+  def _respond(self):
+    content_length = int(self.headers.get('Content-Length') or 0)
+    body = self.rfile.read(content_length).decode('utf-8') if content_length else None
+    status = self.server.response_statuses.pop(0) if self.server.response_statuses else 204
+    self.server.requests.append((self.command, self.client_address[1], body))
+    self.send_response(status)
+    self.send_header('Content-Length', '0')
+    self.end_headers()
+
+  do_GET = _respond
+  do_POST = _respond
+
+  def log_message(self, *args):
+    pass
+
+
+class PooledEventDispatcherTest(unittest.TestCase):
+
+  def setUp(self):
+    self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _RecordingRequestHandler)
+    self.server.requests = []
+    self.server.response_statuses = []
+    self.server_thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+    self.server_thread.daemon = True
+    self.server_thread.start()
+    self.url = 'http://127.0.0.1:{}/v1/events'.format(self.server.server_address[1])
+    self.dispatcher = event_dispatcher.PooledEventDispatcher(backoff_factor=0)
+
+  def tearDown(self):
+    self.dispatcher.close()
+    self.server.shutdown()
+    self.server.server_close()
+
+  def test_dispatch_event__reuses_connection(self):
+    """ Test that consecutive events are sent over a single kept alive connection. """
+
+    params = {'accountId': '111001', 'visitors': []}
+    for _ in range(3):
+      self.dispatcher.dispatch_event(
+        event_builder.Event(self.url, params, http_verb='POST', headers={'Content-Type': 'application/json'})
+      )
+    self.dispatcher.dispatch_event(event_builder.Event(self.url, {'a': '111001'}))
+
+    self.assertEqual(['POST', 'POST', 'POST', 'GET'], [request[0] for request in self.server.requests])
+    self.assertEqual(json.dumps(params), self.server.requests[0][2])
+    self.assertEqual(1, len(set(request[1] for request in self.server.requests)))
+
+  def test_dispatch_event__shares_pool_across_threads(self):
+    """ Test that events can be dispatched from several threads sharing the dispatcher. """
+
+    def dispatch_events():
+      for _ in range(5):
+        self.dispatcher.dispatch_event(event_builder.Event(self.url, {'a': '111001'}))
+
+    threads = [threading.Thread(target=dispatch_events) for _ in range(4)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(20, len(self.server.requests))
+    self.assertTrue(len(set(request[1] for request in self.server.requests)) <= 4)
+
+  def test_dispatch_event__short_lived_threads(self):
+    """ Test that events dispatched from one short lived thread after another share a single connection. """
+
+    for _ in range(5):
+      thread = threading.Thread(target=self.dispatcher.dispatch_event,
+                                args=(event_builder.Event(self.url, {'a': '111001'}),))
+      thread.start()
+      thread.join()
+
+    self.assertEqual(5, len(self.server.requests))
+    self.assertEqual(1, len(set(request[1] for request in self.server.requests)))
+
+  def test_dispatch_event__retries_server_errors(self):
+    """ Test that GET events are retried when the server responds with an error status. """
+
+    self.server.response_statuses = [503, 503]
+    with mock.patch('logging.error') as mock_log_error:
+      self.dispatcher.dispatch_event(event_builder.Event(self.url, {'a': '111001'}))
+
+    self.assertEqual(3, len(self.server.requests))
+    mock_log_error.assert_not_called()
+
+  def test_dispatch_event__does_not_retry_post_on_server_errors(self):
+    """ Test that POST events are not sent again when the server responds with an error status,
+    as the server may already have counted them. """
+
+    self.server.response_statuses = [503]
+    with mock.patch('logging.error') as mock_log_error:
+      self.dispatcher.dispatch_event(event_builder.Event(self.url, {'accountId': '111001', 'visitors': []},
+                                                         http_verb='POST',
+                                                         headers={'Content-Type': 'application/json'}))
+
+    self.assertEqual(1, len(self.server.requests))
+    self.assertEqual(1, mock_log_error.call_count)
+    self.assertIn('Dispatch event failed. Error: 503 Server Error', mock_log_error.call_args[0][0])
+
+  def test_dispatch_event__logs_error_once_retries_are_exhausted(self):
+    """ Test that an error is logged when the event can not be dispatched after retries. """
+
+    dispatcher = event_dispatcher.PooledEventDispatcher(max_retries=1, backoff_factor=0)
+    self.server.response_statuses = [500, 500]
+    with mock.patch('logging.error') as mock_log_error:
+      dispatcher.dispatch_event(event_builder.Event(self.url, {'a': '111001'}))
+    dispatcher.close()
+
+    self.assertEqual(2, len(self.server.requests))
+    self.assertEqual(1, mock_log_error.call_count)
+    self.assertIn('Dispatch event failed. Error: 500 Server Error', mock_log_error.call_args[0][0])
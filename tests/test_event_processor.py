@@ -0,0 +1,238 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import mock
+import threading
+
+from optimizely import event_builder
+from optimizely import event_processor
+from optimizely import exceptions as optimizely_exceptions
+from optimizely import project_config
+
+from . import base
+
+
+class RecordingEventDispatcher(object):
+    """ Event dispatcher which records dispatched events and lets tests wait for them. """
+
+    def __init__(self):
+        self.events = []
+        self._condition = threading.Condition()
+
+    def dispatch_event(self, event):
+        with self._condition:
+            self.events.append(event)
+            self._condition.notify_all()
+
+    def wait_for_events(self, count, timeout=5):
+        with self._condition:
+            if len(self.events) < count:
+                self._condition.wait(timeout)
+            return len(self.events) >= count
+
+
+class BatchEventProcessorTest(base.BaseTest):
+
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        self.event_builder = event_builder.EventBuilder()
+        self.event_dispatcher = RecordingEventDispatcher()
+        self.event_processor = None
+
+    def tearDown(self):
+        if self.event_processor:
+            self.event_processor.close()
+
+    def _build_impression_event(self, user_id, config=None):
+        config = config or self.project_config
+        experiment = config.get_experiment_from_key('test_experiment')
+        return self.event_builder.create_impression_event(config, experiment, '111129', user_id, None)
+
+    def _build_conversion_event(self, user_id):
+        return self.event_builder.create_conversion_event(self.project_config, 'test_event', user_id, None, None)
+
+    def test_init__invalid_event_dispatcher_fails(self):
+        """ Test that initialization fails if event_dispatcher is invalid. """
+        class InvalidDispatcher(object):
+            pass
+        with self.assertRaisesRegexp(optimizely_exceptions.InvalidInputException,
+                                     'Provided "event_dispatcher" is in an invalid format.'):
+            event_processor.BatchEventProcessor(event_dispatcher=InvalidDispatcher(), start_on_init=False)
+
+    def test_init__invalid_options_default(self):
+        """ Test that invalid batch size, flush interval and queue capacity fall back to defaults. """
+        self.event_processor = event_processor.BatchEventProcessor(
+            self.event_dispatcher, batch_size=0, flush_interval='5', queue_capacity=True, start_on_init=False
+        )
+
+        self.assertEqual(10, self.event_processor.batch_size)
+        self.assertEqual(30, self.event_processor.flush_interval)
+        self.assertEqual(1000, self.event_processor.event_queue.maxsize)
+        self.assertFalse(self.event_processor.is_running)
+
+    def test_process__merges_visitors_when_batch_is_full(self):
+        """ Test that impressions and conversions of many users are dispatched in a single payload. """
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, batch_size=3,
+                                                                   flush_interval=60)
+        events = [
+            self._build_impression_event('user_1'),
+            self._build_conversion_event('user_2'),
+            self._build_impression_event('user_3'),
+        ]
+        for event in events:
+            self.event_processor.process(event)
+
+        self.assertTrue(self.event_dispatcher.wait_for_events(1))
+        self.assertEqual(1, len(self.event_dispatcher.events))
+
+        dispatched_event = self.event_dispatcher.events[0]
+        self.assertEqual('https://logx.optimizely.com/v1/events', dispatched_event.url)
+        self.assertEqual('POST', dispatched_event.http_verb)
+        self.assertEqual({'Content-Type': 'application/json'}, dispatched_event.headers)
+        self.assertEqual(['user_1', 'user_2', 'user_3'],
+                         [visitor['visitor_id'] for visitor in dispatched_event.params['visitors']])
+        self.assertEqual([event.params['visitors'][0] for event in events], dispatched_event.params['visitors'])
+        for param in ['account_id', 'project_id', 'revision', 'anonymize_ip', 'client_name', 'client_version']:
+            self.assertEqual(events[0].params[param], dispatched_event.params[param])
+
+        # Events handed to the processor are left untouched
+        self.assertEqual(1, len(events[0].params['visitors']))
+
+    def test_process__dispatches_after_flush_interval(self):
+        """ Test that queued events are dispatched once the flush interval passes. """
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, batch_size=100,
+                                                                   flush_interval=0.1)
+        self.event_processor.process(self._build_impression_event('user_1'))
+        self.event_processor.process(self._build_impression_event('user_2'))
+
+        self.assertTrue(self.event_dispatcher.wait_for_events(1))
+        self.assertEqual(2, len(self.event_dispatcher.events[0].params['visitors']))
+
+    def test_process__splits_batches_on_revision_change(self):
+        """ Test that events built from different revisions are not merged together. """
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, batch_size=100,
+                                                                   flush_interval=60)
+        other_project_config = project_config.ProjectConfig(
+            json.dumps(dict(self.config_dict, revision='43')), self.project_config.logger,
+            self.project_config.error_handler
+        )
+
+        self.event_processor.process(self._build_impression_event('user_1'))
+        self.event_processor.process(self._build_impression_event('user_2'))
+        self.event_processor.process(self._build_impression_event('user_3', other_project_config))
+        self.event_processor.close()
+
+        self.assertEqual(2, len(self.event_dispatcher.events))
+        self.assertEqual('42', self.event_dispatcher.events[0].params['revision'])
+        self.assertEqual(['user_1', 'user_2'],
+                         [visitor['visitor_id'] for visitor in self.event_dispatcher.events[0].params['visitors']])
+        self.assertEqual('43', self.event_dispatcher.events[1].params['revision'])
+        self.assertEqual(['user_3'],
+                         [visitor['visitor_id'] for visitor in self.event_dispatcher.events[1].params['visitors']])
+
+    def test_process__does_not_merge_get_events(self):
+        """ Test that events which are not v1 POST payloads are dispatched on their own. """
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, batch_size=100,
+                                                                   flush_interval=60)
+        get_event = event_builder.Event('https://www.optimizely.com', {'a': '111001'})
+
+        self.event_processor.process(get_event)
+        self.event_processor.process(get_event)
+        self.event_processor.close()
+
+        self.assertEqual([get_event, get_event], self.event_dispatcher.events)
+
+    def test_process__does_not_merge_into_event_without_visitors(self):
+        """ Test that a POST event without visitors is dispatched on its own and does not stop the worker thread. """
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, batch_size=100,
+                                                                   flush_interval=60)
+        impression_event = self._build_impression_event('user_1')
+        event_without_visitors = event_builder.Event(impression_event.url,
+                                                     dict((key, value) for key, value in impression_event.params.items()
+                                                          if key != 'visitors'),
+                                                     http_verb=impression_event.http_verb,
+                                                     headers=impression_event.headers)
+
+        self.event_processor.process(event_without_visitors)
+        self.event_processor.process(impression_event)
+        self.event_processor.flush()
+
+        self.assertTrue(self.event_dispatcher.wait_for_events(2))
+        self.assertEqual([event_without_visitors, impression_event], self.event_dispatcher.events)
+        self.assertTrue(self.event_processor.is_running)
+
+    def test_flush(self):
+        """ Test that flush dispatches queued events without waiting for the batch to fill up. """
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, batch_size=100,
+                                                                   flush_interval=60)
+        self.event_processor.process(self._build_impression_event('user_1'))
+        self.event_processor.flush()
+
+        self.assertTrue(self.event_dispatcher.wait_for_events(1))
+        self.assertTrue(self.event_processor.is_running)
+
+    def test_flush__not_running(self):
+        """ Test that flush does not queue anything when the worker thread is not running. """
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, queue_capacity=1)
+        self.event_processor.close()
+
+        self.event_processor.flush()
+        self.event_processor.flush()
+
+        self.assertEqual(0, self.event_processor.event_queue.qsize())
+
+    def test_close__dispatches_queued_events_and_stops(self):
+        """ Test that close dispatches queued events and stops the worker thread. """
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, batch_size=100,
+                                                                   flush_interval=60)
+        for user_id in ['user_1', 'user_2']:
+            self.event_processor.process(self._build_impression_event(user_id))
+
+        self.event_processor.close()
+
+        self.assertFalse(self.event_processor.is_running)
+        self.assertEqual(1, len(self.event_dispatcher.events))
+        self.assertEqual(2, len(self.event_dispatcher.events[0].params['visitors']))
+
+        # Events processed after close are dispatched right away
+        self.event_processor.process(self._build_impression_event('user_3'))
+        self.assertEqual(2, len(self.event_dispatcher.events))
+
+    def test_process__queue_full(self):
+        """ Test that events are dropped with a warning when the queue is full. """
+        mock_logger = mock.MagicMock()
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, logger=mock_logger,
+                                                                   queue_capacity=1, start_on_init=False)
+        with mock.patch.object(event_processor.BatchEventProcessor, 'is_running', new_callable=mock.PropertyMock,
+                               return_value=True):
+            self.event_processor.process(self._build_impression_event('user_1'))
+            self.event_processor.process(self._build_impression_event('user_2'))
+
+        self.assertEqual(1, self.event_processor.event_queue.qsize())
+        mock_logger.warning.assert_called_once_with(
+            'Event queue is full. Dropping event for URL https://logx.optimizely.com/v1/events.'
+        )
+
+    def test_dispatch__logs_dispatcher_errors(self):
+        """ Test that errors raised by the event dispatcher are logged and do not stop the worker thread. """
+        mock_logger = mock.MagicMock()
+        self.event_processor = event_processor.BatchEventProcessor(self.event_dispatcher, logger=mock_logger,
+                                                                   batch_size=1, flush_interval=60)
+
+        with mock.patch.object(self.event_dispatcher, 'dispatch_event', side_effect=Exception('Failed to send')):
+            self.event_processor.process(self._build_impression_event('user_1'))
+            self.event_processor.flush()
+            self.event_processor.close()
+
+        mock_logger.error.assert_called_once_with('Error dispatching event: Failed to send')
@@ -145,3 +145,72 @@ class GetLoggerTests(unittest.TestCase):
     logger_name = 'test-logger-{}'.format(uuid.uuid4())
     reset_logger = _logger.reset_logger(logger_name, level=logging.DEBUG)
     self.assertEqual(logging.DEBUG, reset_logger.level)
+
+
+class LazyLoggingTests(unittest.TestCase):
+
+  def test_is_enabled_for(self):
+    """Test that is_enabled_for reflects the level of standard python loggers."""
+    logger = logging.getLogger('test-logger-{}'.format(uuid.uuid4()))
+    logger.setLevel(logging.INFO)
+
+    self.assertFalse(_logger.is_enabled_for(logger, logging.DEBUG))
+    self.assertTrue(_logger.is_enabled_for(logger, logging.INFO))
+    self.assertTrue(_logger.is_enabled_for(logger, logging.ERROR))
+
+  def test_is_enabled_for__parent_level_changes(self):
+    """Test that is_enabled_for picks up level changes of parent loggers."""
+    parent_logger = logging.getLogger('test-logger-{}'.format(uuid.uuid4()))
+    parent_logger.setLevel(logging.WARNING)
+    child_logger = logging.getLogger(parent_logger.name + '.child')
+
+    self.assertFalse(_logger.is_enabled_for(child_logger, logging.INFO))
+
+    parent_logger.setLevel(logging.INFO)
+    self.assertTrue(_logger.is_enabled_for(child_logger, logging.INFO))
+
+  def test_is_enabled_for__logging_disable(self):
+    """Test that is_enabled_for respects the global logging.disable level."""
+    logger = logging.getLogger('test-logger-{}'.format(uuid.uuid4()))
+    logger.setLevel(logging.DEBUG)
+
+    self.assertTrue(_logger.is_enabled_for(logger, logging.INFO))
+    logging.disable(logging.INFO)
+    try:
+      self.assertFalse(_logger.is_enabled_for(logger, logging.INFO))
+    finally:
+      logging.disable(logging.NOTSET)
+    self.assertTrue(_logger.is_enabled_for(logger, logging.INFO))
+
+  def test_is_enabled_for__non_standard_logger(self):
+    """Test that is_enabled_for treats loggers which are not standard python loggers as always enabled."""
+    mock_logger = mock.MagicMock()
+
+    self.assertTrue(_logger.is_enabled_for(mock_logger, logging.DEBUG))
+    self.assertEqual([], mock_logger.mock_calls)
+
+  def test_log_debug_and_info__disabled(self):
+    """Test that nothing is formatted or logged when the level is disabled."""
+    logger = logging.getLogger('test-logger-{}'.format(uuid.uuid4()))
+    logger.setLevel(logging.WARNING)
+    unformattable = mock.MagicMock()
+    unformattable.__str__.side_effect = Exception('Should not be formatted.')
+
+    with mock.patch.object(logger, 'debug') as mock_debug, mock.patch.object(logger, 'info') as mock_info:
+      _logger.log_debug(logger, 'Debug %s.', unformattable)
+      _logger.log_info(logger, 'Info %s.', unformattable)
+
+    self.assertEqual(0, mock_debug.call_count)
+    self.assertEqual(0, mock_info.call_count)
+
+  def test_log_debug_and_info__enabled(self):
+    """Test that messages are formatted with args before being logged when the level is enabled."""
+    mock_logger = mock.MagicMock()
+
+    _logger.log_debug(mock_logger, 'User "%s" is in variation %s.', 'test_user', 'control')
+    _logger.log_info(mock_logger, 'Message with 100% literal percent.')
+
+    mock_logger.assert_has_calls([
+      mock.call.debug('User "test_user" is in variation control.'),
+      mock.call.info('Message with 100% literal percent.'),
+    ])
@@ -0,0 +1,113 @@
+# Copyright 2019, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import threading
+import unittest
+
+from optimizely import lru_cache
+
+
+class LRUCacheTest(unittest.TestCase):
+
+  def test_lookup__returns_saved_value_and_counts_hits_and_misses(self):
+    """ Test that lookup returns saved values and keeps track of hits and misses. """
+
+    cache = lru_cache.LRUCache(2)
+    self.assertIsNone(cache.lookup('a'))
+    self.assertEqual('default', cache.lookup('a', 'default'))
+
+    cache.save('a', 1)
+    self.assertEqual(1, cache.lookup('a'))
+    self.assertEqual(1, cache.hits)
+    self.assertEqual(2, cache.misses)
+
+  def test_save__evicts_least_recently_used(self):
+    """ Test that saving beyond capacity evicts the least recently used entry. """
+
+    cache = lru_cache.LRUCache(2)
+    cache.save('a', 1)
+    cache.save('b', 2)
+    # Mark "a" as recently used so that "b" is evicted.
+    cache.lookup('a')
+    cache.save('c', 3)
+
+    self.assertEqual(2, len(cache))
+    self.assertEqual(1, cache.lookup('a'))
+    self.assertIsNone(cache.lookup('b'))
+    self.assertEqual(3, cache.lookup('c'))
+
+  def test_save__overwrites_existing_key(self):
+    """ Test that saving an existing key replaces its value without evicting anything. """
+
+    cache = lru_cache.LRUCache(2)
+    cache.save('a', 1)
+    cache.save('b', 2)
+    cache.save('a', 3)
+
+    self.assertEqual(2, len(cache))
+    self.assertEqual(3, cache.lookup('a'))
+    self.assertEqual(2, cache.lookup('b'))
+
+  def test_save__non_positive_capacity_disables_cache(self):
+    """ Test that nothing is stored when capacity is not positive. """
+
+    cache = lru_cache.LRUCache(0)
+    cache.save('a', 1)
+
+    self.assertEqual(0, len(cache))
+    self.assertIsNone(cache.lookup('a'))
+
+  def test_lookup__expired_entry(self):
+    """ Test that entries older than the timeout are not returned. """
+
+    cache = lru_cache.LRUCache(2, timeout=10)
+    with mock.patch('time.time', return_value=100):
+      cache.save('a', 1)
+
+    with mock.patch('time.time', return_value=109):
+      self.assertEqual(1, cache.lookup('a'))
+
+    with mock.patch('time.time', return_value=110):
+      self.assertIsNone(cache.lookup('a'))
+
+    self.assertEqual(0, len(cache))
+
+  def test_reset(self):
+    """ Test that reset removes all entries. """
+
+    cache = lru_cache.LRUCache(2)
+    cache.save('a', 1)
+    cache.reset()
+
+    self.assertEqual(0, len(cache))
+    self.assertIsNone(cache.lookup('a'))
+
+  def test_save_and_lookup__from_many_threads(self):
+    """ Test that concurrent use never grows the cache beyond its capacity. """
+
+    cache = lru_cache.LRUCache(50)
+
+    def use_cache(thread_index):
+      for i in range(1000):
+        cache.save((thread_index, i), i)
+        cache.lookup((thread_index, i - 1))
+
+    threads = [threading.Thread(target=use_cache, args=(thread_index,)) for thread_index in range(8)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(50, len(cache))
+    self.assertEqual(8000, cache.hits + cache.misses)
@@ -11,7 +11,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gc
 import mock
+import threading
 import unittest
 
 from optimizely import notification_center
@@ -22,6 +24,10 @@ def on_activate_listener(*args):
     pass
 
 
+def on_config_build_listener(*args):
+    pass
+
+
 def on_config_update_listener(*args):
     pass
 
@@ -176,6 +182,8 @@ class NotificationCenterTest(unittest.TestCase):
 
         # Add listeners
         test_notification_center.add_notification_listener(enums.NotificationTypes.ACTIVATE, on_activate_listener)
+        test_notification_center.add_notification_listener(enums.NotificationTypes.OPTIMIZELY_CONFIG_BUILD,
+                                                           on_config_build_listener)
         test_notification_center.add_notification_listener(enums.NotificationTypes.OPTIMIZELY_CONFIG_UPDATE,
                                                            on_config_update_listener)
         test_notification_center.add_notification_listener(enums.NotificationTypes.DECISION, on_decision_listener)
@@ -206,6 +214,8 @@ class NotificationCenterTest(unittest.TestCase):
 
         # Add listeners
         test_notification_center.add_notification_listener(enums.NotificationTypes.ACTIVATE, on_activate_listener)
+        test_notification_center.add_notification_listener(enums.NotificationTypes.OPTIMIZELY_CONFIG_BUILD,
+                                                           on_config_build_listener)
         test_notification_center.add_notification_listener(enums.NotificationTypes.OPTIMIZELY_CONFIG_UPDATE,
                                                            on_config_update_listener)
         test_notification_center.add_notification_listener(enums.NotificationTypes.DECISION, on_decision_listener)
@@ -225,6 +235,25 @@ class NotificationCenterTest(unittest.TestCase):
         """ Helper method which sets the value of listener_called to True. Used to test sending of notifications."""
         self.listener_called = True
 
+    def test_has_listeners(self):
+        """ Test that has_listeners reflects listeners added and removed for each notification type. """
+
+        test_notification_center = notification_center.NotificationCenter()
+        self.assertFalse(test_notification_center.has_listeners(enums.NotificationTypes.DECISION))
+
+        listener_id = test_notification_center.add_notification_listener(enums.NotificationTypes.DECISION,
+                                                                          on_decision_listener)
+        self.assertTrue(test_notification_center.has_listeners(enums.NotificationTypes.DECISION))
+        self.assertFalse(test_notification_center.has_listeners(enums.NotificationTypes.TRACK))
+        self.assertFalse(test_notification_center.has_listeners('invalid_notification_type'))
+
+        test_notification_center.remove_notification_listener(listener_id)
+        self.assertFalse(test_notification_center.has_listeners(enums.NotificationTypes.DECISION))
+
+        test_notification_center.add_notification_listener(enums.NotificationTypes.DECISION, on_decision_listener)
+        test_notification_center.clear_notification_listeners(enums.NotificationTypes.DECISION)
+        self.assertFalse(test_notification_center.has_listeners(enums.NotificationTypes.DECISION))
+
     def test_send_notifications(self):
         """ Test that send_notifications dispatches notification to the callback(s). """
 
@@ -260,3 +289,205 @@ class NotificationCenterTest(unittest.TestCase):
         test_notification_center.send_notifications(enums.NotificationTypes.ACTIVATE)
         mock_logger.exception.assert_called_once_with(
             'Unknown problem when sending "{}" type notification.'.format(enums.NotificationTypes.ACTIVATE))
+
+    def test_get_listener_stats(self):
+        """ Test that calls made to each listener are counted and timed. """
+
+        test_notification_center = notification_center.NotificationCenter()
+        activate_listener_id = test_notification_center.add_notification_listener(enums.NotificationTypes.ACTIVATE,
+                                                                                   on_activate_listener)
+        track_listener_id = test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK,
+                                                                                on_track_listener)
+        self.assertIsNone(test_notification_center.get_listener_stats(activate_listener_id))
+
+        with mock.patch('time.time', side_effect=[10, 10.5, 20, 22]):
+            test_notification_center.send_notifications(enums.NotificationTypes.ACTIVATE)
+            test_notification_center.send_notifications(enums.NotificationTypes.ACTIVATE)
+
+        self.assertEqual({'call_count': 2, 'total_time': 2.5, 'max_time': 2},
+                         test_notification_center.get_listener_stats(activate_listener_id))
+        self.assertIsNone(test_notification_center.get_listener_stats(track_listener_id))
+
+
+class NotificationCenterAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.listener_released = threading.Event()
+        self.received_args = []
+
+    def blocking_listener(self, *args):
+        """ Helper listener which records its arguments once released. """
+        self.listener_released.wait(5)
+        self.received_args.append(args)
+
+    def test_init__invalid_options(self):
+        """ Test that invalid async mode options are replaced by defaults. """
+
+        mock_logger = mock.Mock()
+        test_notification_center = notification_center.NotificationCenter(
+            logger=mock_logger, async_mode=True, worker_count=0, queue_capacity='10', overflow_policy='invalid'
+        )
+        test_notification_center.close()
+
+        self.assertEqual(enums.NotificationCenter.DEFAULT_WORKER_COUNT, test_notification_center.worker_count)
+        self.assertEqual(enums.NotificationCenter.DEFAULT_QUEUE_CAPACITY,
+                         test_notification_center.notification_queue.maxsize)
+        self.assertEqual(enums.NotificationCenter.OVERFLOW_POLICY_DROP, test_notification_center.overflow_policy)
+        mock_logger.debug.assert_any_call('overflow_policy value invalid is invalid. Defaulting to drop.')
+
+    def test_send_notifications__does_not_wait_for_listeners(self):
+        """ Test that in async mode send_notifications returns before listeners are called and flush waits for them. """
+
+        test_notification_center = notification_center.NotificationCenter(async_mode=True)
+        self.assertTrue(test_notification_center.is_running)
+        test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK, self.blocking_listener)
+
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'event_key', 'user_1')
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'event_key', 'user_2')
+        self.assertEqual([], self.received_args)
+
+        self.listener_released.set()
+        test_notification_center.flush()
+        self.assertEqual([('event_key', 'user_1'), ('event_key', 'user_2')], self.received_args)
+
+        test_notification_center.close()
+        self.assertFalse(test_notification_center.is_running)
+
+    def test_send_notifications__drops_when_queue_is_full(self):
+        """ Test that with the drop policy notifications sent while the queue is full are dropped. """
+
+        mock_logger = mock.Mock()
+        test_notification_center = notification_center.NotificationCenter(logger=mock_logger, async_mode=True,
+                                                                           queue_capacity=1)
+        test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK, self.blocking_listener)
+
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_1')
+        # Wait for the worker to take the first notification off the queue.
+        while not test_notification_center.notification_queue.empty():
+            self.listener_released.wait(0.01)
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_2')
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_3')
+
+        self.listener_released.set()
+        test_notification_center.close()
+
+        self.assertEqual([('user_1',), ('user_2',)], self.received_args)
+        mock_logger.warning.assert_called_once_with('Notification queue is full. Dropping "{}" type notification.'
+                                                    .format(enums.NotificationTypes.TRACK))
+
+    def test_send_notifications__blocks_when_queue_is_full(self):
+        """ Test that with the block policy send_notifications waits for room in the queue. """
+
+        test_notification_center = notification_center.NotificationCenter(
+            async_mode=True, queue_capacity=1, overflow_policy=enums.NotificationCenter.OVERFLOW_POLICY_BLOCK
+        )
+        test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK, self.blocking_listener)
+
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_1')
+        while not test_notification_center.notification_queue.empty():
+            self.listener_released.wait(0.01)
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_2')
+
+        send_thread = threading.Thread(target=test_notification_center.send_notifications,
+                                       args=(enums.NotificationTypes.TRACK, 'user_3'))
+        send_thread.start()
+        send_thread.join(0.1)
+        self.assertTrue(send_thread.is_alive())
+
+        self.listener_released.set()
+        send_thread.join(5)
+        test_notification_center.close()
+
+        self.assertEqual([('user_1',), ('user_2',), ('user_3',)], self.received_args)
+
+    def test_close__sends_queued_notifications(self):
+        """ Test that close sends queued notifications with multiple workers and later ones are sent inline. """
+
+        test_notification_center = notification_center.NotificationCenter(async_mode=True, worker_count=3)
+        listener_id = test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK,
+                                                                          self.blocking_listener)
+        self.listener_released.set()
+
+        for index in range(10):
+            test_notification_center.send_notifications(enums.NotificationTypes.TRACK, index)
+        test_notification_center.close()
+
+        self.assertFalse(test_notification_center.is_running)
+        self.assertEqual(list(range(10)), sorted(args[0] for args in self.received_args))
+        self.assertEqual(10, test_notification_center.get_listener_stats(listener_id)['call_count'])
+
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 10)
+        self.assertEqual((10,), self.received_args[-1])
+
+    def test_close__timeout(self):
+        """ Test that an error is logged when listeners do not finish before the timeout. """
+
+        mock_logger = mock.Mock()
+        test_notification_center = notification_center.NotificationCenter(logger=mock_logger, async_mode=True)
+        test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK, self.blocking_listener)
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_1')
+
+        test_notification_center.close(timeout=0.05)
+        mock_logger.error.assert_called_once_with('Timeout exceeded while attempting to close for 0.05 seconds.')
+
+        self.listener_released.set()
+        test_notification_center.close()
+        self.assertFalse(test_notification_center.is_running)
+
+    def test_flush__timeout(self):
+        """ Test that flush stops waiting and logs an error when listeners do not finish before the timeout. """
+
+        mock_logger = mock.Mock()
+        test_notification_center = notification_center.NotificationCenter(logger=mock_logger, async_mode=True)
+        test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK, self.blocking_listener)
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_1')
+
+        test_notification_center.flush(timeout=0.05)
+        self.assertEqual([], self.received_args)
+        mock_logger.error.assert_called_once_with('Timeout exceeded while attempting to flush for 0.05 seconds.')
+
+        self.listener_released.set()
+        test_notification_center.flush()
+        self.assertEqual([('user_1',)], self.received_args)
+        test_notification_center.close()
+
+    def test_close__timeout_while_queue_is_full(self):
+        """ Test that close does not wait past the timeout for room in the queue for shutdown signals. """
+
+        mock_logger = mock.Mock()
+        test_notification_center = notification_center.NotificationCenter(
+            logger=mock_logger, async_mode=True, queue_capacity=1,
+            overflow_policy=enums.NotificationCenter.OVERFLOW_POLICY_BLOCK
+        )
+        test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK, self.blocking_listener)
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_1')
+        while not test_notification_center.notification_queue.empty():
+            self.listener_released.wait(0.01)
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_2')
+
+        close_thread = threading.Thread(target=test_notification_center.close, kwargs={'timeout': 0.05})
+        close_thread.start()
+        close_thread.join(1)
+        self.assertFalse(close_thread.is_alive())
+        mock_logger.error.assert_called_once_with('Timeout exceeded while attempting to close for 0.05 seconds.')
+
+        self.listener_released.set()
+        test_notification_center.close()
+        self.assertFalse(test_notification_center.is_running)
+        self.assertEqual([('user_1',), ('user_2',)], self.received_args)
+
+    def test_worker_threads_stop_once_garbage_collected(self):
+        """ Test that an async notification center which is not closed is garbage collected and its workers stop. """
+
+        test_notification_center = notification_center.NotificationCenter(async_mode=True, worker_count=2)
+        test_notification_center.add_notification_listener(enums.NotificationTypes.TRACK, on_track_listener)
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK, 'user_1')
+        test_notification_center.flush()
+        worker_threads = test_notification_center._worker_threads
+
+        del test_notification_center
+        gc.collect()
+
+        for worker_thread in worker_threads:
+            worker_thread.join(5)
+            self.assertFalse(worker_thread.is_alive())
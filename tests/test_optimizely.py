@@ -20,8 +20,12 @@ from optimizely import decision_service
 from optimizely import entities
 from optimizely import error_handler
 from optimizely import event_builder
+from optimizely import event_dispatcher
+from optimizely import event_processor
 from optimizely import exceptions
 from optimizely import logger
+from optimizely import lru_cache
+from optimizely import notification_center
 from optimizely import optimizely
 from optimizely import project_config
 from optimizely import version
@@ -129,6 +133,142 @@ class OptimizelyTest(base.BaseTest):
     mock_client_logger.exception.assert_called_once_with('Provided "event_dispatcher" is in an invalid format.')
     self.assertFalse(opt_obj.is_valid)
 
+  def test_init__invalid_bucket_value_cache__logs_error(self):
+    """ Test that invalid bucket_value_cache logs error on init. """
+
+    class InvalidCache(object):
+      pass
+
+    mock_client_logger = mock.MagicMock()
+    with mock.patch('optimizely.logger.reset_logger', return_value=mock_client_logger):
+      opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), bucket_value_cache=InvalidCache())
+
+    mock_client_logger.exception.assert_called_once_with('Provided "bucket_value_cache" is in an invalid format.')
+    self.assertFalse(opt_obj.is_valid)
+
+  def test_init__bucket_value_cache(self):
+    """ Test that provided bucket_value_cache is used by the bucketer. """
+
+    bucket_value_cache = lru_cache.LRUCache(10)
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), bucket_value_cache=bucket_value_cache)
+
+    self.assertIs(bucket_value_cache, opt_obj.decision_service.bucketer.bucket_value_cache)
+
+  def test_init__invalid_decision_cache__logs_error(self):
+    """ Test that invalid decision_cache logs error on init. """
+
+    class InvalidCache(object):
+      pass
+
+    mock_client_logger = mock.MagicMock()
+    with mock.patch('optimizely.logger.reset_logger', return_value=mock_client_logger):
+      opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), decision_cache=InvalidCache())
+
+    mock_client_logger.exception.assert_called_once_with('Provided "decision_cache" is in an invalid format.')
+    self.assertFalse(opt_obj.is_valid)
+
+  def test_init__invalid_event_processor__logs_error(self):
+    """ Test that invalid event_processor logs error on init. """
+
+    class InvalidEventProcessor(object):
+      pass
+
+    mock_client_logger = mock.MagicMock()
+    with mock.patch('optimizely.logger.reset_logger', return_value=mock_client_logger):
+      opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), event_processor=InvalidEventProcessor())
+
+    mock_client_logger.exception.assert_called_once_with('Provided "event_processor" is in an invalid format.')
+    self.assertFalse(opt_obj.is_valid)
+
+  def test_activate_and_track__event_processor(self):
+    """ Test that impression and conversion events are handed to the event processor instead of the dispatcher. """
+
+    mock_event_processor = mock.MagicMock(spec=event_processor.BatchEventProcessor)
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), event_processor=mock_event_processor)
+
+    with mock.patch('optimizely.decision_service.DecisionService.get_variation',
+                    return_value=self.project_config.get_variation_from_id('test_experiment', '111129')), \
+            mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event:
+      self.assertEqual('variation', opt_obj.activate('test_experiment', 'test_user'))
+      opt_obj.track('test_event', 'test_user')
+
+    self.assertEqual(0, mock_dispatch_event.call_count)
+    self.assertEqual(2, mock_event_processor.process.call_count)
+    impression_event = mock_event_processor.process.call_args_list[0][0][0]
+    conversion_event = mock_event_processor.process.call_args_list[1][0][0]
+    self.assertEqual('campaign_activated', impression_event.params['visitors'][0]['snapshots'][0]['events'][0]['key'])
+    self.assertEqual('test_event', conversion_event.params['visitors'][0]['snapshots'][0]['events'][0]['key'])
+
+  def test_activate__pooled_event_dispatcher(self):
+    """ Test that impression events are sent using the session of the pooled event dispatcher. """
+
+    pooled_event_dispatcher = event_dispatcher.PooledEventDispatcher()
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), event_dispatcher=pooled_event_dispatcher)
+    self.assertTrue(opt_obj.is_valid)
+
+    with mock.patch('optimizely.decision_service.DecisionService.get_variation',
+                    return_value=self.project_config.get_variation_from_id('test_experiment', '111129')), \
+            mock.patch('requests.Session.post') as mock_session_post:
+      self.assertEqual('variation', opt_obj.activate('test_experiment', 'test_user'))
+
+    self.assertEqual(1, mock_session_post.call_count)
+    self.assertEqual('https://logx.optimizely.com/v1/events', mock_session_post.call_args[0][0])
+    pooled_event_dispatcher.close()
+
+  def test_close__closes_event_processor(self):
+    """ Test that close dispatches events queued by the batch event processor. """
+
+    mock_dispatcher = mock.MagicMock()
+    batch_event_processor = event_processor.BatchEventProcessor(mock_dispatcher, batch_size=10, flush_interval=60)
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), event_processor=batch_event_processor)
+
+    with mock.patch('optimizely.decision_service.DecisionService.get_variation',
+                    return_value=self.project_config.get_variation_from_id('test_experiment', '111129')):
+      opt_obj.activate('test_experiment', 'test_user_1')
+      opt_obj.activate('test_experiment', 'test_user_2')
+
+    opt_obj.close()
+
+    self.assertFalse(batch_event_processor.is_running)
+    self.assertEqual(1, mock_dispatcher.dispatch_event.call_count)
+    dispatched_event = mock_dispatcher.dispatch_event.call_args[0][0]
+    self.assertEqual(['test_user_1', 'test_user_2'],
+                     [visitor['visitor_id'] for visitor in dispatched_event.params['visitors']])
+
+  def test_close__closes_notification_center(self):
+    """ Test that close sends notifications queued by an async notification center. """
+
+    async_notification_center = notification_center.NotificationCenter(async_mode=True)
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), notification_center=async_notification_center)
+    mock_listener = mock.Mock()
+    opt_obj.notification_center.add_notification_listener(enums.NotificationTypes.TRACK, mock_listener)
+
+    with mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event'):
+      opt_obj.track('test_event', 'test_user')
+    opt_obj.close()
+
+    self.assertFalse(async_notification_center.is_running)
+    self.assertEqual(1, mock_listener.call_count)
+
+  def test_is_feature_enabled__decision_cache(self):
+    """ Test that repeated is_feature_enabled calls reuse the cached decision but still send impressions. """
+
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features),
+                                    decision_cache=lru_cache.LRUCache(100))
+    project_config = opt_obj.config_manager.get_config()
+    mock_experiment = project_config.get_experiment_from_key('test_experiment')
+    mock_variation = project_config.get_variation_from_id('test_experiment', '111129')
+
+    with mock.patch('optimizely.decision_service.DecisionService._get_variation_for_feature',
+                    return_value=decision_service.Decision(mock_experiment, mock_variation,
+                                                           enums.DecisionSources.FEATURE_TEST)) as mock_decision, \
+            mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event:
+      for _ in range(3):
+        self.assertTrue(opt_obj.is_feature_enabled('test_feature_in_experiment', 'test_user'))
+
+    self.assertEqual(1, mock_decision.call_count)
+    self.assertEqual(3, mock_dispatch_event.call_count)
+
   def test_init__invalid_logger__logs_error(self):
     """ Test that invalid logger logs error on init. """
 
@@ -298,6 +438,67 @@ class OptimizelyTest(base.BaseTest):
     self._validate_event_object(mock_dispatch_event.call_args[0][0], 'https://logx.optimizely.com/v1/events',
                                 expected_params, 'POST', {'Content-Type': 'application/json'})
 
+  def test_activate_many(self):
+    """ Test that activate_many decides for all experiments at once and dispatches a single impression event. """
+
+    experiment = self.project_config.get_experiment_from_key('test_experiment')
+    group_experiment = self.project_config.get_experiment_from_key('group_exp_1')
+    variation = self.project_config.get_variation_from_id('test_experiment', '111129')
+    group_variation = self.project_config.get_variation_from_id('group_exp_1', '28901')
+    with mock.patch('optimizely.decision_service.DecisionService.get_variations',
+                    return_value=[variation, group_variation]) as mock_decisions, \
+      mock.patch('time.time', return_value=42), \
+      mock.patch('uuid.uuid4', return_value='a68cf1ad-0393-4e18-af87-efe8f01a7c9c'), \
+      mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event, \
+      base.mock_send_notifications() as mock_broadcast:
+      self.assertEqual(
+        {'test_experiment': 'variation', 'group_exp_1': group_variation.key, 'invalid_experiment': None},
+        self.optimizely.activate_many(['test_experiment', 'group_exp_1', 'invalid_experiment', 'test_experiment'],
+                                      'test_user')
+      )
+
+    mock_decisions.assert_called_once_with(self.project_config, [experiment, group_experiment], 'test_user', None)
+    self.assertEqual(1, mock_dispatch_event.call_count)
+    impression_event = mock_dispatch_event.call_args[0][0]
+    self.assertEqual(
+      [[{'variation_id': '111129', 'experiment_id': '111127', 'campaign_id': '111182'}],
+       [{'variation_id': '28901', 'experiment_id': '32222', 'campaign_id': group_experiment.layerId}]],
+      [snapshot['decisions'] for snapshot in impression_event.params['visitors'][0]['snapshots']]
+    )
+    mock_broadcast.assert_has_calls([
+      mock.call(enums.NotificationTypes.ACTIVATE, experiment, 'test_user', None, variation, impression_event),
+      mock.call(enums.NotificationTypes.ACTIVATE, group_experiment, 'test_user', None, group_variation,
+                impression_event),
+    ])
+
+  def test_activate_many__no_variations(self):
+    """ Test that activate_many does not dispatch an impression event when user is in none of the experiments. """
+
+    with mock.patch('optimizely.decision_service.DecisionService.get_variations', return_value=[None]), \
+      mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event:
+      self.assertEqual({'test_experiment': None}, self.optimizely.activate_many(['test_experiment'], 'test_user'))
+
+    self.assertEqual(0, mock_dispatch_event.call_count)
+
+  def test_activate_many__invalid_inputs(self):
+    """ Test that activate_many returns empty dict and logs error when inputs are invalid. """
+
+    with mock.patch.object(self.optimizely, 'logger') as mock_client_logging, \
+      mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event:
+      self.assertEqual({}, self.optimizely.activate_many('test_experiment', 'test_user'))
+      mock_client_logging.error.assert_called_once_with('Provided "experiment_keys" is in an invalid format.')
+
+      mock_client_logging.reset_mock()
+      self.assertEqual({}, self.optimizely.activate_many(['test_experiment'], 99))
+      mock_client_logging.error.assert_called_once_with('Provided "user_id" is in an invalid format.')
+
+      mock_client_logging.reset_mock()
+      self.assertEqual({'test_experiment': None},
+                       self.optimizely.activate_many(['test_experiment', 42], 'test_user'))
+      mock_client_logging.error.assert_called_once_with('Provided "experiment_key" is in an invalid format.')
+
+    self.assertEqual(0, mock_dispatch_event.call_count)
+
   def test_add_activate_remove_clear_listener(self):
     callbackhit = [False]
     """ Test adding a listener activate passes correctly and gets called"""
@@ -367,7 +568,7 @@ class OptimizelyTest(base.BaseTest):
         'optimizely.decision_service.DecisionService.get_variation',
         return_value=self.project_config.get_variation_from_id('test_experiment', '111129')), \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast:
+      base.mock_send_notifications() as mock_broadcast:
       self.assertEqual('variation', self.optimizely.activate('test_experiment', 'test_user'))
 
     self.assertEqual(mock_broadcast.call_count, 2)
@@ -399,7 +600,7 @@ class OptimizelyTest(base.BaseTest):
         'optimizely.decision_service.DecisionService.get_variation',
         return_value=self.project_config.get_variation_from_id('test_experiment', '111129')), \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast:
+      base.mock_send_notifications() as mock_broadcast:
       self.assertEqual('variation',
                        self.optimizely.activate('test_experiment', 'test_user', {'test_attribute': 'test_value'}))
 
@@ -433,7 +634,7 @@ class OptimizelyTest(base.BaseTest):
         'optimizely.decision_service.DecisionService.get_variation',
         return_value=None), \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event'), \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+      base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(None, self.optimizely.activate('test_experiment', 'test_user'))
 
     mock_broadcast_decision.assert_called_once_with(
@@ -455,7 +656,7 @@ class OptimizelyTest(base.BaseTest):
                       'test_experiment', '111128'
                     )), \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_event_tracked:
+      base.mock_send_notifications() as mock_event_tracked:
       self.optimizely.track('test_event', 'test_user')
 
       mock_event_tracked.assert_called_once_with(enums.NotificationTypes.TRACK, "test_event",
@@ -469,7 +670,7 @@ class OptimizelyTest(base.BaseTest):
                       'test_experiment', '111128'
                     )), \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_event_tracked:
+      base.mock_send_notifications() as mock_event_tracked:
       self.optimizely.track('test_event', 'test_user', attributes={'test_attribute': 'test_value'})
 
       mock_event_tracked.assert_called_once_with(enums.NotificationTypes.TRACK, "test_event", 'test_user',
@@ -484,7 +685,7 @@ class OptimizelyTest(base.BaseTest):
                       'test_experiment', '111128'
                     )), \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_event_tracked:
+      base.mock_send_notifications() as mock_event_tracked:
       self.optimizely.track('test_event', 'test_user', attributes={'test_attribute': 'test_value'},
                             event_tags={'value': 1.234, 'non-revenue': 'abc'})
 
@@ -929,6 +1130,24 @@ class OptimizelyTest(base.BaseTest):
     mock_is_experiment_running.assert_called_once_with(self.project_config.get_experiment_from_key('test_experiment'))
     self.assertEqual(0, mock_audience_check.call_count)
 
+  def test_activate__gets_config_once(self):
+    """ Test that activate decides and builds the impression event from a single config, even if the
+    config is updated while the call is in progress. """
+
+    updated_config = project_config.ProjectConfig(json.dumps(self.config_dict), logger.SimpleLogger(), None)
+    variation = self.project_config.get_variation_from_id('test_experiment', '111129')
+    with mock.patch.object(self.optimizely.config_manager, 'get_config',
+                           side_effect=[self.project_config, updated_config]) as mock_get_config, \
+      mock.patch('optimizely.decision_service.DecisionService.get_variation',
+                 return_value=variation) as mock_decision, \
+      mock.patch('optimizely.event_builder.EventBuilder.create_impression_event') as mock_create_impression_event, \
+      mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event'):
+      self.assertEqual('variation', self.optimizely.activate('test_experiment', 'test_user'))
+
+    self.assertEqual(1, mock_get_config.call_count)
+    self.assertIs(self.project_config, mock_decision.call_args[0][0])
+    self.assertIs(self.project_config, mock_create_impression_event.call_args[0][0])
+
   def test_activate__bucketer_returns_none(self):
     """ Test that activate returns None and does not dispatch event when user is in no variation. """
 
@@ -1444,7 +1663,7 @@ class OptimizelyTest(base.BaseTest):
     with mock.patch(
         'optimizely.decision_service.DecisionService.get_variation',
         return_value=self.project_config.get_variation_from_id('test_experiment', '111129')), \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast:
+      base.mock_send_notifications() as mock_broadcast:
       self.assertEqual('variation', self.optimizely.get_variation('test_experiment', 'test_user'))
 
     self.assertEqual(mock_broadcast.call_count, 1)
@@ -1460,6 +1679,41 @@ class OptimizelyTest(base.BaseTest):
       }
     )
 
+  def test_get_variations(self):
+    """ Test that get_variations returns variations for all experiments and broadcasts a decision for each. """
+
+    with mock.patch('optimizely.decision_service.DecisionService.get_variations',
+                    return_value=[self.project_config.get_variation_from_id('test_experiment', '111129'), None]), \
+      mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event, \
+      base.mock_send_notifications() as mock_broadcast:
+      self.assertEqual({'test_experiment': 'variation', 'group_exp_1': None},
+                       self.optimizely.get_variations(['test_experiment', 'group_exp_1'], 'test_user'))
+
+    self.assertEqual(0, mock_dispatch_event.call_count)
+    self.assertEqual([
+      mock.call(enums.NotificationTypes.DECISION, 'ab-test', 'test_user', {},
+                {'experiment_key': 'test_experiment', 'variation_key': 'variation'}),
+      mock.call(enums.NotificationTypes.DECISION, 'ab-test', 'test_user', {},
+                {'experiment_key': 'group_exp_1', 'variation_key': None}),
+    ], mock_broadcast.call_args_list)
+
+  def test_get_variations__user_profile_service(self):
+    """ Test that get_variations returns the same variations as get_variation with a single profile lookup. """
+
+    mock_user_profile_service = mock.Mock()
+    mock_user_profile_service.lookup.return_value = {'user_id': 'test_user', 'experiment_bucket_map': {}}
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict), user_profile_service=mock_user_profile_service)
+    experiment_keys = ['test_experiment', 'group_exp_1', 'group_exp_2']
+    attributes = {'test_attribute': 'test_value_1'}
+
+    self.assertEqual(
+      dict((experiment_key, self.optimizely.get_variation(experiment_key, 'test_user', attributes))
+           for experiment_key in experiment_keys),
+      opt_obj.get_variations(experiment_keys, 'test_user', attributes)
+    )
+    self.assertEqual(1, mock_user_profile_service.lookup.call_count)
+    self.assertEqual(1, mock_user_profile_service.save.call_count)
+
   def test_get_variation_with_experiment_in_feature(self):
     """ Test that get_variation returns valid variation and broadcasts decision listener with type feature-test when
      get_variation returns feature experiment variation."""
@@ -1470,7 +1724,7 @@ class OptimizelyTest(base.BaseTest):
     with mock.patch(
             'optimizely.decision_service.DecisionService.get_variation',
             return_value=project_config.get_variation_from_id('test_experiment', '111129')), \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast:
+         base.mock_send_notifications() as mock_broadcast:
       self.assertEqual('variation', opt_obj.get_variation('test_experiment', 'test_user'))
 
     self.assertEqual(mock_broadcast.call_count, 1)
@@ -1491,7 +1745,7 @@ class OptimizelyTest(base.BaseTest):
 
     with mock.patch(
         'optimizely.decision_service.DecisionService.get_variation', return_value=None), \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast:
+      base.mock_send_notifications() as mock_broadcast:
       self.assertEqual(None, self.optimizely.get_variation('test_experiment', 'test_user',
                                                             attributes={'test_attribute': 'test_value'}))
 
@@ -1648,7 +1902,7 @@ class OptimizelyTest(base.BaseTest):
                       enums.DecisionSources.FEATURE_TEST
                     )) as mock_decision, \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision, \
+      base.mock_send_notifications() as mock_broadcast_decision, \
       mock.patch('uuid.uuid4', return_value='a68cf1ad-0393-4e18-af87-efe8f01a7c9c'), \
       mock.patch('time.time', return_value=42):
       self.assertTrue(opt_obj.is_feature_enabled('test_feature_in_experiment', 'test_user'))
@@ -1729,7 +1983,7 @@ class OptimizelyTest(base.BaseTest):
                       enums.DecisionSources.FEATURE_TEST
                     )) as mock_decision, \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision, \
+      base.mock_send_notifications() as mock_broadcast_decision, \
       mock.patch('uuid.uuid4', return_value='a68cf1ad-0393-4e18-af87-efe8f01a7c9c'), \
       mock.patch('time.time', return_value=42):
       self.assertFalse(opt_obj.is_feature_enabled('test_feature_in_experiment', 'test_user'))
@@ -1811,7 +2065,7 @@ class OptimizelyTest(base.BaseTest):
                       enums.DecisionSources.ROLLOUT
                     )) as mock_decision, \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision, \
+      base.mock_send_notifications() as mock_broadcast_decision, \
       mock.patch('uuid.uuid4', return_value='a68cf1ad-0393-4e18-af87-efe8f01a7c9c'), \
       mock.patch('time.time', return_value=42):
       self.assertTrue(opt_obj.is_feature_enabled('test_feature_in_experiment', 'test_user'))
@@ -1856,7 +2110,7 @@ class OptimizelyTest(base.BaseTest):
                       enums.DecisionSources.ROLLOUT
                     )) as mock_decision, \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision, \
+      base.mock_send_notifications() as mock_broadcast_decision, \
       mock.patch('uuid.uuid4', return_value='a68cf1ad-0393-4e18-af87-efe8f01a7c9c'), \
       mock.patch('time.time', return_value=42):
       self.assertFalse(opt_obj.is_feature_enabled('test_feature_in_experiment', 'test_user'))
@@ -1894,7 +2148,7 @@ class OptimizelyTest(base.BaseTest):
                       enums.DecisionSources.ROLLOUT
                     )) as mock_decision, \
       mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event') as mock_dispatch_event, \
-      mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision, \
+      base.mock_send_notifications() as mock_broadcast_decision, \
       mock.patch('uuid.uuid4', return_value='a68cf1ad-0393-4e18-af87-efe8f01a7c9c'), \
       mock.patch('time.time', return_value=42):
       self.assertFalse(opt_obj.is_feature_enabled('test_feature_in_experiment', 'test_user'))
@@ -1920,6 +2174,19 @@ class OptimizelyTest(base.BaseTest):
     # Check that impression event is not sent
     self.assertEqual(0, mock_dispatch_event.call_count)
 
+  def test_decision_notifications__not_built_without_listeners(self):
+    """ Test that decision notifications are not sent when no decision listener is added. """
+
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+    with mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_send, \
+      mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event'):
+      opt_obj.get_variation('test_experiment', 'test_user')
+      opt_obj.is_feature_enabled('test_feature_in_experiment', 'test_user')
+      self.assertEqual(999, opt_obj.get_feature_variable_integer('test_feature_in_experiment', 'count', 'test_user'))
+
+    for notification_call in mock_send.call_args_list:
+      self.assertNotEqual(enums.NotificationTypes.DECISION, notification_call[0][0])
+
   def test_is_feature_enabled__invalid_object(self):
     """ Test that is_feature_enabled returns False and logs error if Optimizely instance is invalid. """
 
@@ -1954,22 +2221,41 @@ class OptimizelyTest(base.BaseTest):
     opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
 
     def side_effect(*args, **kwargs):
-      feature_key = args[0]
+      feature_key = args[1].key
       if feature_key == 'test_feature_in_experiment' or feature_key == 'test_feature_in_rollout':
         return True
 
       return False
 
-    with mock.patch('optimizely.optimizely.Optimizely.is_feature_enabled',
-                    side_effect=side_effect) as mock_is_feature_enabled:
+    with mock.patch('optimizely.optimizely.Optimizely._process_feature_decision',
+                    side_effect=side_effect) as mock_process_feature_decision, \
+            mock.patch('optimizely.optimizely.Optimizely.is_feature_enabled') as mock_is_feature_enabled:
       received_features = opt_obj.get_enabled_features('user_1')
 
     expected_enabled_features = ['test_feature_in_experiment', 'test_feature_in_rollout']
     self.assertEqual(sorted(expected_enabled_features), sorted(received_features))
-    mock_is_feature_enabled.assert_any_call('test_feature_in_experiment', 'user_1', None)
-    mock_is_feature_enabled.assert_any_call('test_feature_in_rollout', 'user_1', None)
-    mock_is_feature_enabled.assert_any_call('test_feature_in_group', 'user_1', None)
-    mock_is_feature_enabled.assert_any_call('test_feature_in_experiment_and_rollout', 'user_1', None)
+    self.assertEqual(0, mock_is_feature_enabled.call_count)
+    self.assertEqual(
+      sorted(['test_feature_in_experiment', 'test_feature_in_rollout', 'test_feature_in_group',
+              'test_feature_in_experiment_and_rollout']),
+      sorted(call[0][1].key for call in mock_process_feature_decision.call_args_list)
+    )
+
+  def test_get_enabled_features__gets_config_once(self):
+    """ Test that get_enabled_features gets config once and returns the same features as is_feature_enabled. """
+
+    opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+
+    with mock.patch('optimizely.event_dispatcher.EventDispatcher.dispatch_event'):
+      expected_features = [feature_key for feature_key in opt_obj.config_manager.get_config().feature_key_map
+                           if opt_obj.is_feature_enabled(feature_key, 'test_user')]
+
+      with mock.patch.object(opt_obj.config_manager, 'get_config',
+                             wraps=opt_obj.config_manager.get_config) as mock_get_config:
+        received_features = opt_obj.get_enabled_features('test_user')
+
+    self.assertEqual(expected_features, received_features)
+    self.assertEqual(1, mock_get_config.call_count)
 
   def test_get_enabled_features__broadcasts_decision_for_each_feature(self):
     """ Test that get_enabled_features only returns features that are enabled for the specified user \
@@ -1999,9 +2285,9 @@ class OptimizelyTest(base.BaseTest):
           mock_experiment, mock_variation_2, enums.DecisionSources.ROLLOUT
         )
 
-    with mock.patch('optimizely.decision_service.DecisionService.get_variation_for_feature',
+    with mock.patch('optimizely.decision_service.DecisionService._get_variation_for_feature',
                         side_effect=side_effect),\
-        mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') \
+        base.mock_send_notifications() \
             as mock_broadcast_decision:
       received_features = opt_obj.get_enabled_features('user_1')
 
@@ -2118,7 +2404,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.FEATURE_TEST)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable_boolean('test_feature_in_experiment', 'is_working', 'test_user'))
 
     mock_config_logging.info.assert_called_once_with(
@@ -2156,7 +2442,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.FEATURE_TEST)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(10.02, opt_obj.get_feature_variable_double('test_feature_in_experiment', 'cost', 'test_user'))
 
     mock_config_logging.info.assert_called_once_with(
@@ -2194,7 +2480,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.FEATURE_TEST)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(4243, opt_obj.get_feature_variable_integer('test_feature_in_experiment', 'count', 'test_user'))
 
     mock_config_logging.info.assert_called_once_with(
@@ -2232,7 +2518,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.FEATURE_TEST)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(
         'staging',
         opt_obj.get_feature_variable_string('test_feature_in_experiment', 'environment', 'test_user')
@@ -2274,7 +2560,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.FEATURE_TEST)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable('test_feature_in_experiment', 'is_working', 'test_user'))
 
     mock_config_logging.info.assert_called_once_with(
@@ -2305,7 +2591,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.FEATURE_TEST)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(10.02, opt_obj.get_feature_variable('test_feature_in_experiment', 'cost', 'test_user'))
 
     mock_config_logging.info.assert_called_once_with(
@@ -2336,7 +2622,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.FEATURE_TEST)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(4243, opt_obj.get_feature_variable('test_feature_in_experiment', 'count', 'test_user'))
 
     mock_config_logging.info.assert_called_once_with(
@@ -2367,7 +2653,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.FEATURE_TEST)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(
         'staging',
         opt_obj.get_feature_variable('test_feature_in_experiment', 'environment', 'test_user')
@@ -2410,7 +2696,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable_boolean('test_feature_in_rollout', 'is_running', 'test_user',
                                                             attributes=user_attributes))
 
@@ -2448,7 +2734,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable_double('test_feature_in_rollout', 'price', 'test_user',
                                                             attributes=user_attributes))
 
@@ -2486,7 +2772,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable_integer('test_feature_in_rollout', 'count', 'test_user',
                                                             attributes=user_attributes))
 
@@ -2524,7 +2810,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable_string('test_feature_in_rollout', 'message', 'test_user',
                                                             attributes=user_attributes))
 
@@ -2562,7 +2848,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable('test_feature_in_rollout', 'is_running', 'test_user',
                                                             attributes=user_attributes))
 
@@ -2591,7 +2877,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable('test_feature_in_rollout', 'price', 'test_user',
                                                             attributes=user_attributes))
 
@@ -2620,7 +2906,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable('test_feature_in_rollout', 'count', 'test_user',
                                                             attributes=user_attributes))
 
@@ -2649,7 +2935,7 @@ class OptimizelyTest(base.BaseTest):
                                                            mock_variation,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj.config_manager.get_config(), 'logger') as mock_config_logging, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable('test_feature_in_rollout', 'message', 'test_user',
                                                             attributes=user_attributes))
 
@@ -2793,7 +3079,7 @@ class OptimizelyTest(base.BaseTest):
                     return_value=decision_service.Decision(None, None,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj, 'logger') as mock_client_logger, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable_boolean('test_feature_in_experiment', 'is_working', 'test_user'))
 
     mock_client_logger.info.assert_called_once_with(
@@ -2824,7 +3110,7 @@ class OptimizelyTest(base.BaseTest):
                     return_value=decision_service.Decision(None, None,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj, 'logger') as mock_client_logger, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(10.99,
                        opt_obj.get_feature_variable_double('test_feature_in_experiment', 'cost', 'test_user'))
 
@@ -2856,7 +3142,7 @@ class OptimizelyTest(base.BaseTest):
                     return_value=decision_service.Decision(None, None,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj, 'logger') as mock_client_logger, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(999,
                        opt_obj.get_feature_variable_integer('test_feature_in_experiment', 'count', 'test_user'))
 
@@ -2888,7 +3174,7 @@ class OptimizelyTest(base.BaseTest):
                     return_value=decision_service.Decision(None, None,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj, 'logger') as mock_client_logger, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual('devel',
                        opt_obj.get_feature_variable_string('test_feature_in_experiment', 'environment', 'test_user'))
 
@@ -2920,7 +3206,7 @@ class OptimizelyTest(base.BaseTest):
                     return_value=decision_service.Decision(None, None,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj, 'logger') as mock_client_logger, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertTrue(opt_obj.get_feature_variable('test_feature_in_experiment', 'is_working', 'test_user'))
 
     mock_client_logger.info.assert_called_once_with(
@@ -2950,7 +3236,7 @@ class OptimizelyTest(base.BaseTest):
                     return_value=decision_service.Decision(None, None,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj, 'logger') as mock_client_logger, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(10.99,
                        opt_obj.get_feature_variable('test_feature_in_experiment', 'cost', 'test_user'))
 
@@ -2981,7 +3267,7 @@ class OptimizelyTest(base.BaseTest):
                     return_value=decision_service.Decision(None, None,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj, 'logger') as mock_client_logger, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual(999,
                        opt_obj.get_feature_variable('test_feature_in_experiment', 'count', 'test_user'))
 
@@ -3012,7 +3298,7 @@ class OptimizelyTest(base.BaseTest):
                     return_value=decision_service.Decision(None, None,
                                                            enums.DecisionSources.ROLLOUT)), \
          mock.patch.object(opt_obj, 'logger') as mock_client_logger, \
-         mock.patch('optimizely.notification_center.NotificationCenter.send_notifications') as mock_broadcast_decision:
+         base.mock_send_notifications() as mock_broadcast_decision:
       self.assertEqual('devel',
                        opt_obj.get_feature_variable('test_feature_in_experiment', 'environment', 'test_user'))
 
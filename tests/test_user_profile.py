@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
 import unittest
 
 from optimizely import user_profile
@@ -65,3 +66,63 @@ class UserProfileServiceTest(unittest.TestCase):
 
     user_profile_service = user_profile.UserProfileService()
     self.assertIsNone(user_profile_service.save({'user_id': 'test_user', 'experiment_bucket_map': {}}))
+
+
+class BulkUserProfileServiceTest(unittest.TestCase):
+
+  def test_lookup_many(self):
+    """ Test that lookup_many looks up each user by default. """
+
+    user_profile_service = user_profile.BulkUserProfileService()
+    self.assertEqual({'user_1': {'user_id': 'user_1', 'experiment_bucket_map': {}},
+                      'user_2': {'user_id': 'user_2', 'experiment_bucket_map': {}}},
+                     user_profile_service.lookup_many(['user_1', 'user_2']))
+
+  def test_save_many(self):
+    """ Test that save_many saves each profile by default. """
+
+    user_profile_service = user_profile.BulkUserProfileService()
+    with mock.patch.object(user_profile_service, 'save') as mock_save:
+      user_profile_service.save_many([{'user_id': 'user_1', 'experiment_bucket_map': {}},
+                                      {'user_id': 'user_2', 'experiment_bucket_map': {}}])
+
+    self.assertEqual([mock.call({'user_id': 'user_1', 'experiment_bucket_map': {}}),
+                      mock.call({'user_id': 'user_2', 'experiment_bucket_map': {}})], mock_save.call_args_list)
+
+
+class InMemoryUserProfileServiceTest(unittest.TestCase):
+
+  def setUp(self):
+    self.user_profile_service = user_profile.InMemoryUserProfileService()
+    self.stored_profile = {'user_id': 'user_1', 'experiment_bucket_map': {'199912': {'variation_id': '14512525'}}}
+
+  def test_lookup__save(self):
+    """ Test that saved profiles are looked up and profiles without decisions returned for other users. """
+
+    self.user_profile_service.save(self.stored_profile)
+
+    self.assertEqual(self.stored_profile, self.user_profile_service.lookup('user_1'))
+    self.assertEqual({'user_id': 'user_2', 'experiment_bucket_map': {}}, self.user_profile_service.lookup('user_2'))
+
+  def test_lookup_many__save_many(self):
+    """ Test that profiles saved together are looked up together and profiles without decisions returned
+    for other users. """
+
+    other_profile = {'user_id': 'user_2', 'experiment_bucket_map': {'199912': {'variation_id': '14512526'}}}
+    self.user_profile_service.save_many([self.stored_profile, other_profile])
+
+    self.assertEqual({'user_1': self.stored_profile,
+                      'user_2': other_profile,
+                      'user_3': {'user_id': 'user_3', 'experiment_bucket_map': {}}},
+                     self.user_profile_service.lookup_many(['user_1', 'user_2', 'user_3']))
+
+  def test_profiles_are_copied(self):
+    """ Test that stored profiles are not changed by changes to profiles saved or looked up. """
+
+    self.user_profile_service.save_many([self.stored_profile])
+    self.stored_profile['experiment_bucket_map']['199912']['variation_id'] = 'changed'
+    self.user_profile_service.lookup('user_1')['experiment_bucket_map'].clear()
+    self.user_profile_service.lookup_many(['user_1'])['user_1']['experiment_bucket_map'].clear()
+
+    self.assertEqual({'user_id': 'user_1', 'experiment_bucket_map': {'199912': {'variation_id': '14512525'}}},
+                     self.user_profile_service.lookup('user_1'))